@@ -0,0 +1,35 @@
+"""Resamples/second of the trade bootstrap (bootstrap.bootstrap_trades) for
+each method on a synthetic ledger, with peak memory.
+
+Usage:
+    python benchmarks/bench_bootstrap.py [--trades 100000] [--resamples 10000] [--workers N]
+"""
+import argparse
+
+import numpy as np
+
+from common import timed
+from src.backtesting.bootstrap import METHODS, bootstrap_trades
+from src.backtesting.instrumentation import peak_rss_mb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, default=100_000)
+    parser.add_argument("--resamples", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    pnls = np.random.default_rng(42).normal(0.5, 20.0, size=args.trades)
+    commissions = np.full(args.trades, 4.0)
+    for method in METHODS:
+        elapsed, result = timed(bootstrap_trades, pnls, commissions=commissions, n_resamples=args.resamples,
+                                method=method, max_workers=args.workers)
+        low, high = np.quantile(result.sharpe, [0.025, 0.975])
+        print(f"{method:>8}: {args.resamples:,} x {args.trades:,} trades in {elapsed:7.2f}s "
+              f"-> {args.resamples / elapsed:>9,.0f} resamples/s, Sharpe 95% CI [{low:.4f}, {high:.4f}]")
+    print(f"Peak RSS: {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Time cold (CSV parse + align + cache write) against warm (memory-mapped
+cache) loads of the aligned market data.
+
+Usage:
+    python benchmarks/bench_data_cache.py [--bars 2000000]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import synthetic_csv, timed
+from src.backtesting.data_cache import clear_cache, load_aligned_frames_cached
+from src.backtesting.market_data import load_aligned_frames
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def bench_files(label: str, index_file: Path, future_file: Path, cache_dir: Path) -> None:
+    clear_cache(cache_dir)
+    csv, _ = timed(load_aligned_frames, index_file, future_file)
+    cold, _ = timed(load_aligned_frames_cached, index_file, future_file, cache_dir=cache_dir)
+    warm, (index_data, _) = timed(load_aligned_frames_cached, index_file, future_file, cache_dir=cache_dir)
+    print(f"{label}: {len(index_data):,} aligned bars")
+    print(f"  csv only : {csv * 1000:9.1f} ms")
+    print(f"  cold     : {cold * 1000:9.1f} ms (parse + align + write cache)")
+    print(f"  warm     : {warm * 1000:9.1f} ms -> {csv / warm:.0f}x faster than parsing")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=2_000_000, help="rows of the synthetic files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+        bench_files("Bundled data/spx_*.csv", SPX_INDEX_DATA, SPX_FUTURE_DATA, cache_dir)
+        index_file, future_file = synthetic_csv(Path(tmp), args.bars)
+        bench_files(f"Synthetic ({args.bars:,} rows)", index_file, future_file, cache_dir)
+
+
+if __name__ == "__main__":
+    main()
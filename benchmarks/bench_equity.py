@@ -0,0 +1,56 @@
+"""Per-bar overhead of recording the equity curve with the "array" engine:
+no recording against recording every bar and down-sampled recording.
+
+Usage:
+    python benchmarks/bench_equity.py [--years 1] [--repeat 3]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import BARS_PER_YEAR, synthetic_csv, timed
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+
+
+def bench(data: AlignedData, equity_every, repeat: int) -> tuple:
+    """Return (best seconds, recorder bytes) of ``Backtester.run``."""
+    best = float("inf")
+    nbytes = 0
+    for _ in range(repeat):
+        backtester = Backtester(strategy=MomentumStrategy(threshold=0.0005), engine="array",
+                                reporter=SilentReporter(), equity_every=equity_every)
+        timed(backtester.load_aligned, data)
+        elapsed, _ = timed(backtester.run)
+        best = min(best, elapsed)
+        if backtester._equity is not None:
+            nbytes = backtester._equity.nbytes
+    return best, nbytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=float, default=1.0, help="years of synthetic minute bars")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    n_bars = int(args.years * BARS_PER_YEAR)
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file, future_file = synthetic_csv(Path(tmp), n_bars)
+        data = AlignedData.from_csv(index_file, future_file)
+
+    base, _ = bench(data, None, args.repeat)
+    print(f"{n_bars:,} bars")
+    print(f"{'recording':>14} {'ns/bar':>8} {'overhead ns/bar':>16} {'overhead':>9} {'MB':>7}")
+    print(f"{'off':>14} {base / n_bars * 1e9:>8.0f} {'':>16} {'':>9} {0:>7.1f}")
+    for every in (1, 60, 390):
+        elapsed, nbytes = bench(data, every, args.repeat)
+        extra = (elapsed - base) / n_bars * 1e9
+        print(f"{'every ' + str(every):>14} {elapsed / n_bars * 1e9:>8.0f} {extra:>16.0f} "
+              f"{(elapsed - base) / base:>9.1%} {nbytes / 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare bars/second of the "event", "array" and "vectorized" Backtester
+engines, and of the array engine with per-tick strategy calls instead of
+the batch ``generate_signals``.
+
+Usage:
+    python benchmarks/bench_event_loop.py [--years 2] [--skip-event-synthetic]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import BARS_PER_YEAR, synthetic_csv, timed
+from src.backtesting.backtester import Backtester
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def bench_engine(engine: str, index_file: Path, future_file: Path, batch_signals: bool = True) -> float:
+    """Return bars/second of ``Backtester.run`` for the given engine."""
+    backtester = Backtester(strategy=MomentumStrategy(threshold=0.0005), engine=engine,
+                            reporter=SilentReporter(), batch_signals=batch_signals)
+    timed(backtester.load_data, index_file=index_file, future_file=future_file)
+    elapsed, _ = timed(backtester.run)
+    n_bars = len(backtester._times)
+    label = engine if batch_signals else f"{engine}/tick"
+    print(f"  {label:>10}: {n_bars:>9,} bars in {elapsed:8.3f}s -> {n_bars / elapsed:>12,.0f} bars/s, "
+          f"{len(backtester._portfolio.completed_trades)} trades")
+    return n_bars / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=float, default=2.0, help="years of synthetic minute bars")
+    parser.add_argument("--skip-event-synthetic", action="store_true",
+                        help="only run the array engine on the synthetic series")
+    args = parser.parse_args()
+
+    print("Bundled data/spx_*.csv")
+    event = bench_engine("event", SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    array = bench_engine("array", SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    vectorized = bench_engine("vectorized", SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    print(f"  speedup: array {array / event:.1f}x, vectorized {vectorized / event:.1f}x")
+
+    n_bars = int(args.years * BARS_PER_YEAR)
+    print(f"Synthetic series ({args.years:g} years, {n_bars:,} bars)")
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file, future_file = synthetic_csv(Path(tmp), n_bars)
+        array = bench_engine("array", index_file, future_file)
+        tick = bench_engine("array", index_file, future_file, batch_signals=False)
+        print(f"  batch signals: {array / tick:.1f}x the per-tick strategy calls")
+        vectorized = bench_engine("vectorized", index_file, future_file)
+        if not args.skip_event_synthetic:
+            event = bench_engine("event", index_file, future_file)
+            print(f"  speedup: array {array / event:.1f}x, vectorized {vectorized / event:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Per-tick cost of the momentum indicator across window sizes: the old
+deque -> list -> sum implementation against the incremental RollingMomentum.
+
+Usage:
+    python benchmarks/bench_indicator.py [--ticks 200000]
+"""
+import argparse
+from collections import deque
+
+import numpy as np
+
+from common import timed
+from src.backtesting.indicators import RollingMomentum
+
+
+def deque_momentum(prices: list, window: int) -> None:
+    window_prices = deque(maxlen=2 * window)
+    for price in prices:
+        window_prices.append(price)
+        if len(window_prices) == 2 * window:
+            prices_list = list(window_prices)
+            x_n = sum(prices_list[window:]) / float(window)
+            x_n_1 = sum(prices_list[:window]) / float(window)
+            (x_n - x_n_1) / x_n
+
+
+def rolling_momentum(prices: list, window: int) -> None:
+    indicator = RollingMomentum(window=window)
+    for price in prices:
+        indicator.push(price)
+        if indicator.ready:
+            indicator.value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=200_000)
+    args = parser.parse_args()
+    prices = (6000.0 + np.cumsum(np.random.default_rng(0).normal(0.0, 1.0, size=args.ticks))).tolist()
+
+    print(f"{'window':>8} {'deque ns/tick':>14} {'rolling ns/tick':>16} {'speedup':>8}")
+    for window in (5, 50, 500, 5000):
+        old, _ = timed(deque_momentum, prices, window)
+        new, _ = timed(rolling_momentum, prices, window)
+        print(f"{window:>8} {old / args.ticks * 1e9:>14.0f} {new / args.ticks * 1e9:>16.0f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
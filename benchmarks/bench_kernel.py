@@ -0,0 +1,45 @@
+"""Bars/second of the single-loop momentum kernel (Numba compiled when
+installed, plain Python otherwise) against the vectorized engine, on
+synthetic bars held in memory. The first kernel call includes the Numba
+compilation, so the best of ``--repeat`` runs is reported.
+
+Usage:
+    python benchmarks/bench_kernel.py [--bars 5000000] [--repeat 3]
+"""
+import argparse
+
+from common import timed
+from src.backtesting.kernels import NUMBA_AVAILABLE, run_kernel_momentum
+from src.backtesting.market_data import AlignedData
+from src.backtesting.synthetic import generate_market_data
+from src.backtesting.vectorized import run_vectorized_momentum
+
+# 100M bars per minute
+TARGET_BARS_PER_SECOND: float = 100e6 / 60
+
+
+def best_of(repeat: int, func, *args) -> tuple:
+    runs = [timed(func, *args) for _ in range(repeat)]
+    return min(elapsed for elapsed, _ in runs), runs[-1][1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    data = AlignedData.from_frames(*generate_market_data(args.bars, seed=42))
+
+    print(f"{args.bars:,} bars, Numba {'available' if NUMBA_AVAILABLE else 'not installed (plain Python)'}")
+    for name, func in (("kernel", run_kernel_momentum), ("vectorized", run_vectorized_momentum)):
+        elapsed, portfolio = best_of(args.repeat, func, data)
+        rate = args.bars / elapsed
+        print(f"  {name:>10}: {elapsed:8.3f}s -> {rate:>14,.0f} bars/s ({rate * 60 / 1e6:,.1f}M bars/min), "
+              f"{len(portfolio.completed_trades)} trades")
+        if name == "kernel":
+            print(f"  {'':>10}  target {TARGET_BARS_PER_SECOND:,.0f} bars/s: "
+                  f"{'met' if rate >= TARGET_BARS_PER_SECOND else 'not met'}")
+
+
+if __name__ == "__main__":
+    main()
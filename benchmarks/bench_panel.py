@@ -0,0 +1,44 @@
+"""Throughput of the momentum backtest over many index/future pairs held
+in one DataPanel, against backtesting each pair separately.
+
+Usage:
+    python benchmarks/bench_panel.py [--pairs 50] [--bars 100000]
+"""
+import argparse
+
+from common import timed
+from src.backtesting.market_data import AlignedData
+from src.backtesting.panel import DataPanel, run_panel_momentum
+from src.backtesting.synthetic import generate_market_data
+from src.backtesting.vectorized import run_vectorized_momentum
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=100_000)
+    args = parser.parse_args()
+
+    frames = {}
+    pairs = []
+    for i in range(args.pairs):
+        frames[f"index_{i}"], frames[f"future_{i}"] = generate_market_data(args.bars, seed=i)
+        pairs.append((f"index_{i}", f"future_{i}"))
+
+    elapsed, panel = timed(DataPanel.from_frames, frames)
+    print(f"align {2 * args.pairs} instruments x {args.bars:,} bars: {elapsed * 1000:.0f} ms")
+
+    for n_pairs in sorted({1, min(10, args.pairs), args.pairs}):
+        subset = pairs[:n_pairs]
+        elapsed, _ = timed(run_panel_momentum, panel, subset)
+        print(f"  panel  {n_pairs:>3} pairs: {elapsed * 1000:8.1f} ms -> {n_pairs * len(panel) / elapsed:>14,.0f} pair-bars/s")
+
+    def separately():
+        for index, future in pairs:
+            run_vectorized_momentum(AlignedData.from_frames(frames[index], frames[future]))
+    elapsed, _ = timed(separately)
+    print(f"  one backtest per pair,  {args.pairs} pairs: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Cost of expiring positions with many of them open at once: the old
+exact-time dict schedule (entries never removed, closes only on an exact
+timestamp match) against the heap based ExpiryScheduler.
+
+Every bar opens ``--per-bar`` positions with holding periods drawn between
+1 and ``--max-holding`` minutes, so about per-bar * max-holding / 2
+positions are open at any time.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--bars 200000] [--per-bar 5] [--max-holding 600]
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from common import timed
+from src.backtesting.scheduler import ExpiryScheduler
+
+MINUTE = 60 * 1_000_000_000
+
+
+def dict_schedule(times: list, holdings: list) -> tuple:
+    schedule = {}
+    closed = 0
+    for t, holding in zip(times, holdings):
+        if t in schedule and schedule[t]:
+            closed += len(schedule[t])
+            schedule[t] = []
+        for h in holding:
+            schedule.setdefault(t + h, []).append(t)
+    return closed, len(schedule), sys.getsizeof(schedule)
+
+
+def heap_schedule(times: list, holdings: list) -> tuple:
+    scheduler = ExpiryScheduler()
+    closed = 0
+    peak = 0
+    for t, holding in zip(times, holdings):
+        closed += len(scheduler.pop_due(t))
+        for h in holding:
+            scheduler.schedule(t + h, t)
+        peak = max(peak, len(scheduler))
+    return closed, peak, sys.getsizeof(scheduler._heap)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--per-bar", type=int, default=5)
+    parser.add_argument("--max-holding", type=int, default=600, help="minutes")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # One bar per minute with roughly 1% of the bars missing
+    times = (np.cumsum(rng.choice([1, 2], size=args.bars, p=[0.99, 0.01])) * MINUTE).tolist()
+    holdings = (rng.integers(1, args.max_holding + 1, size=(args.bars, args.per_bar)) * MINUTE).tolist()
+
+    old, (old_closed, old_entries, old_bytes) = timed(dict_schedule, times, holdings)
+    new, (new_closed, new_peak, new_bytes) = timed(heap_schedule, times, holdings)
+    opened = args.bars * args.per_bar
+    print(f"{'':>6} {'ns/bar':>8} {'closed':>10} {'of opened':>10} {'entries':>10} {'container MB':>13}")
+    print(f"{'dict':>6} {old / args.bars * 1e9:>8.0f} {old_closed:>10} {opened:>10} {old_entries:>10} "
+          f"{old_bytes / 1e6:>13.1f}")
+    print(f"{'heap':>6} {new / args.bars * 1e9:>8.0f} {new_closed:>10} {opened:>10} {new_peak:>10} "
+          f"{new_bytes / 1e6:>13.1f}")
+    print("dict entries are never removed; heap entries are the peak number of pending positions")
+
+
+if __name__ == "__main__":
+    main()
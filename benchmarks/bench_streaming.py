@@ -0,0 +1,65 @@
+"""Peak RSS and run time of a full backtest with the in-memory loader
+(load_data + run) against the chunked streaming reader (run_stream) on a
+synthetic file. Each mode runs in a fresh subprocess so the peaks do not
+mix.
+
+Usage:
+    python benchmarks/bench_streaming.py [--rows 10000000] [--chunksize 100000]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import synthetic_csv
+from src.backtesting.instrumentation import peak_rss_mb
+
+
+def child(mode: str, index_file: str, future_file: str, chunksize: int) -> None:
+    from src.backtesting.backtester import Backtester
+    from src.backtesting.reporting import SilentReporter
+    from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+
+    backtester = Backtester(strategy=MomentumStrategy(), engine="array", reporter=SilentReporter())
+    start = time.perf_counter()
+    if mode == "full":
+        backtester.load_data(index_file=index_file, future_file=future_file)
+        backtester.run()
+    else:
+        backtester.run_stream(index_file, future_file, chunksize=chunksize)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"mode": mode, "seconds": elapsed, "peak_rss_mb": peak_rss_mb(),
+                      "trades": len(backtester._portfolio.completed_trades)}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--child", choices=["full", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--index-file", help=argparse.SUPPRESS)
+    parser.add_argument("--future-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.index_file, args.future_file, args.chunksize)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Writing synthetic files with {args.rows:,} rows ...")
+        index_file, future_file = synthetic_csv(Path(tmp), args.rows)
+        for mode in ("full", "stream"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--index-file", str(index_file),
+                 "--future-file", str(future_file), "--chunksize", str(args.chunksize)],
+                check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"  {mode:>6}: peak RSS {result['peak_rss_mb']:8.0f} MB, {result['seconds']:7.1f}s, "
+                  f"{result['trades']} trades")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Ticks/second of building 1-minute and volume bars from a gzip tick file,
+and of a backtest on the bars (Backtester.run_ticks), with peak memory.
+
+Usage:
+    python benchmarks/bench_ticks.py [--ticks 10000000] [--chunksize 1000000]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import timed
+from src.backtesting.backtester import Backtester
+from src.backtesting.instrumentation import peak_rss_mb
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import write_tick_data
+from src.backtesting.ticks import TimeBarBuilder, VolumeBarBuilder, iter_tick_bars
+
+
+def count_bars(path: Path, builder, chunksize: int) -> int:
+    return sum(len(block) for block in iter_tick_bars(path, builder, chunksize=chunksize))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=10_000_000)
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ticks.csv.gz"
+        elapsed, _ = timed(write_tick_data, path, args.ticks)
+        print(f"Wrote {args.ticks:,} ticks ({path.stat().st_size / 1e6:.0f} MB gzip) in {elapsed:.1f}s")
+        for label, builder in (("1-minute bars", TimeBarBuilder.minutes(1)),
+                               ("500-lot bars", VolumeBarBuilder(500))):
+            elapsed, n_bars = timed(count_bars, path, builder, args.chunksize)
+            print(f"  {label:>14}: {n_bars:>9,} bars in {elapsed:7.2f}s -> {args.ticks / elapsed:>12,.0f} ticks/s")
+        backtester = Backtester(strategy=MomentumStrategy(threshold=0.0002), reporter=SilentReporter())
+        elapsed, _ = timed(backtester.run_ticks, path, TimeBarBuilder.minutes(1), chunksize=args.chunksize)
+        print(f"  {'run_ticks':>14}: {len(backtester._portfolio.completed_trades):>9,} trades in {elapsed:7.2f}s "
+              f"-> {args.ticks / elapsed:>12,.0f} ticks/s")
+    print(f"Peak RSS: {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
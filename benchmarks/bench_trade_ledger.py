@@ -0,0 +1,85 @@
+"""Memory per trade and performance-summary time of a list of Trade
+objects against the array backed TradeLedger.
+
+Usage:
+    python benchmarks/bench_trade_ledger.py [--trades 500000]
+"""
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from common import timed
+from src.backtesting.backtester import Backtester
+from src.backtesting.ledger import TradeLedger
+from src.backtesting.performance import compute_performance
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.trade import Trade
+
+
+def make_trades(n: int) -> list:
+    rng = np.random.default_rng(0)
+    pnls = rng.normal(0.0, 5.0, size=n)
+    start = datetime(2024, 1, 2, 9, 30)
+    trades = []
+    for i, pnl in enumerate(pnls.tolist()):
+        trade = Trade(direction="long" if i % 2 else "short", open_time=start + timedelta(minutes=i),
+                      open_price=5000.0)
+        trade.commissions = 4.0
+        trade.close_trade(close_time=start + timedelta(minutes=i + 10), close_price=5000.0 + pnl)
+        trades.append(trade)
+    return trades
+
+
+def traced_bytes(func, *args) -> tuple:
+    tracemalloc.start()
+    result = func(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def summary_time(completed_trades) -> float:
+    backtester = Backtester(strategy=MomentumStrategy())
+    backtester._portfolio.completed_trades = completed_trades
+    backtester._current_index_price = 5000.0
+    elapsed, _ = timed(backtester.print_performance)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, default=500_000)
+    parser.add_argument("--analytics-trades", type=int, default=5_000_000,
+                        help="ledger size for the compute_performance timing")
+    args = parser.parse_args()
+    n = args.trades
+
+    list_bytes, trades = traced_bytes(make_trades, n)
+    ledger_bytes, ledger = traced_bytes(TradeLedger.from_trades, trades)
+    print(f"{n:,} trades")
+    print(f"  list of Trade : {list_bytes / n:8.1f} bytes/trade (including the datetime objects)")
+    print(f"  TradeLedger   : {ledger_bytes / n:8.1f} bytes/trade ({ledger.nbytes / n:.1f} in the arrays)")
+
+    list_time = summary_time(trades)
+    ledger_time = summary_time(ledger)
+    print("print_performance")
+    print(f"  list of Trade : {list_time * 1000:8.1f} ms")
+    print(f"  TradeLedger   : {ledger_time * 1000:8.1f} ms -> {list_time / ledger_time:.0f}x faster")
+
+    m = args.analytics_trades
+    rng = np.random.default_rng(1)
+    minute = 60 * 1_000_000_000
+    open_time = np.arange(m, dtype=np.int64) * minute
+    pnls = rng.normal(0.0, 5.0, size=m)
+    big = TradeLedger.from_arrays(
+        direction=np.where(rng.random(m) < 0.5, 1, -1), open_time=open_time, open_price=np.full(m, 5000.0),
+        close_time=open_time + 10 * minute, close_price=5000.0 + pnls, size=np.ones(m),
+        realized_pnl=pnls, commissions=np.full(m, 4.0))
+    elapsed, _ = timed(compute_performance, big, 100000.0)
+    print(f"compute_performance on {m:,} trades: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
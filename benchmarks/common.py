@@ -0,0 +1,35 @@
+"""Shared helpers for the standalone benchmark scripts in this directory."""
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Tuple
+
+# Ensure the project root is on the Python path when run as a script
+ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.backtesting.synthetic import SESSION_MINUTES, write_market_data  # noqa: E402
+
+BARS_PER_YEAR: int = 252 * SESSION_MINUTES
+
+
+def timed(func: Callable, *args, **kwargs) -> Tuple[float, object]:
+    """Run ``func`` once with stdout silenced and return (seconds, result)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return elapsed, result
+
+
+def synthetic_csv(directory: Path, n_bars: int, seed: int = 42) -> Tuple[Path, Path]:
+    """Write (or reuse) synthetic index/future CSV files with ``n_bars`` rows."""
+    directory.mkdir(parents=True, exist_ok=True)
+    index_file = directory / f"index_{n_bars}_{seed}.csv"
+    future_file = directory / f"future_{n_bars}_{seed}.csv"
+    if not (index_file.exists() and future_file.exists()):
+        write_market_data(index_file, future_file, n_bars=n_bars, seed=seed)
+    return index_file, future_file
@@ -0,0 +1,197 @@
+"""Benchmark suite: times the main stages of a backtest on seeded synthetic
+index/future minute bars (same CSV schema as data/spx_*.csv) at several
+sizes and stores the results as JSON, to compare versions.
+
+Cases:
+    load_data          Backtester.load_data (CSV parse + align)
+    loop_array         Backtester.run with the "array" engine
+    loop_event         Backtester.run with the "event" engine (only up to --event-max-rows)
+    signals_tick       MomentumStrategy.update_price + generate_signal per bar
+    signals_batch      MomentumStrategy.generate_signals over all bars
+    print_performance  Backtester.print_performance after a run
+    sweep              run_sweep over a 2 x 2 grid with the vectorized engine
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 10000 100000 1000000] [--cases ...] [--repeat 3]
+                                   [--output results.json] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from common import ROOT_DIR, synthetic_csv, timed
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.sweep import run_sweep
+
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+
+
+class Context:
+    """Synthetic files of one size, and the data loaded from them once."""
+    def __init__(self, index_file: Path, future_file: Path) -> None:
+        self.index_file = index_file
+        self.future_file = future_file
+        self.data = AlignedData.from_csv(index_file, future_file)
+
+    def backtester(self, engine: str = "array") -> Backtester:
+        backtester = Backtester(strategy=MomentumStrategy(threshold=0.0005), engine=engine,
+                                reporter=SilentReporter())
+        timed(backtester.load_aligned, self.data)
+        return backtester
+
+
+# Each case prepares its inputs (not timed) and returns the callable to time
+def case_load_data(ctx: Context) -> Callable:
+    backtester = Backtester(strategy=MomentumStrategy(), reporter=SilentReporter())
+    return lambda: backtester.load_data(index_file=ctx.index_file, future_file=ctx.future_file)
+
+
+def case_loop_array(ctx: Context) -> Callable:
+    return ctx.backtester("array").run
+
+
+def case_loop_event(ctx: Context) -> Callable:
+    return ctx.backtester("event").run
+
+
+def case_signals_tick(ctx: Context) -> Callable:
+    prices = ctx.data.future["Close"].tolist()
+    strategy = MomentumStrategy(threshold=0.0005)
+
+    def run() -> None:
+        update, signal = strategy.update_price, strategy.generate_signal
+        for price in prices:
+            update(price)
+            signal()
+    return run
+
+
+def case_signals_batch(ctx: Context) -> Callable:
+    strategy = MomentumStrategy(threshold=0.0005)
+    return lambda: strategy.generate_signals(ctx.data.future["Close"])
+
+
+def case_print_performance(ctx: Context) -> Callable:
+    backtester = ctx.backtester("array")
+    timed(backtester.run)
+    return backtester.print_performance
+
+
+def case_sweep(ctx: Context) -> Callable:
+    return lambda: run_sweep(ctx.data, thresholds=[0.0003, 0.0005], windows=[3, 5], max_workers=None)
+
+
+CASES: Dict[str, Callable[[Context], Callable]] = {
+    "load_data": case_load_data,
+    "loop_array": case_loop_array,
+    "loop_event": case_loop_event,
+    "signals_tick": case_signals_tick,
+    "signals_batch": case_signals_batch,
+    "print_performance": case_print_performance,
+    "sweep": case_sweep,
+}
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, object]:
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_case(name: str, ctx: Context, rows: int, repeat: int) -> Dict[str, object]:
+    """Best of ``repeat`` timings, each with freshly prepared inputs."""
+    times = []
+    for _ in range(repeat):
+        func = CASES[name](ctx)
+        elapsed, _ = timed(func)
+        times.append(elapsed)
+    best = min(times)
+    return {"case": name, "rows": rows, "seconds": best, "rows_per_second": rows / best if best > 0 else None,
+            "runs": times}
+
+
+def _per_second(rate: Optional[float]) -> str:
+    """Throughput for the summary lines; None when a case ran too fast to time."""
+    return "n/a" if rate is None else f"{rate:,.0f}"
+
+
+def compare(results: List[Dict[str, object]], baseline_file: Path) -> None:
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    old = {(r["case"], r["rows"]): r["seconds"] for r in baseline["results"]}
+    print(f"\nCompared with {baseline_file} (revision {baseline['environment'].get('revision')}):")
+    print(f"{'case':>18} {'rows':>11} {'old s':>10} {'new s':>10} {'speedup':>8}")
+    for r in results:
+        key = (r["case"], r["rows"])
+        if key in old:
+            speedup = f"{old[key] / r['seconds']:.2f}x" if r["seconds"] > 0 else "n/a"
+            print(f"{r['case']:>18} {r['rows']:>11,} {old[key]:>10.4f} {r['seconds']:>10.4f} {speedup:>8}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="rows of the synthetic files (10k - 50M)")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--event-max-rows", type=int, default=100_000,
+                        help="skip the slow event engine above this size")
+    parser.add_argument("--data-dir", default=None, help="keep the generated CSV files here for reuse")
+    parser.add_argument("--output", default=None, help="JSON file (default: benchmarks/results/<time>-<rev>.json)")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to compare with")
+    args = parser.parse_args(argv)
+
+    env = environment()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(args.data_dir) if args.data_dir else Path(tmp)
+        for rows in args.sizes:
+            start = time.perf_counter()
+            ctx = Context(*synthetic_csv(data_dir, rows))
+            print(f"{rows:,} rows (data ready in {time.perf_counter() - start:.1f}s)")
+            for name in args.cases:
+                if name == "loop_event" and rows > args.event_max_rows:
+                    continue
+                result = run_case(name, ctx, rows, args.repeat)
+                results.append(result)
+                print(f"  {name:>18}: {result['seconds']:10.4f}s  {_per_second(result['rows_per_second']):>14} rows/s")
+
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"{env['timestamp'].replace(':', '')}-{env['revision'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"environment": env, "repeat": args.repeat, "results": results}, f, indent=2)
+    print(f"Results written to {output}")
+    if args.compare:
+        compare(results, Path(args.compare))
+
+
+if __name__ == "__main__":
+    main()
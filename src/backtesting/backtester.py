@@ -1,9 +1,41 @@
+import os
 from datetime import timedelta
-from typing import Dict
+from typing import Iterable, Optional, Union
+import numpy as np
 import pandas as pd
-from .strategies import Strategy
-from .portfolio import Portfolio
-
+from .strategies import Strategy, MomentumStrategy, supports_batch
+from .portfolio import Portfolio, NettingPortfolio
+from .market_data import AlignedData, load_aligned_frames
+from .resample import resample
+from .data_cache import load_aligned_frames_cached
+from .vectorized import BUY, SELL, HOLD, run_vectorized_momentum, run_vectorized_signals
+from .execution import ExecutionModel
+from .kernels import run_kernel_momentum
+from .reporting import Reporter, ConsoleReporter
+from .streaming import iter_aligned_chunks
+from .ticks import BarBuilder, iter_tick_bars
+from .ledger import TradeLedger
+from .performance import PerformanceReport, compute_performance
+from .scheduler import ExpiryScheduler
+from .equity import EquityRecorder
+from .instrumentation import Instrumentation
+from .checkpoint import load_new_bars, load_state, mark_source, save_state
+
+# "event" looks up every bar in the DataFrames, "array" iterates over the
+# aligned NumPy arrays built by load_data, "vectorized" computes the
+# whole MomentumStrategy backtest with array operations and "jit" runs it
+# as a single (Numba compiled when available) loop
+ENGINES = ("event", "array", "vectorized", "jit")
+# Signal code -> signal name, see supports_batch
+SIGNAL_NAMES = {BUY: "buy", SELL: "sell", HOLD: "hold"}
+# Default equity_every: every bar of loaded data, nothing for the streaming
+# entry points (run_stream, run_ticks) whose memory must not grow with the bars
+EQUITY_AUTO: str = "auto"
+# Backtester attributes saved by save_checkpoint; the data, reporter and
+# instrumentation are not part of the state
+_CHECKPOINT_FIELDS = ("_strategy", "_initial_cash", "_holding_period", "_portfolio", "_expiries", "_equity",
+                      "daily_stats", "_current_day", "_current_day_code", "_current_time",
+                      "_current_index_price", "_current_future_price")
 
 
 class Backtester:
@@ -11,57 +43,371 @@ class Backtester:
     steps. The size of the time steps depend on the granularity of the
     data. When working with 1-minute interval data, each time step is
     taken 1 minute into the future.
+
+    :param engine: "event" (default), "array" for the fast path that
+        reads prices from contiguous arrays by position, "vectorized"
+        to backtest a MomentumStrategy without a per-bar loop, or "jit"
+        to backtest it in one compiled loop (see kernels.py)
+    :param holding_period: how long a position is held before it is closed
+    :param reporter: receives trade and end of day events, defaults to
+        printing them to the console
+    :param max_positions: number of positions that may be open at the
+        same time; above 1 the positions are tracked by a NettingPortfolio
+        and the strategy can scale into overlapping positions
+    :param equity_every: record cash, position and equity every
+        ``equity_every`` bars (see ``equity_curve``), None to not record.
+        By default every bar of loaded data is recorded, but nothing in
+        ``run_stream``/``run_ticks``; pass a number to record there too
+    :param batch_signals: when the strategy implements the batch
+        ``generate_signals``, compute the signals of a whole block of bars
+        with one call instead of two method calls per bar
+    :param instrumentation: time the phases of the backtest (data lookup,
+        strategy, portfolio, reporting, ...) and record bars/s and peak
+        memory per run; without it nothing is measured and nothing is slowed
+        down
+    :param execution: fill orders with this model (slippage, spread, delay,
+        volume cap, commission and short margin) instead of in full at the
+        index Close; only the vectorized engine supports it
     """
-    def __init__(self, strategy: Strategy, initial_cash: float = 100000.0) -> None:
+    def __init__(self, strategy: Strategy, initial_cash: float = 100000.0, engine: str = "event",
+                 holding_period: timedelta = timedelta(minutes=10),
+                 reporter: Optional[Reporter] = None, max_positions: int = 1,
+                 equity_every: Union[int, str, None] = EQUITY_AUTO, batch_signals: bool = True,
+                 instrumentation: Optional[Instrumentation] = None,
+                 execution: Optional[ExecutionModel] = None) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+        if max_positions < 1:
+            raise ValueError("max_positions must be at least 1")
+        if engine in ("vectorized", "jit") and max_positions != 1:
+            raise ValueError(f"The {engine} engine only supports one open position")
+        if execution is not None and engine != "vectorized":
+            raise ValueError("Execution models are only supported by the vectorized engine")
+        self._engine: str = engine
         self._strategy: Strategy = strategy
-        self._portfolio: Portfolio  = Portfolio(initial_cash=initial_cash)
+        self._batch_signals: bool = batch_signals and supports_batch(strategy)
+        self._initial_cash: float = initial_cash
+        self._execution: Optional[ExecutionModel] = execution
+        if execution is not None:
+            self._portfolio: Portfolio = Portfolio(initial_cash=initial_cash, short_margin=execution.short_margin)
+        elif max_positions == 1:
+            self._portfolio = Portfolio(initial_cash=initial_cash)
+        else:
+            self._portfolio = NettingPortfolio(initial_cash=initial_cash, max_positions=max_positions)
         self._index_data = None
         self._future_data = None
         self._times = None
+        self._data: AlignedData = None
+        self._day_codes = None
+        self._current_day_code = None
         self._current_index = -1
         self._current_time = None
         self._current_index_price = None
         self._current_future_price = None
-        self._close_schedule: Dict[pd.Timestamp, bool] = {}
+        # Pending position expiries keyed on int64 nanosecond close times
+        self._expiries: ExpiryScheduler = ExpiryScheduler()
+        self._holding_period: timedelta = holding_period
+        self._reporter: Reporter = reporter if reporter is not None else ConsoleReporter()
+        self._equity: Optional[EquityRecorder] = None
+        # Streamed runs only record when asked to explicitly
+        self._stream_equity: bool = equity_every not in (EQUITY_AUTO, None)
+        if equity_every == EQUITY_AUTO:
+            equity_every = 1
+        if equity_every is not None:
+            self._equity = EquityRecorder(initial_cash=initial_cash, every=equity_every)
         # For daily summaries and live trade tracking
         self._current_day = None
         # Dictionary to track daily PnL, trades, etc.
-        # daily_stats[date_str] = {"trades": [], "daily_pnl": float}
+        # daily_stats[date_str] = {"trades": [closed Trade, ...], "daily_pnl": float}
         self.daily_stats = {}
+        self.instrumentation: Optional[Instrumentation] = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
 
-    def load_data(self, index_file: str, future_file: str) -> None:
-        """Load the index and future data from CSV and align their time indexes."""
-        self._index_data = pd.read_csv(index_file, parse_dates=True, index_col="Datetime")
-        self._future_data = pd.read_csv(future_file, parse_dates=True, index_col="Datetime")
-
-        # Ensure both are sorted by datetime index just in case
-        self._index_data.sort_index(inplace=True)
-        self._future_data.sort_index(inplace=True)
-
-        # Find the intersection of the two time indexes
-        common_times = self._index_data.index.intersection(self._future_data.index)
+    def load_data(self, index_file: str, future_file: str, cache_dir: Optional[str] = None,
+                  refresh_cache: bool = False, timeframe: int = 1) -> None:
+        """Load the index and future data from CSV and align their time indexes.
 
-        # Filter both DataFrames to only the common times
-        self._index_data = self._index_data.loc[common_times]
-        self._future_data = self._future_data.loc[common_times]
+        :param cache_dir: when given, the aligned data is cached there in a
+            binary format and memory-mapped on later runs, as long as both
+            CSV files keep the same path, mtime and size
+        :param refresh_cache: rebuild the cache entry from the CSV files
+        :param timeframe: backtest on bars of this many minutes, aggregated
+            from the 1-minute bars (see resample.py)
+        """
+        if cache_dir is not None:
+            self._index_data, self._future_data = load_aligned_frames_cached(
+                index_file, future_file, cache_dir=cache_dir, refresh=refresh_cache)
+        else:
+            self._index_data, self._future_data = load_aligned_frames(index_file, future_file)
+        if timeframe != 1:
+            self.load_aligned(resample(AlignedData.from_frames(self._index_data, self._future_data), timeframe))
+            return
+        common_times = self._index_data.index
 
         # Extract the combined timeline as a list (for iteration)
         self._times = list(common_times)
 
+        # Contiguous arrays for the array engine
+        self._data = AlignedData.from_frames(self._index_data, self._future_data)
+        self._day_codes = self._data.day_codes()
+        self._reserve_equity()
+
         print(f"Data aligned. Common time steps: {len(self._times)}")
-        
+
+    def load_aligned(self, data: AlignedData) -> None:
+        """Use market data that is already aligned, e.g. a pair from a
+        DataPanel or the bars of one timeframe of ``resample.Timeframes``.
+        The arrays are used as they are, without copying; the DataFrames
+        needed by the "event" engine are only built for it.
+        """
+        times = data.times()
+        self._data = data
+        self._times = list(times)
+        self._day_codes = data.day_codes()
+        self._reserve_equity()
+        if self._engine == "event":
+            self._index_data = pd.DataFrame(data.index, index=times)
+            self._future_data = pd.DataFrame(data.future, index=times)
+        print(f"Data aligned. Common time steps: {len(self._times)}")
+
+    def _reserve_equity(self) -> None:
+        # The vectorized and jit engines do not fill the per-bar recorder
+        if self._equity is not None and self._engine not in ("vectorized", "jit"):
+            self._equity.reserve(len(self._times))
 
 
     def run(self) -> None:
-        # Example run method that simply iterates through all times
-        while self.next():
-            # At each step, we have self._current_time, _current_index_price, _current_future_price
-            # Strategy logic check:
-            self.check_strategy()
-            # Other logic...
+        if self._engine in ("vectorized", "jit"):
+            if self._engine == "jit":
+                self.run_kernel()
+            else:
+                self.run_vectorized()
+            self._reporter.close()
+            self.print_performance()
+            return
+
+        if self._batch_signals:
+            # All signals up front, the loop only acts on buy/sell bars
+            signals = self._generate_signals(self._data.future["Close"])
+            while self.next():
+                signal = signals[self._current_index]
+                if signal:
+                    self.act_on_signal(SIGNAL_NAMES[signal])
+        else:
+            # Example run method that simply iterates through all times
+            while self.next():
+                # At each step, we have self._current_time, _current_index_price, _current_future_price
+                # Strategy logic check:
+                self.check_strategy()
+                # Other logic...
+        self._extend_equity(0, self._data)
+        self._reporter.close()
+        self.print_performance()
+
+    def run_stream(self, index_file: str, future_file: str, chunksize: int = 100_000) -> None:
+        """Backtest straight from the CSV files without loading them.
+
+        Both files are read in chunks and merge-joined on Datetime on the
+        fly (see streaming.iter_aligned_chunks), so peak memory stays
+        bounded by the chunk size, whatever the file size. The files must
+        be sorted by Datetime. Trades and output are the same as ``run``.
+        The equity curve is only recorded with an explicit ``equity_every``.
+        """
+        self._run_blocks(iter_aligned_chunks(index_file, future_file, chunksize=chunksize))
+
+    def run_ticks(self, tick_file: str, bars: BarBuilder, chunksize: int = 1_000_000, **columns) -> None:
+        """Backtest on bars built on the fly from a (possibly compressed)
+        tick file, see ticks.py. Ticks are read ``chunksize`` at a time and
+        only one bar is held back between chunks, so files with hundreds of
+        millions of ticks never have to fit in memory. The strategy trades
+        the instrument of the ticks. The equity curve is only recorded
+        with an explicit ``equity_every``.
+
+        :param bars: e.g. ``TimeBarBuilder.minutes(1)`` or ``VolumeBarBuilder(500)``
+        :param columns: tick file column names, see ``ticks.iter_ticks``
+        """
+        self._run_blocks(iter_tick_bars(tick_file, bars, chunksize=chunksize, **columns))
+
+    def _run_blocks(self, blocks: Iterable[AlignedData]) -> None:
+        """Run the per-bar loop over blocks of bars as they are produced."""
+        if not self._stream_equity:
+            # Keep memory bounded by the block size
+            self._equity = None
+        for chunk in blocks:
+            first_bar = self._current_index + 1
+            times = list(chunk.times())
+            day_codes = chunk.day_codes().tolist()
+            index_prices = chunk.index["Close"].tolist()
+            future_prices = chunk.future["Close"].tolist()
+            signals = None
+            if self._batch_signals:
+                signals = self._generate_signals(chunk.future["Close"])
+            for i in range(len(times)):
+                self._current_index += 1
+                self._current_time = times[i]
+                self._current_index_price = index_prices[i]
+                self._current_future_price = future_prices[i]
+                self._on_bar(day_codes[i])
+                if signals is None:
+                    self.check_strategy()
+                elif signals[i]:
+                    self.act_on_signal(SIGNAL_NAMES[signals[i]])
+            self._extend_equity(first_bar, chunk)
+        self.finish()
+
+    def process_bar(self, time: pd.Timestamp, index_price: float, future_price: float) -> None:
+        """Run the per-bar logic (expiries, day change, strategy and
+        orders) on one bar that is not part of the loaded data, e.g. a bar
+        from a live feed (see live.py). Call ``finish`` after the last bar.
+        """
+        self._current_index += 1
+        self._current_time = time
+        self._current_index_price = index_price
+        self._current_future_price = future_price
+        self._on_bar()
+        self.check_strategy()
+
+    def finish(self) -> None:
+        """End a run fed bar by bar: report the last day, flush the
+        reporter and print the performance.
+        """
+        if self._current_day:
+            self.print_end_of_day_summary(self._current_day)
+        self._reporter.close()
         self.print_performance()
 
+    def save_checkpoint(self, path: str, sources: Iterable[str] = ()) -> None:
+        """Save the complete engine state (strategy, portfolio with open
+        trades and ledger, scheduled closes, daily statistics, equity
+        curve and current bar) to a compressed file, without the market
+        data, so ``load_checkpoint`` can continue the backtest on new bars.
+
+        :param sources: CSV files the bars came from; they are marked so
+            ``run_incremental`` only parses what is appended to them later
+        """
+        if self._engine in ("vectorized", "jit"):
+            raise ValueError(f"The {self._engine} engine does not support checkpoints")
+        state = {name: getattr(self, name) for name in _CHECKPOINT_FIELDS}
+        sources = tuple(sources)
+        if sources and self._current_time is not None:
+            state["sources"] = tuple(mark_source(source, upto=self._current_time.value) for source in sources)
+        else:
+            state["sources"] = ()
+        save_state(path, state)
+
+    def load_checkpoint(self, path: str) -> tuple:
+        """Restore the state saved by ``save_checkpoint``. The next data
+        loaded (``load_data``/``load_aligned``, only the bars after the
+        checkpoint) continues where the saved run stopped.
+
+        :return: the source marks saved with the checkpoint
+        """
+        if self._engine in ("vectorized", "jit"):
+            raise ValueError(f"The {self._engine} engine does not support checkpoints")
+        state = load_state(path)
+        sources = state.pop("sources")
+        for name, value in state.items():
+            setattr(self, name, value)
+        # Bars of the next data are numbered from 0 again
+        self._current_index = -1
+        if self._equity is not None:
+            self._equity.restart_bars()
+        return sources
+
+    def run_incremental(self, index_file: str, future_file: str, checkpoint: str) -> int:
+        """Backtest only the bars that are new since the last call.
+
+        The first call runs over all data; every call ends by saving a
+        checkpoint. Later calls restore it, parse only the rows appended
+        to the CSV files since then (the files are read in full if they
+        were changed otherwise) and process only the bars after the last
+        one seen, so a daily refresh costs the new day's bars.
+
+        :return: number of bars processed
+        """
+        if os.path.exists(checkpoint):
+            marks = self.load_checkpoint(checkpoint)
+            data = load_new_bars(index_file, future_file, after=self._current_time.value, marks=marks)
+            if len(data) == 0:
+                print("No new bars since the checkpoint")
+                return 0
+            self.load_aligned(data)
+        else:
+            self.load_data(index_file=index_file, future_file=future_file)
+        self.run()
+        self.save_checkpoint(checkpoint, sources=(index_file, future_file))
+        return len(self._times)
+
+    def _generate_signals(self, prices) -> list:
+        """Batch signals of a block of future prices as a list of codes."""
+        return self._strategy.generate_signals(prices).tolist()
+
+    def _extend_equity(self, first_bar: int, block: AlignedData) -> None:
+        """Record the equity of a block of bars once they are processed."""
+        self.record_equity(first_bar, block.timestamps, block.index["Close"])
+
+    def record_equity(self, first_bar: int, timestamps: np.ndarray, prices: np.ndarray) -> None:
+        """Record the equity of the bars ``first_bar, first_bar + 1, ...``
+        (int64 ns timestamps and index Close prices) once they are processed.
+        """
+        if self._equity is not None:
+            self._equity.extend(first_bar, timestamps, prices)
+
+    def run_vectorized(self) -> None:
+        """Backtest the strategy over the whole aligned timeline with array
+        operations. Produces the same completed trades and cash as the
+        event loop, without the per-trade console output and daily
+        summaries. Needs a MomentumStrategy or a strategy implementing the
+        batch ``generate_signals``.
+        """
+        if isinstance(self._strategy, MomentumStrategy):
+            self._portfolio = run_vectorized_momentum(
+                self._data,
+                threshold=self._strategy.threshold,
+                window=self._strategy.window,
+                holding_period=self._holding_period,
+                initial_cash=self._portfolio.cash,
+                momentum=self._strategy.batch_momentum(self._data.future["Close"]),
+                execution=self._execution,
+            )
+        elif supports_batch(self._strategy):
+            self._portfolio = run_vectorized_signals(
+                self._data,
+                self._strategy.generate_signals(self._data.future["Close"]),
+                holding_period=self._holding_period,
+                initial_cash=self._portfolio.cash,
+                execution=self._execution,
+            )
+        else:
+            raise TypeError("The vectorized engine needs a MomentumStrategy or a strategy "
+                            "implementing generate_signals")
+        self._end_of_data()
+
+    def run_kernel(self) -> None:
+        """Backtest the MomentumStrategy with the single-loop kernel of
+        kernels.py. Same trades and cash as the event loop, without the
+        per-trade console output and daily summaries.
+        """
+        if not isinstance(self._strategy, MomentumStrategy):
+            raise TypeError("The jit engine only supports MomentumStrategy")
+        self._portfolio = run_kernel_momentum(
+            self._data,
+            threshold=self._strategy.threshold,
+            window=self._strategy.window,
+            holding_period=self._holding_period,
+            initial_cash=self._portfolio.cash,
+        )
+        self._end_of_data()
+
+    def _end_of_data(self) -> None:
+        """Move to the last bar after a run without a per-bar loop."""
+        self._current_index = len(self._data) - 1
+        self._current_time = self._times[-1]
+        self._current_index_price = self._data.index["Close"][-1]
+        self._current_future_price = self._data.future["Close"][-1]
+
     def next(self) -> bool:
         """Continue to the next time step.
 
@@ -77,19 +423,44 @@ class Backtester:
         
         self._current_time = self._times[self._current_index]
 
-        # Fetch the current data row for index and future
-        current_index_row = self._index_data.loc[self._current_time]
-        current_future_row = self._future_data.loc[self._current_time]
+        if self._engine == "array":
+            # Positional lookups in the aligned arrays
+            self._current_index_price = self._data.index["Close"][self._current_index]
+            self._current_future_price = self._data.future["Close"][self._current_index]
+        else:
+            # Fetch the current data row for index and future
+            current_index_row = self._index_data.loc[self._current_time]
+            current_future_row = self._future_data.loc[self._current_time]
+
+            # Store current prices (e.g., 'Close' price or whichever you use for the strategy)
+            self._current_index_price = current_index_row["Close"]
+            self._current_future_price = current_future_row["Close"]
+
+        day_code = self._day_codes[self._current_index] if self._engine == "array" else None
+        self._on_bar(day_code)
 
-        # Store current prices (e.g., 'Close' price or whichever you use for the strategy)
-        self._current_index_price = current_index_row["Close"]
-        self._current_future_price = current_future_row["Close"]
+        # Return True to signal that there are more time steps to process
+        return True
 
+    def _on_bar(self, day_code=None) -> None:
+        """Bookkeeping for a new bar once the current time and prices are
+        set: expire positions and track day changes.
+
+        :param day_code: precomputed code of the bar's day (see
+            AlignedData.day_codes); when given the date is only formatted
+            when the code changes
+        """
         # Update the portfolio's current time to align with the new time step
         self._portfolio.set_current_time(self._current_time)
 
         # Close any positions that have expired based on the current time
         self.close_expired_positions()
+
+        if day_code is not None:
+            if day_code == self._current_day_code:
+                return
+            self._current_day_code = day_code
+
         # Determine current day as a string (e.g. "2024-12-03")
         new_day = self._current_time.date().isoformat()
 
@@ -105,9 +476,6 @@ class Backtester:
             self._current_day = new_day
             self.daily_stats[new_day] = {"trades": [], "daily_pnl": 0.0}
 
-        # Return True to signal that there are more time steps to process
-        return True
-
     def check_strategy(self) -> bool:
         """Check if the currently active strategy should take any
         action.
@@ -134,20 +502,21 @@ class Backtester:
 
         # Get trading signal
         signal = self._strategy.generate_signal()
+        self.act_on_signal(signal)
 
-        # If signal = buy/sell and no open position, open one
-        if signal == "buy" and self._portfolio.open_trade is None:
+    def act_on_signal(self, signal: str) -> None:
+        """Open a position on a "buy" or "sell" signal at the current bar."""
+        # If signal = buy/sell and there is room for a position, open one
+        if signal == "buy" and self._portfolio.can_open():
             opened = self.open_position(direction="long", price=self._current_index_price)
             if opened:
-                close_time = self._current_time + timedelta(minutes=10)
-                self._close_schedule[close_time] = True
+                self.schedule_close(self._portfolio.open_trade)
 
-        elif signal == "sell" and self._portfolio.open_trade is None:
+        elif signal == "sell" and self._portfolio.can_open():
             opened = self.open_position(direction="short", price=self._current_index_price)
             if opened:
-                close_time = self._current_time + timedelta(minutes=10)
-                self._close_schedule[close_time] = True
-        # If hold or position already open, do nothing special here
+                self.schedule_close(self._portfolio.open_trade)
+        # If hold or no room for another position, do nothing special here
 
 
     def open_position(self, direction: str, price: float) -> bool:
@@ -156,64 +525,95 @@ class Backtester:
         """
         opened = self._portfolio.open_position(direction, price)
         if opened and self._portfolio.open_trade:
-            trade = self._portfolio.open_trade
-            # Print trade details as it's opened
-            print(f"[{trade.open_time}] OPEN {trade.direction.upper()} at {trade.open_price:.2f}, Commission: {trade.commissions:.2f}, Cash: {self._portfolio.cash:.2f}")
-            # Record this trade in daily stats
-            self.daily_stats[self._current_day]["trades"].append({
-                "direction": trade.direction,
-                "open_time": trade.open_time,
-                "open_price": trade.open_price,
-                "type": "open"
-            })
+            # Report trade details as it's opened
+            self._reporter.on_open(self._portfolio.open_trade, self._portfolio.cash)
+            self._record_change()
         return opened
 
-    def close_position(self) -> None:
+    def close_position(self, trade=None) -> None:
         """Mock placing a CLOSING order that trades to close an existing
         position.
+
+        :param trade: the open trade to close, by default the open trade
+            (or the oldest one when several are open)
         """
-        if self._portfolio.open_trade:
-            open_trade = self._portfolio.open_trade
-            self._portfolio.close_position(price=self._current_index_price)
+        if self._portfolio.open_trade and (trade is None or self._portfolio.is_open(trade)):
+            self._portfolio.close_position(price=self._current_index_price, trade=trade)
             closed_trade = self._portfolio.completed_trades[-1]
-            # Print trade details as it's closed
-            print(f"[{closed_trade.close_time}] CLOSE {closed_trade.direction.upper()} at {closed_trade.close_price:.2f}, PnL: {closed_trade.realized_pnl:.2f}, Cash: {self._portfolio.cash:.2f}")
+            # Report trade details as it's closed
+            self._reporter.on_close(closed_trade, self._portfolio.cash)
             # Record the closing trade in daily stats
-            self.daily_stats[self._current_day]["trades"].append({
-                "direction": closed_trade.direction,
-                "open_time": closed_trade.open_time,
-                "open_price": closed_trade.open_price,
-                "close_time": closed_trade.close_time,
-                "close_price": closed_trade.close_price,
-                "realized_pnl": closed_trade.realized_pnl,
-                "type": "close"
-            })
+            day_stats = self.daily_stats[self._current_day]
+            day_stats["trades"].append(closed_trade)
             # Update daily PnL
-            self.daily_stats[self._current_day]["daily_pnl"] += closed_trade.realized_pnl
+            day_stats["daily_pnl"] += closed_trade.realized_pnl
+            self._record_change()
+
 
+    def schedule_close(self, trade, holding_period: Optional[timedelta] = None) -> None:
+        """Schedule ``trade`` to be closed once ``holding_period`` (the
+        backtester's holding period by default) has passed.
+        """
+        if holding_period is None:
+            holding_period = self._holding_period
+        close_time = self._current_time + holding_period
+        self._expiries.schedule(close_time.value, trade)
 
     def close_expired_positions(self) -> None:
-        # If current_time in close_schedule and True, close position
-        if self._current_time in self._close_schedule and self._close_schedule[self._current_time]:
-            self.close_position()
-            self._close_schedule[self._current_time] = False
+        """Close every position whose close time is at or before the
+        current bar, so a position also closes when the bar at its exact
+        close time is missing from the data.
+        """
+        next_time = self._expiries.next_time()
+        if next_time is None or next_time > self._current_time.value:
+            return
+        for trade in self._expiries.pop_due(self._current_time.value):
+            # Skip positions that were already closed some other way
+            if self._portfolio.is_open(trade):
+                self.close_position(trade)
 
 
+    def _record_change(self) -> None:
+        """Log the portfolio state after a position was opened or closed,
+        for the equity curve.
+        """
+        if self._equity is None:
+            return
+        portfolio = self._portfolio
+        self._equity.on_change(self._current_index, portfolio.cash, portfolio.margin,
+                               portfolio.net_position(), portfolio.position_cost())
+
+    def equity_curve(self) -> pd.DataFrame:
+        """Cash, net position and equity (net liquidation value, so the
+        short margin held back from cash is not a drawdown) per bar after
+        ``run`` or ``run_stream``, indexed by ``Datetime``. Not recorded by
+        the "vectorized" and "jit" engines.
+        """
+        if self._equity is None:
+            raise ValueError("Equity is not recorded, pass equity_every to the Backtester")
+        tz = self._current_time.tz if isinstance(self._current_time, pd.Timestamp) else None
+        return self._equity.to_frame(tz=tz)
+
     def print_end_of_day_summary(self, day_str: str) -> None:
-        """Print summary of the given day if data exists."""
+        """Report the summary of the given day if data exists."""
         if day_str in self.daily_stats:
             day_data = self.daily_stats[day_str]
-            trades = day_data["trades"]
-            daily_pnl = day_data["daily_pnl"]
-            num_trades = sum(1 for t in trades if t["type"] == "close")
-            print(f"=== End of day {day_str} Summary ===")
-            print(f"Trades closed this day: {num_trades}")
-            print(f"Daily PnL: {daily_pnl:.2f}")
-            print("Details:")
-            for t in trades:
-                if t["type"] == "close":
-                    print(f" - {t['direction'].upper()} from {t['open_time']} at {t['open_price']:.2f}, closed {t['close_time']} at {t['close_price']:.2f}, PnL: {t['realized_pnl']:.2f}")       
-   
+            self._reporter.on_day_end(day_str, day_data["trades"], day_data["daily_pnl"])
+
+    def performance(self) -> PerformanceReport:
+        """Compute the performance statistics of the completed trades."""
+        completed_trades = self._portfolio.completed_trades
+        if not isinstance(completed_trades, TradeLedger):
+            completed_trades = TradeLedger.from_trades(t for t in completed_trades if t.realized_pnl is not None)
+        # Net liquidation value, like the last point of the equity curve
+        final_equity = self._portfolio.net_liquidation_value(self._current_index_price)
+        equity = timestamps = None
+        if self._equity is not None and len(self._equity) > 1:
+            # Drawdowns from the per-bar equity instead of per closed trade
+            equity, timestamps = self._equity.equity, self._equity.timestamps
+        return compute_performance(completed_trades, initial_capital=self._initial_cash,
+                                   equity=equity, timestamps=timestamps, final_equity=final_equity)
+
     def print_performance(self) -> None:
         """Print the realized performance to the console.
 
@@ -224,56 +624,19 @@ class Backtester:
         - Geometric Profit/Loss (PnL)
         - Sharpe Ratio
         """
-        completed_trades = self._portfolio.completed_trades
-        if not completed_trades:
+        if not self._portfolio.completed_trades:
             print("No trades executed.")
             return
 
-        pnls = [t.realized_pnl for t in completed_trades if t.realized_pnl is not None]
-        winners = sum(1 for p in pnls if p > 0)
-        losers = sum(1 for p in pnls if p < 0)
-        avg_pnl = sum(pnls)/len(pnls) if pnls else 0.0
-
-        # Geometric mean of returns per trade:
-        initial_capital = 100000.0
-        returns = [(1 + (p/initial_capital)) for p in pnls]
-        # Compute geometric mean
-        # geom_mean = (product of returns)^(1/N) - 1
-        N=len(returns)
-        if N > 0:
-            product_of_returns = 1.0
-            for r in returns:
-                product_of_returns *= r
-            geom_mean = product_of_returns**(1/N) - 1
-        else:
-            geom_mean = 0.0
-        # Sharpe ratio
-        # mean_ret = sum((p/initial_capital) for p in pnls)/len(pnls) if pnls else 0.0
-        # var_ret = sum((p/initial_capital - mean_ret)**2 for p in pnls)/(len(pnls)-1) if len(pnls) > 1 else 0
-        # std_ret = var_ret**0.5
-        # sharpe = mean_ret/std_ret if std_ret > 0 else 0.0
-        if N > 0:
-            trade_returns = [p/initial_capital for p in pnls]
-            mean_ret = sum(trade_returns)/N
-        else:
-            mean_ret = 0.0
-
-        if N > 1:
-            var = sum((r - mean_ret)**2 for r in trade_returns)/(N-1)
-            std_ret = var**0.5
-        else:
-            std_ret = 0.0
-
-        sharpe = mean_ret/std_ret if std_ret > 0 else 0.0
-
-
-        final_equity = self._portfolio.total_equity(current_price=self._current_index_price)
-
+        report = self.performance()
         print("=== Performance Summary ===")
-        print(f"Number of Trades: {len(pnls)}")
-        print(f"Winners: {winners}")
-        print(f"Losers: {losers}")
-        print(f"Average PnL: {avg_pnl:.2f}")
-        print(f"Geometric Mean PnL per Trade: {geom_mean:.2e}")
-        print(f"Sharpe Ratio: {sharpe:.4f}")
-        print(f"Final Portfolio Value: {final_equity:.2f}")
+        print(f"Number of Trades: {report.num_trades}")
+        print(f"Winners: {report.winners}")
+        print(f"Losers: {report.losers}")
+        print(f"Average PnL: {report.avg_pnl:.2f}")
+        print(f"Geometric Mean PnL per Trade: {report.geometric_mean:.2e}")
+        print(f"Sharpe Ratio: {report.sharpe:.4f}")
+        print(f"Sortino Ratio: {report.sortino:.4f}")
+        print(f"Profit Factor: {report.profit_factor:.2f}")
+        print(f"Max Drawdown: {report.max_drawdown:.2%}")
+        print(f"Final Portfolio Value: {report.final_equity:.2f}")
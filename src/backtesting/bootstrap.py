@@ -0,0 +1,249 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from .ledger import TradeLedger
+from .performance import drawdown, sharpe_ratio
+
+# "shuffle" permutes the order (only the drawdown changes), "iid" draws
+# with replacement and "block" draws runs of consecutive values with
+# replacement (circular block bootstrap), keeping short-range dependence
+METHODS = ("shuffle", "iid", "block")
+STATISTICS = ("sharpe", "max_drawdown", "final_equity")
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """Statistics of every resample of a series of trades or bar returns,
+    next to the statistics of the series as it happened.
+    """
+    method: str
+    block_size: int
+    observed: pd.Series
+    sharpe: np.ndarray
+    max_drawdown: np.ndarray
+    final_equity: np.ndarray
+
+    @property
+    def n_resamples(self) -> int:
+        return len(self.sharpe)
+
+    def samples(self) -> pd.DataFrame:
+        """One row per resample, one column per statistic."""
+        return pd.DataFrame({name: getattr(self, name) for name in STATISTICS})
+
+    def confidence_intervals(self, level: float = 0.95) -> pd.DataFrame:
+        """Percentile confidence intervals.
+
+        :param level: probability mass between ``lower`` and ``upper``
+        :return: one row per statistic with the observed value, the mean
+            and standard deviation over the resamples and the interval
+        """
+        tail = (1.0 - level) / 2.0
+        samples = self.samples()
+        return pd.DataFrame({
+            "observed": self.observed,
+            "mean": samples.mean(),
+            "std": samples.std(ddof=1),
+            "lower": samples.quantile(tail),
+            "upper": samples.quantile(1.0 - tail),
+        })
+
+
+class _Series:
+    """A series prepared for resampling.
+
+    :param returns: per-step returns the Sharpe ratio is computed from
+    :param steps: equity change per step, added up (or compounded as
+        returns when ``compound``) on top of ``initial``
+    """
+    def __init__(self, returns: np.ndarray, steps: np.ndarray, initial: float, compound: bool) -> None:
+        self.mean = float(returns.mean())
+        # Centered, so the variance of a resample can be taken from its sums
+        # without losing precision when the mean is large against the spread
+        self.centered = returns - self.mean
+        self.steps = steps
+        self.initial = float(initial)
+        self.compound = compound
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def sharpe(self, centered: np.ndarray) -> np.ndarray:
+        """Sharpe ratio of every row of resampled ``centered`` returns."""
+        n = centered.shape[1]
+        sharpe = np.zeros(len(centered))
+        if n < 2:
+            return sharpe
+        offset = centered.sum(axis=1) / n
+        variance = (np.einsum("ij,ij->i", centered, centered) - n * offset * offset) / (n - 1)
+        std = np.sqrt(np.maximum(variance, 0.0))
+        np.divide(offset + self.mean, std, out=sharpe, where=std > 0)
+        return sharpe
+
+    def path(self, steps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Maximum drawdown and final equity of every row of resampled
+        ``steps``, which are overwritten.
+        """
+        if self.compound:
+            equity = np.add(steps, 1.0, out=steps)
+            np.cumprod(equity, axis=1, out=equity)
+            equity *= self.initial
+        else:
+            equity = np.cumsum(steps, axis=1, out=steps)
+            equity += self.initial
+        final_equity = equity[:, -1].copy()
+        # The peak includes the initial equity, like the equity curve starting at it
+        peaks = np.maximum.accumulate(equity, axis=1)
+        np.maximum(peaks, self.initial, out=peaks)
+        np.divide(equity, peaks, out=equity)
+        return equity.min(axis=1, initial=1.0) - 1.0, final_equity
+
+    def resample(self, n_resamples: int, rng: np.random.Generator, method: str,
+                 block_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sharpe, maximum drawdown and final equity of ``n_resamples``
+        resamples, all drawn at once.
+        """
+        n = len(self)
+        if method == "shuffle":
+            # The order does not change the Sharpe ratio, only the path
+            steps = rng.permuted(np.broadcast_to(self.steps, (n_resamples, n)), axis=1)
+            sharpe = np.repeat(self.sharpe(self.centered[None, :]), n_resamples)
+            return (sharpe,) + self.path(steps)
+        if method == "iid":
+            positions = rng.integers(0, n, size=(n_resamples, n))
+            centered, steps = self.centered[positions], self.steps[positions]
+        else:
+            # Circular blocks: every block is a row of a sliding window view
+            # over the series extended by its first block_size - 1 values
+            blocks = -(-n // block_size)
+            starts = rng.integers(0, n, size=(n_resamples, blocks))
+            centered, steps = (
+                sliding_window_view(np.concatenate((values, values[:block_size - 1])), block_size)[starts]
+                .reshape(n_resamples, blocks * block_size)[:, :n]
+                for values in (self.centered, self.steps))
+        return (self.sharpe(centered),) + self.path(steps)
+
+
+def _run_batch(series: _Series, method: str, block_size: int, n_resamples: int,
+               seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return series.resample(n_resamples, np.random.default_rng(seed), method, block_size)
+
+
+# Series resampled by the current worker process, set by _init_worker
+_worker_series: Optional[_Series] = None
+
+
+def _init_worker(series: _Series) -> None:
+    global _worker_series
+    _worker_series = series
+
+
+def _run_batch_in_worker(task: Tuple[str, int, int, np.random.SeedSequence]):
+    return _run_batch(_worker_series, *task)
+
+
+def _observed(returns: np.ndarray, steps: np.ndarray, initial: float, compound: bool) -> pd.Series:
+    """Statistics of the series in its original order, computed the same
+    way as ``compute_performance``.
+    """
+    if compound:
+        equity = initial * np.cumprod(1.0 + steps)
+    else:
+        equity = initial + np.cumsum(steps)
+    max_drawdown, _ = drawdown(np.concatenate(([initial], equity)))
+    return pd.Series({"sharpe": sharpe_ratio(returns), "max_drawdown": max_drawdown,
+                      "final_equity": float(equity[-1])})
+
+
+def _bootstrap(returns: np.ndarray, steps: np.ndarray, initial: float, compound: bool, n_resamples: int,
+               method: str, block_size: Optional[int], seed: Optional[int], max_workers: Optional[int],
+               batch_elements: int) -> BootstrapResult:
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+    n = len(returns)
+    if n == 0:
+        raise ValueError("Nothing to resample")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be at least 1")
+    if method != "block":
+        block_size = 1
+    elif block_size is None:
+        # Common rule of thumb: block length growing with the cube root of the length
+        block_size = max(1, int(round(n ** (1.0 / 3.0))))
+    block_size = min(int(block_size), n)
+    series = _Series(returns, steps, initial, compound)
+    # Resamples are drawn in fixed batches, each from its own child seed, so
+    # the results only depend on the seed and not on the number of workers
+    rows = max(1, batch_elements // n)
+    counts = [min(rows, n_resamples - start) for start in range(0, n_resamples, rows)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    tasks = [(method, block_size, count, child) for count, child in zip(counts, seeds)]
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        results = [_run_batch(series, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(series,)) as executor:
+            results = list(executor.map(_run_batch_in_worker, tasks))
+    sharpe, max_drawdown, final_equity = (np.concatenate(parts) for parts in zip(*results))
+    return BootstrapResult(
+        method=method,
+        block_size=block_size,
+        observed=_observed(returns, steps, initial, compound),
+        sharpe=sharpe,
+        max_drawdown=max_drawdown,
+        final_equity=final_equity,
+    )
+
+
+def bootstrap_trades(trades: Union[TradeLedger, np.ndarray], initial_capital: float = 100000.0,
+                     commissions: Optional[np.ndarray] = None, n_resamples: int = 10_000,
+                     method: str = "block", block_size: Optional[int] = None, seed: Optional[int] = 0,
+                     max_workers: Optional[int] = None, batch_elements: int = 1 << 22) -> BootstrapResult:
+    """Resample the trades of a backtest ``n_resamples`` times.
+
+    The statistics are those of ``compute_performance``: the Sharpe ratio
+    of the per-trade returns relative to ``initial_capital`` and the
+    drawdown and final value of the equity after every trade, net of
+    commissions.
+
+    :param trades: a TradeLedger, or the realized PnL per trade
+    :param commissions: commissions per trade when ``trades`` is a PnL array
+    :param method: one of METHODS
+    :param block_size: trades per block of the "block" method, by default
+        the cube root of the number of trades
+    :param seed: the same seed (and ``batch_elements``) gives the same
+        resamples, whatever ``max_workers``
+    :param max_workers: worker processes, None for all cores
+    :param batch_elements: values resampled at once (bounds the memory)
+    """
+    if isinstance(trades, TradeLedger):
+        pnls, commissions = trades.realized_pnl, trades.commissions
+    else:
+        pnls = np.asarray(trades, dtype=np.float64)
+        commissions = np.zeros(len(pnls)) if commissions is None else np.asarray(commissions, dtype=np.float64)
+    returns = pnls / initial_capital
+    return _bootstrap(returns, pnls - commissions, initial_capital, False, n_resamples, method, block_size,
+                      seed, max_workers, batch_elements)
+
+
+def bootstrap_returns(equity: Union[pd.Series, np.ndarray], n_resamples: int = 10_000, method: str = "block",
+                      block_size: Optional[int] = None, seed: Optional[int] = 0,
+                      max_workers: Optional[int] = None, batch_elements: int = 1 << 22) -> BootstrapResult:
+    """Resample the per-bar returns of an equity curve (e.g. the "equity"
+    column of ``Backtester.equity_curve``) ``n_resamples`` times. Each
+    resample compounds its returns from the first equity value. The Sharpe
+    ratio is per bar, not annualized.
+
+    See ``bootstrap_trades`` for the other parameters.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    returns = equity[1:] / equity[:-1] - 1.0
+    return _bootstrap(returns, returns, float(equity[0]), True, n_resamples, method, block_size,
+                      seed, max_workers, batch_elements)
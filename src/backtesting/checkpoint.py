@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from .market_data import AlignedData, align_frames, load_aligned_frames, to_int64_ns
+
+PathLike = Union[str, Path]
+
+# Bump when the layout of the saved state changes; older checkpoints are rejected
+CHECKPOINT_VERSION: int = 2
+# Bytes before the mark whose digest detects a rewritten (not just appended) file
+_TAIL_BYTES = 4096
+
+
+@dataclass(frozen=True)
+class SourceMark:
+    """Where the rows after time ``upto`` (int64 ns) start in a CSV file:
+    everything before byte ``offset`` is at or before ``upto``.
+    """
+    path: str
+    upto: int
+    offset: int
+    tail_digest: str
+
+
+def _tail_digest(f, offset: int) -> str:
+    start = max(0, offset - _TAIL_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _line_times(lines) -> np.ndarray:
+    return to_int64_ns(pd.DatetimeIndex(pd.to_datetime([line.split(b",", 1)[0].decode() for line in lines], utc=True)))
+
+
+def mark_source(path: PathLike, upto: int, block_size: int = 1 << 16) -> SourceMark:
+    """Mark the end of the rows at or before ``upto`` in a CSV file sorted
+    by time. The file is scanned backwards from its end, so only the rows
+    after ``upto`` (and a partly written last line) are read.
+    """
+    with open(path, "rb") as f:
+        header_end = len(f.readline())
+        end = f.seek(0, os.SEEK_END)
+        offset = header_end
+        tail = b""
+        while end > header_end:
+            start = max(header_end, end - block_size)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            # The first line of the block may be cut, unless it starts at the header
+            first = 0 if start == header_end else tail.find(b"\n") + 1
+            if first == 0 and start != header_end:
+                end = start
+                continue
+            lines = tail[first:].split(b"\n")
+            # A last line without newline is still being written
+            complete = lines[:-1]
+            if complete:
+                times = _line_times(complete)
+                before = np.flatnonzero(times <= upto)
+                if len(before):
+                    k = before[-1]
+                    offset = start + first + sum(len(line) + 1 for line in complete[:k + 1])
+                    break
+            tail = tail[:first]
+            end = start
+        return SourceMark(os.path.abspath(path), upto, offset, _tail_digest(f, offset))
+
+
+def _read_appended(mark: SourceMark) -> Optional[pd.DataFrame]:
+    """Rows written after ``mark``, or None when the file was changed in
+    any other way than appending.
+    """
+    with open(mark.path, "rb") as f:
+        if f.seek(0, os.SEEK_END) < mark.offset or _tail_digest(f, mark.offset) != mark.tail_digest:
+            return None
+        f.seek(0)
+        header = f.readline().decode().strip().split(",")
+        f.seek(mark.offset)
+        if not f.peek(1)[:1]:
+            return pd.DataFrame(columns=header[1:], index=pd.DatetimeIndex([], name="Datetime"))
+        return pd.read_csv(f, names=header, header=None, parse_dates=True, index_col="Datetime")
+
+
+def load_new_bars(index_file: PathLike, future_file: PathLike, after: int,
+                  marks: Tuple[SourceMark, ...] = ()) -> AlignedData:
+    """Aligned bars after time ``after`` (int64 ns).
+
+    When both files were marked up to ``after`` (or earlier) and were
+    only appended to since, parsing starts at the marks, so the cost
+    depends on the new rows alone; otherwise both files are read in full.
+    """
+    marks_by_path = {mark.path: mark for mark in marks}
+    frames = None
+    index_mark = marks_by_path.get(os.path.abspath(index_file))
+    future_mark = marks_by_path.get(os.path.abspath(future_file))
+    if index_mark is not None and future_mark is not None and \
+            index_mark.upto <= after and future_mark.upto <= after:
+        index_data, future_data = _read_appended(index_mark), _read_appended(future_mark)
+        if index_data is not None and future_data is not None:
+            frames = align_frames(index_data, future_data)
+    if frames is None:
+        frames = load_aligned_frames(index_file, future_file)
+    index_data, future_data = frames
+    new = to_int64_ns(pd.DatetimeIndex(index_data.index)) > after
+    return AlignedData.from_frames(index_data[new], future_data[new])
+
+
+def save_state(path: PathLike, state: dict) -> None:
+    """Pickle ``state`` gzip compressed, replacing ``path`` atomically so an
+    interrupted save leaves the previous checkpoint intact.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+        pickle.dump({"version": CHECKPOINT_VERSION, **state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_state(path: PathLike) -> dict:
+    with gzip.open(path, "rb") as f:
+        state = pickle.load(f)
+    if state.pop("version", None) != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} was written by an incompatible version")
+    return state
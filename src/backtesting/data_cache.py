@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from .market_data import load_aligned_frames, to_int64_ns
+
+PathLike = Union[str, Path]
+
+# Bump when the on-disk layout changes so old entries are rebuilt
+CACHE_VERSION: int = 1
+
+
+def _entry_dir(cache_dir: PathLike, index_file: PathLike, future_file: PathLike) -> Path:
+    """Directory holding the cache entry for this pair of source files."""
+    paths = f"{Path(index_file).resolve()}|{Path(future_file).resolve()}"
+    return Path(cache_dir) / hashlib.sha1(paths.encode()).hexdigest()[:16]
+
+
+def source_fingerprint(*files: PathLike) -> List[Dict[str, object]]:
+    """Path, mtime and size of every source file. A cache entry is only
+    valid while all of them are unchanged.
+    """
+    fingerprint = []
+    for file in files:
+        stat = os.stat(file)
+        fingerprint.append({"path": str(Path(file).resolve()), "mtime_ns": stat.st_mtime_ns,
+                            "size": stat.st_size})
+    return fingerprint
+
+
+def _write_entry(entry: Path, index_data: pd.DataFrame, future_data: pd.DataFrame,
+                 fingerprint: List[Dict[str, object]]) -> None:
+    """Write the aligned frames column by column as ``.npy`` files. The
+    entry is built in a temporary directory and moved into place so a
+    crashed run never leaves a half written entry behind.
+    """
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix=".tmp-"))
+    try:
+        times = pd.DatetimeIndex(index_data.index)
+        np.save(tmp / "timestamps.npy", to_int64_ns(times))
+        meta = {
+            "version": CACHE_VERSION,
+            "sources": fingerprint,
+            "tz": str(times.tz) if times.tz is not None else None,
+            "index_name": index_data.index.name,
+            "columns": {},
+        }
+        for prefix, frame in (("index", index_data), ("future", future_data)):
+            meta["columns"][prefix] = list(frame.columns)
+            for i, column in enumerate(frame.columns):
+                np.save(tmp / f"{prefix}_{i}.npy", np.ascontiguousarray(frame[column].to_numpy()))
+        with open(tmp / "meta.json", "w") as f:
+            json.dump(meta, f)
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(tmp, entry)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def _read_meta(entry: Path) -> Optional[dict]:
+    try:
+        with open(entry / "meta.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_entry(entry: Path, meta: dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Memory-map the cached columns and wrap them in DataFrames without
+    copying them, so the columns are only read from disk as they are used.
+    """
+    timestamps = np.load(entry / "timestamps.npy", mmap_mode="r")
+    times = pd.DatetimeIndex(np.asarray(timestamps).view("datetime64[ns]"), name=meta["index_name"])
+    if meta["tz"] is not None:
+        times = times.tz_localize("UTC").tz_convert(meta["tz"])
+    frames = []
+    for prefix in ("index", "future"):
+        # Plain ndarray views of the maps, which pandas handles like any column
+        columns = {column: np.asarray(np.load(entry / f"{prefix}_{i}.npy", mmap_mode="r"))
+                   for i, column in enumerate(meta["columns"][prefix])}
+        frames.append(pd.DataFrame(columns, index=times, copy=False))
+    return frames[0], frames[1]
+
+
+def load_aligned_frames_cached(index_file: PathLike, future_file: PathLike, cache_dir: PathLike,
+                               refresh: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Same as ``load_aligned_frames`` but reuses the aligned result from
+    ``cache_dir`` while both source files keep their path, mtime and size.
+
+    :param refresh: ignore an existing entry and rebuild it from the CSVs
+    """
+    entry = _entry_dir(cache_dir, index_file, future_file)
+    fingerprint = source_fingerprint(index_file, future_file)
+    meta = None if refresh else _read_meta(entry)
+    if meta is not None and meta.get("version") == CACHE_VERSION and meta.get("sources") == fingerprint:
+        return _read_entry(entry, meta)
+
+    index_data, future_data = load_aligned_frames(index_file, future_file)
+    _write_entry(entry, index_data, future_data, fingerprint)
+    return index_data, future_data
+
+
+def clear_cache(cache_dir: PathLike, index_file: Optional[PathLike] = None,
+                future_file: Optional[PathLike] = None) -> None:
+    """Invalidate the cache entry for a pair of files, or the whole cache
+    when no files are given.
+    """
+    if index_file is not None and future_file is not None:
+        shutil.rmtree(_entry_dir(cache_dir, index_file, future_file), ignore_errors=True)
+    else:
+        shutil.rmtree(cache_dir, ignore_errors=True)
@@ -0,0 +1,206 @@
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from .ledger import LONG, TradeLedger, _to_ns
+from .trade import Trade
+
+_STATE_COLUMNS = (("_change_bar", np.int64), ("_change_cash", np.float64), ("_change_margin", np.float64),
+                  ("_change_position", np.float64), ("_change_cost", np.float64))
+_SAMPLE_COLUMNS = (("_time", np.int64), ("_cash", np.float64), ("_position", np.float64), ("_equity", np.float64))
+
+
+class EquityRecorder:
+    """Cash, net position and equity per bar, stored in preallocated NumPy
+    arrays.
+
+    Between trades the portfolio only changes through the price, so the
+    loop does not write anything per bar: ``on_change`` logs the portfolio
+    state (cash, short margin held, net position and its signed cost)
+    whenever a position is opened or closed, and ``extend`` fills in a
+    whole block of bars at once from their Close prices. Equity is the net
+    liquidation value ``cash + margin + position * price - cost``.
+
+    :param initial_cash: cash before the first bar
+    :param every: record one bar out of ``every`` (bars 0, every,
+        2 * every, ...) to reduce memory on long runs
+    :param capacity: number of samples to preallocate room for, see
+        ``reserve``
+    """
+    def __init__(self, initial_cash: float, every: int = 1, capacity: int = 1024) -> None:
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self._every = every
+        self._n = 0
+        self._changes = 0
+        self._capacity = 0
+        self._change_capacity = 0
+        self._allocate(max(int(capacity), 1))
+        self._allocate_changes(64)
+        # State before the first bar
+        self.on_change(-1, initial_cash, 0.0, 0.0, 0.0)
+
+    @staticmethod
+    def _grow(owner, columns, used: int, capacity: int) -> None:
+        for name, dtype in columns:
+            new = np.empty(capacity, dtype=dtype)
+            if used:
+                new[:used] = getattr(owner, name)[:used]
+            setattr(owner, name, new)
+
+    def _allocate(self, capacity: int) -> None:
+        self._grow(self, _SAMPLE_COLUMNS, self._n, capacity)
+        self._capacity = capacity
+
+    def _allocate_changes(self, capacity: int) -> None:
+        self._grow(self, _STATE_COLUMNS, self._changes, capacity)
+        self._change_capacity = capacity
+
+    @property
+    def every(self) -> int:
+        return self._every
+
+    def reserve(self, n_bars: int) -> None:
+        """Make room for a run over ``n_bars`` more bars."""
+        needed = self._n + -(-n_bars // self._every)
+        if needed > self._capacity:
+            self._allocate(needed)
+
+    def on_change(self, bar: int, cash: float, margin: float, position: float, cost: float) -> None:
+        """Log the portfolio state after a trade on bar number ``bar``."""
+        i = self._changes
+        if i == self._change_capacity:
+            self._allocate_changes(2 * self._change_capacity)
+        self._change_bar[i] = bar
+        self._change_cash[i] = cash
+        self._change_margin[i] = margin
+        self._change_position[i] = position
+        self._change_cost[i] = cost
+        self._changes = i + 1
+
+    def extend(self, first_bar: int, timestamps: np.ndarray, prices: np.ndarray) -> None:
+        """Record the bars ``first_bar, first_bar + 1, ...`` with the given
+        int64 ns timestamps and Close prices, once they have been processed.
+        """
+        bars = np.arange(first_bar, first_bar + len(timestamps), dtype=np.int64)
+        sampled = bars % self._every == 0
+        bars = bars[sampled]
+        m = len(bars)
+        if m == 0:
+            return
+        if self._n + m > self._capacity:
+            self._allocate(max(2 * self._capacity, self._n + m))
+        prices = np.asarray(prices, dtype=np.float64)[sampled]
+
+        # Portfolio state at the end of every sampled bar = last change on
+        # or before it
+        state = np.searchsorted(self._change_bar[:self._changes], bars, side="right") - 1
+        cash = self._change_cash[state]
+        position = self._change_position[state]
+        out = slice(self._n, self._n + m)
+        self._time[out] = timestamps[sampled]
+        self._cash[out] = cash
+        self._position[out] = position
+        self._equity[out] = cash + self._change_margin[state] + position * prices - self._change_cost[state]
+        self._n += m
+
+    def restart_bars(self) -> None:
+        """Number the following bars from 0 again, for a resumed backtest
+        that continues on new data. The samples and the latest portfolio
+        state are kept.
+        """
+        last = self._changes - 1
+        for name, _ in _STATE_COLUMNS:
+            column = getattr(self, name)
+            column[0] = column[last]
+        self._change_bar[0] = -1
+        self._changes = 1
+
+    def __getstate__(self) -> dict:
+        # Pickle only the used part of the preallocated arrays
+        state = self.__dict__.copy()
+        for name, _ in _SAMPLE_COLUMNS:
+            state[name] = getattr(self, name)[:self._n].copy()
+        for name, _ in _STATE_COLUMNS:
+            state[name] = getattr(self, name)[:self._changes].copy()
+        state["_capacity"] = self._n
+        state["_change_capacity"] = self._changes
+        return state
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._time[:self._n]
+
+    @property
+    def cash(self) -> np.ndarray:
+        return self._cash[:self._n]
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._position[:self._n]
+
+    @property
+    def equity(self) -> np.ndarray:
+        return self._equity[:self._n]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name, _ in _SAMPLE_COLUMNS + _STATE_COLUMNS)
+
+    def to_frame(self, tz: Optional[str] = None) -> pd.DataFrame:
+        """The recorded samples as a DataFrame indexed by ``Datetime``."""
+        times = pd.DatetimeIndex(self.timestamps.view("datetime64[ns]"), name="Datetime")
+        if tz is not None:
+            times = times.tz_localize("UTC").tz_convert(tz)
+        return pd.DataFrame({
+            "cash": self.cash.copy(),
+            "position": self.position.copy(),
+            "equity": self.equity.copy(),
+        }, index=times)
+
+
+def equity_from_trades(timestamps: np.ndarray, prices: np.ndarray, ledger: TradeLedger,
+                       initial_cash: float, open_trades: Iterable[Trade] = ()) -> np.ndarray:
+    """Net liquidation value per bar rebuilt from the trades of a run
+    without a per-bar loop (e.g. the "vectorized" engine), the same values
+    EquityRecorder records.
+
+    Every trade is assumed to pay half of its commissions when it opens and
+    half when it closes, like Portfolio with its fixed commission.
+
+    :param timestamps: int64 ns times of the bars the trades happened on
+    :param prices: Close prices the positions are marked at
+    :param open_trades: positions still open at the end of the data
+    """
+    n = len(timestamps)
+    prices = np.asarray(prices, dtype=np.float64)
+    open_trades = list(open_trades)
+    sign = np.where(ledger.direction == LONG, 1.0, -1.0)
+    open_bar = np.searchsorted(timestamps, ledger.open_time)
+    close_bar = np.searchsorted(timestamps, ledger.close_time)
+    signed_size = sign * ledger.size
+    open_commission = ledger.commissions / 2.0
+    for trade in open_trades:
+        open_bar = np.append(open_bar, np.searchsorted(timestamps, _to_ns(trade.open_time)))
+        close_bar = np.append(close_bar, n)
+        direction = 1.0 if trade.direction == "long" else -1.0
+        signed_size = np.append(signed_size, direction * trade.size)
+        open_commission = np.append(open_commission, trade.commissions)
+    open_price = np.concatenate((ledger.open_price, [t.open_price for t in open_trades]))
+
+    # Cash changes (net of the margin, which is part of the value) and the
+    # open position, as difference arrays over the bars
+    cash = np.zeros(n + 1)
+    np.add.at(cash, open_bar, -open_commission)
+    np.add.at(cash, close_bar[:len(ledger)], ledger.realized_pnl - ledger.commissions / 2.0)
+    position = np.zeros(n + 1)
+    np.add.at(position, open_bar, signed_size)
+    np.add.at(position, close_bar, -signed_size)
+    cost = np.zeros(n + 1)
+    np.add.at(cost, open_bar, signed_size * open_price)
+    np.add.at(cost, close_bar, -signed_size * open_price)
+
+    position = np.cumsum(position[:n])
+    return initial_cash + np.cumsum(cash[:n]) + position * prices - np.cumsum(cost[:n])
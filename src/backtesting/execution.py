@@ -0,0 +1,241 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Sequence, Set, Tuple
+import numpy as np
+from .ledger import LONG, TradeLedger
+from .market_data import AlignedData
+from .portfolio import SHORT_MARGIN, Portfolio
+from .trade import Trade
+
+
+class FillModel(ABC):
+    """Execution cost per unit of one fill, on top of the index Close the
+    engines fill at. Buys pay it (the fill price is raised by it) and
+    sells give it up (the fill price is lowered by it).
+
+    ``costs`` is evaluated for all fills of a backtest at once.
+    """
+    # (instrument, column) pairs of the market data the model reads
+    columns: Tuple[Tuple[str, str], ...] = ()
+
+    @abstractmethod
+    def costs(self, data: AlignedData, bars: np.ndarray) -> np.ndarray:
+        """:param bars: bar position of every fill
+        :return: float64 cost per unit of every fill, zero or more
+        """
+        pass
+
+
+class FixedSlippage(FillModel):
+    """The same number of price points on every fill.
+
+    :param points: slippage per unit, in price points
+    """
+    def __init__(self, points: float) -> None:
+        if points < 0:
+            raise ValueError("points must not be negative")
+        self.points = float(points)
+
+    def costs(self, data: AlignedData, bars: np.ndarray) -> np.ndarray:
+        return np.full(len(bars), self.points)
+
+
+class PercentageSlippage(FillModel):
+    """A fraction of the fill price, e.g. 0.0001 for one basis point.
+
+    :param fraction: slippage as a fraction of the price
+    """
+    columns = (("index", "Close"),)
+
+    def __init__(self, fraction: float) -> None:
+        if fraction < 0:
+            raise ValueError("fraction must not be negative")
+        self.fraction = float(fraction)
+
+    def costs(self, data: AlignedData, bars: np.ndarray) -> np.ndarray:
+        return data.index["Close"][bars] * self.fraction
+
+
+class HighLowSpread(FillModel):
+    """Half of a bid-ask spread estimated from the range of the fill bar:
+    the spread is taken to be ``fraction`` times High minus Low, and a
+    market order crosses half of it.
+
+    :param fraction: part of the bar range that is spread
+    :param instrument: "index" or "future", whose bars give the range
+    """
+    def __init__(self, fraction: float = 1.0, instrument: str = "index") -> None:
+        if fraction < 0:
+            raise ValueError("fraction must not be negative")
+        self.fraction = float(fraction)
+        self.instrument = instrument
+        self.columns = ((instrument, "High"), (instrument, "Low"))
+
+    def costs(self, data: AlignedData, bars: np.ndarray) -> np.ndarray:
+        bars_data = getattr(data, self.instrument)
+        return 0.5 * self.fraction * (bars_data["High"][bars] - bars_data["Low"][bars])
+
+
+@dataclass(frozen=True)
+class Fills:
+    """Fills of the trades of a backtest, one entry per trade, as arrays.
+
+    ``close_bar`` is -1 (and ``close_price`` NaN) for a position still
+    open at the end of the data. ``commissions`` holds the commission of
+    every fill made, ``costs`` the money lost to the fill models on them.
+    """
+    direction: np.ndarray
+    open_bar: np.ndarray
+    close_bar: np.ndarray
+    open_price: np.ndarray
+    close_price: np.ndarray
+    size: np.ndarray
+    commissions: np.ndarray
+    costs: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.direction)
+
+    @property
+    def closed(self) -> np.ndarray:
+        return self.close_bar >= 0
+
+    @property
+    def realized_pnl(self) -> np.ndarray:
+        """PnL of every trade before commissions, NaN while open."""
+        return self.direction * (self.close_price - self.open_price) * self.size
+
+    def to_ledger(self, data: AlignedData) -> TradeLedger:
+        """The closed trades, as the engines record them."""
+        closed = self.closed
+        close_bar = self.close_bar[closed]
+        open_bar = self.open_bar[closed]
+        return TradeLedger.from_arrays(
+            direction=self.direction[closed].astype(np.int8),
+            open_time=data.timestamps[open_bar],
+            open_price=self.open_price[closed],
+            close_time=data.timestamps[close_bar],
+            close_price=self.close_price[closed],
+            size=self.size[closed],
+            realized_pnl=self.realized_pnl[closed],
+            commissions=self.commissions[closed],
+            tz=data.tz,
+        )
+
+    def to_portfolio(self, data: AlignedData, initial_cash: float = 100000.0,
+                     short_margin: float = SHORT_MARGIN) -> Portfolio:
+        """Portfolio after all fills: completed trades, cash, and the
+        position (with its short margin) left open at the end, if any.
+        """
+        closed = self.closed
+        portfolio = Portfolio(initial_cash=initial_cash, short_margin=short_margin)
+        portfolio.completed_trades = self.to_ledger(data)
+        # Commissions of every fill, including the opening fill of an open position
+        portfolio.cash = float(initial_cash + self.realized_pnl[closed].sum() - self.commissions.sum())
+        open_positions = np.flatnonzero(~closed)
+        if len(open_positions):
+            # Only one trade is open at a time, so at most the last one is still open
+            i = int(open_positions[-1])
+            trade = Trade(direction="long" if self.direction[i] == LONG else "short",
+                          open_time=data.times()[int(self.open_bar[i])],
+                          open_price=float(self.open_price[i]), size=float(self.size[i]))
+            trade.commissions = float(self.commissions[i])
+            portfolio.open_trade = trade
+            if trade.direction == "short":
+                portfolio.margin = short_margin * trade.open_price * trade.size
+                portfolio.cash -= portfolio.margin
+        return portfolio
+
+
+class ExecutionModel:
+    """How the orders of a backtest are filled, evaluated for all trades of
+    a run with array operations (see ``execute``).
+
+    With the defaults every order fills in full at the index Close of the
+    bar it is placed on, for a commission of 2.0, like the engines do.
+
+    :param fills: fill models whose costs are added up per fill
+    :param delay: bars between placing an order and its fill; the whole
+        trade shifts, a position opened on a later bar is also closed on
+        a later bar. Orders that would fill after the last bar never fill.
+    :param volume_cap: fill at most this fraction of the bar volume of
+        ``volume_instrument``. An opening order fills partly (and the
+        position is closed in full); one that gets no volume is dropped.
+    :param size: size of an order
+    :param commission: commission per fill
+    :param short_margin: fraction of a short position's notional held
+        back from cash while it is open
+    """
+    def __init__(self, fills: Sequence[FillModel] = (), delay: int = 0, volume_cap: Optional[float] = None,
+                 volume_instrument: str = "future", size: float = 1.0, commission: float = 2.0,
+                 short_margin: float = SHORT_MARGIN) -> None:
+        if delay < 0:
+            raise ValueError("delay must not be negative")
+        if volume_cap is not None and volume_cap <= 0:
+            raise ValueError("volume_cap must be positive")
+        self.fills: Tuple[FillModel, ...] = tuple(fills)
+        self.delay = int(delay)
+        self.volume_cap = volume_cap
+        self.volume_instrument = volume_instrument
+        self.size = float(size)
+        self.commission = float(commission)
+        self.short_margin = float(short_margin)
+
+    @property
+    def columns(self) -> Set[Tuple[str, str]]:
+        """(instrument, column) pairs of the market data the model reads."""
+        columns = {("index", "Close")}
+        for model in self.fills:
+            columns.update(model.columns)
+        if self.volume_cap is not None:
+            columns.add((self.volume_instrument, "Volume"))
+        return columns
+
+    def costs(self, data: AlignedData, bars: np.ndarray) -> np.ndarray:
+        """Cost per unit of fills on ``bars``, summed over the fill models."""
+        total = np.zeros(len(bars))
+        for model in self.fills:
+            total += model.costs(data, bars)
+        return total
+
+    def execute(self, data: AlignedData, open_idx: np.ndarray, close_idx: np.ndarray,
+                direction: np.ndarray) -> Fills:
+        """Fill trades whose orders were placed on bars ``open_idx`` and
+        ``close_idx`` (-1 for a position never closed), e.g. the output of
+        ``simulate_fixed_holding``.
+
+        :param direction: LONG (1) or SHORT (-1) per trade
+        """
+        n = len(data)
+        open_bar = np.asarray(open_idx, dtype=np.int64) + self.delay
+        close_idx = np.asarray(close_idx, dtype=np.int64)
+        close_bar = np.where(close_idx >= 0, close_idx + self.delay, -1)
+        close_bar[close_bar >= n] = -1
+        direction = np.asarray(direction, dtype=np.int64)
+
+        filled = open_bar < n
+        size = np.full(len(open_bar), self.size)
+        if self.volume_cap is not None:
+            volume = getattr(data, self.volume_instrument)["Volume"]
+            size[filled] = np.minimum(size[filled], self.volume_cap * volume[open_bar[filled]])
+            filled &= size > 0
+        open_bar, close_bar, direction, size = open_bar[filled], close_bar[filled], direction[filled], size[filled]
+
+        prices = data.index["Close"]
+        closed = close_bar >= 0
+        close_at = np.where(closed, close_bar, 0)
+        open_cost = self.costs(data, open_bar)
+        close_cost = np.where(closed, self.costs(data, close_at), 0.0)
+        # Buys fill above the Close and sells below it
+        open_price = prices[open_bar] + direction * open_cost
+        close_price = np.where(closed, prices[close_at] - direction * close_cost, np.nan)
+        return Fills(
+            direction=direction,
+            open_bar=open_bar,
+            close_bar=close_bar,
+            open_price=open_price,
+            close_price=close_price,
+            size=size,
+            commissions=np.where(closed, 2.0, 1.0) * self.commission,
+            costs=(open_cost + close_cost) * size,
+        )
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import tempfile
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+import numpy as np
+from .vectorized import rolling_sum
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class IndicatorKey:
+    """Identifies one indicator series: which prices (instrument, column
+    and a fingerprint of their values) and which indicator.
+    """
+    instrument: str
+    column: str
+    indicator: str
+    window: int
+    fingerprint: str
+
+    def filename(self) -> str:
+        return hashlib.sha1(repr(self).encode()).hexdigest() + ".npy"
+
+
+class IndicatorCache:
+    """Memoized indicator series shared by strategies, backtests and
+    sweeps, so an indicator is computed once per dataset instead of once
+    per backtest.
+
+    Series are kept in memory up to ``max_bytes``, least recently used
+    first out, and optionally saved to ``directory`` as ``.npy`` files that
+    are memory-mapped when read back (also by other processes and runs).
+    The returned arrays are read-only. The prices are identified by a hash
+    of their values, computed once per array object: arrays passed in must
+    not be modified afterwards.
+
+    :param max_bytes: memory for cached series
+    :param directory: also store series on disk there
+    """
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, directory: Optional[PathLike] = None) -> None:
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._series: "OrderedDict[IndicatorKey, np.ndarray]" = OrderedDict()
+        self._directory = Path(directory) if directory is not None else None
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        # id(array) -> (weak reference to it, fingerprint)
+        self._fingerprints: Dict[int, Tuple[weakref.ref, str]] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict:
+        # Only the configuration is pickled (e.g. with a checkpointed
+        # strategy): the fingerprints hold weak references and the series
+        # are recomputed or read back from the directory
+        state = self.__dict__.copy()
+        state["_series"] = OrderedDict()
+        state["_bytes"] = 0
+        state["_fingerprints"] = {}
+        return state
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def fingerprint(self, prices: np.ndarray) -> str:
+        """Hash of the values of ``prices``, remembered per array object."""
+        key = id(prices)
+        entry = self._fingerprints.get(key)
+        if entry is not None and entry[0]() is prices:
+            return entry[1]
+        digest = hashlib.sha1(np.ascontiguousarray(prices, dtype=np.float64).tobytes()).hexdigest()
+
+        def forget(reference: weakref.ref) -> None:
+            # The array was freed and its id can be reused
+            if self._fingerprints.get(key, (None,))[0] is reference:
+                del self._fingerprints[key]
+
+        try:
+            reference = weakref.ref(prices, forget)
+        except TypeError:  # Not weak referenceable, e.g. a list
+            return digest
+        self._fingerprints[key] = (reference, digest)
+        return digest
+
+    def get(self, key: IndicatorKey, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """The series for ``key``, from memory, from disk or computed with
+        ``compute`` (and then cached).
+        """
+        series = self._series.get(key)
+        if series is not None:
+            self._series.move_to_end(key)
+            self.hits += 1
+            return series
+        path = self._directory / key.filename() if self._directory is not None else None
+        if path is not None and path.exists():
+            series = np.load(path, mmap_mode="r")
+            self.disk_hits += 1
+        else:
+            series = np.asarray(compute(), dtype=np.float64)
+            series.setflags(write=False)
+            self.misses += 1
+            if path is not None:
+                self._save(path, series)
+        self._remember(key, series)
+        return series
+
+    def _save(self, path: Path, series: np.ndarray) -> None:
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self._directory, prefix=".tmp-", suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, series)
+        os.replace(tmp, path)
+
+    def _remember(self, key: IndicatorKey, series: np.ndarray) -> None:
+        if series.nbytes > self._max_bytes:
+            return
+        self._series[key] = series
+        self._bytes += series.nbytes
+        while self._bytes > self._max_bytes:
+            _, evicted = self._series.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Drop the series held in memory (the files on disk are kept)."""
+        self._series.clear()
+        self._bytes = 0
+
+    def _key(self, prices: np.ndarray, indicator: str, window: int, instrument: str, column: str) -> IndicatorKey:
+        return IndicatorKey(instrument, column, indicator, int(window), self.fingerprint(prices))
+
+    def rolling_mean(self, prices: np.ndarray, window: int, instrument: str = "future",
+                     column: str = "Close") -> np.ndarray:
+        """Mean of the trailing ``window`` prices, NaN until the window is full."""
+        key = self._key(prices, "rolling_mean", window, instrument, column)
+        return self.get(key, lambda: rolling_sum(np.asarray(prices, dtype=np.float64), window) / float(window))
+
+    def momentum(self, prices: np.ndarray, window: int = 5, instrument: str = "future",
+                 column: str = "Close") -> np.ndarray:
+        """Same values as ``vectorized.momentum_series``, built on the
+        cached rolling mean.
+        """
+        def compute() -> np.ndarray:
+            current = self.rolling_mean(prices, window, instrument=instrument, column=column)
+            previous = np.full(current.shape, np.nan)
+            previous[window:] = current[:-window]
+            return (current - previous) / current
+        return self.get(self._key(prices, "momentum", window, instrument, column), compute)
@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class RollingMomentum:
+    """Momentum over two adjacent windows of ``window`` prices, updated in
+    O(1) per price regardless of the window length.
+
+    The last ``2 * window`` prices live in a fixed ring buffer and the sums
+    of the older and the newer half are kept up to date on every push:
+    the new price enters the current window, the price that drops out of
+    the current window moves to the previous one and the oldest price is
+    removed. The sums are recomputed from the buffer periodically so
+    rounding errors cannot build up over long runs.
+
+    :param window: number of prices in each of the two windows
+    :param resync_every: pushes between exact recomputations of the sums
+    """
+    def __init__(self, window: int = 5, resync_every: int = 100_000) -> None:
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self._window = window
+        self._size = 2 * window
+        self._buffer = np.zeros(self._size, dtype=np.float64)
+        self._start = 0  # position of the oldest price
+        self._middle = window  # position of the oldest price of the current window
+        self._count = 0
+        self._current_sum = 0.0
+        self._previous_sum = 0.0
+        self._resync_every = resync_every
+        self._since_resync = 0
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    @property
+    def ready(self) -> bool:
+        """True once both windows are full."""
+        return self._count == self._size
+
+    def push(self, price: float) -> None:
+        count = self._count
+        if count == self._size:
+            # Steady state: the new price overwrites the oldest one
+            buffer = self._buffer
+            start = self._start
+            middle = self._middle
+            moving = buffer.item(middle)
+            self._current_sum += price - moving
+            self._previous_sum += moving - buffer.item(start)
+            buffer[start] = price
+            start += 1
+            middle += 1
+            self._start = 0 if start == count else start
+            self._middle = 0 if middle == count else middle
+            self._since_resync += 1
+            if self._since_resync >= self._resync_every:
+                self._resync()
+        elif count < self._window:
+            self._current_sum += price
+            self._buffer[count] = price
+            self._count = count + 1
+        else:
+            moving = self._buffer.item(count - self._window)
+            self._current_sum += price - moving
+            self._previous_sum += moving
+            self._buffer[count] = price
+            self._count = count + 1
+
+    def extend(self, prices: np.ndarray) -> None:
+        """Push a block of prices. Only the last ``2 * window`` of them
+        can still affect the momentum, so a long block costs O(window).
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(prices) < self._size:
+            for price in prices.tolist():
+                self.push(price)
+            return
+        self._buffer[:] = prices[-self._size:]
+        self._start = 0
+        self._middle = self._window
+        self._count = self._size
+        self._resync()
+
+    def _resync(self) -> None:
+        ordered = np.roll(self._buffer, -self._start)
+        self._previous_sum = float(ordered[:self._window].sum())
+        self._current_sum = float(ordered[self._window:].sum())
+        self._since_resync = 0
+
+    def prices(self) -> np.ndarray:
+        """The buffered prices, oldest first."""
+        if self._count < self._size:
+            return self._buffer[:self._count].copy()
+        return np.roll(self._buffer, -self._start)
+
+    @property
+    def value(self) -> float:
+        """(X_n - X_n-1) / X_n with X_n the mean of the newest window and
+        X_n-1 the mean of the window before it. Only valid when ``ready``.
+        """
+        current = self._current_sum / self._window
+        previous = self._previous_sum / self._window
+        return (current - previous) / current
@@ -0,0 +1,180 @@
+import cProfile
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+import pandas as pd
+
+# Backtester method -> phase its (exclusive) time is booked on
+BACKTESTER_PHASES: Dict[str, str] = {
+    "load_data": "load",
+    "load_aligned": "load",
+    "next": "data",
+    "_on_bar": "bookkeeping",
+    "check_strategy": "strategy",
+    "act_on_signal": "strategy",
+    "_generate_signals": "strategy",
+    "open_position": "portfolio",
+    "close_position": "portfolio",
+    "_extend_equity": "equity",
+    "run_vectorized": "engine",
+    "run_kernel": "engine",
+    "print_end_of_day_summary": "reporting",
+    "print_performance": "performance",
+}
+REPORTER_HOOKS = ("on_open", "on_close", "on_day_end", "close")
+# Methods that start a run; their own exclusive time is the loop overhead
+RUN_METHODS = ("run", "run_stream", "run_ticks")
+
+
+def peak_rss_mb() -> float:
+    """High water mark of the resident set size of this process in MB.
+    VmHWM is used when available since ru_maxrss survives exec and would
+    include the parent of a freshly started subprocess.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@dataclass(frozen=True)
+class RunStats:
+    """Totals of one ``run``/``run_stream`` call."""
+    method: str
+    bars: int
+    seconds: float
+    bars_per_second: float
+    peak_rss_mb: float
+    peak_traced_mb: Optional[float]
+    profile_path: Optional[str]
+
+
+class Instrumentation:
+    """Opt-in timing of the phases of a backtest.
+
+    ``attach`` replaces the Backtester's methods (and its reporter's hooks)
+    on that one instance by timing wrappers, so a Backtester without
+    instrumentation runs exactly the same code as before and pays nothing.
+    Times are exclusive: the time spent in a nested instrumented call (e.g.
+    opening a position from ``act_on_signal``) is booked on the inner phase
+    only, so the phases add up to the run time.
+
+    :param trace_memory: also record the peak of Python allocations during
+        each run with tracemalloc (slows the run down noticeably)
+    :param profile_dir: write a cProfile dump (``run_<n>.prof``, readable
+        with ``pstats``) of every run to this directory
+    """
+    def __init__(self, trace_memory: bool = False, profile_dir: Optional[Union[str, Path]] = None) -> None:
+        self._trace_memory = trace_memory
+        self._profile_dir = Path(profile_dir) if profile_dir is not None else None
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.runs: List[RunStats] = []
+        # Time spent in instrumented calls below the current one
+        self._child = 0.0
+
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        """Wrap ``func`` so its exclusive wall time and calls count for ``phase``."""
+        seconds, calls, clock = self.seconds, self.calls, time.perf_counter
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            outer_child = self._child
+            self._child = 0.0
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                seconds[phase] += elapsed - self._child
+                calls[phase] += 1
+                self._child = outer_child + elapsed
+        return timed
+
+    def attach(self, backtester) -> None:
+        """Instrument the methods of one Backtester instance."""
+        for name, phase in BACKTESTER_PHASES.items():
+            setattr(backtester, name, self.wrap(phase, getattr(backtester, name)))
+        reporter = backtester._reporter
+        for name in REPORTER_HOOKS:
+            setattr(reporter, name, self.wrap("reporting", getattr(reporter, name)))
+        for name in RUN_METHODS:
+            loop = self.wrap("loop", getattr(backtester, name))
+            setattr(backtester, name, self._measure_run(backtester, name, loop))
+
+    def _measure_run(self, backtester, name: str, func: Callable) -> Callable:
+        @wraps(func)
+        def measured(*args, **kwargs):
+            first_index = backtester._current_index
+            profiler = cProfile.Profile() if self._profile_dir is not None else None
+            if self._trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            if profiler is not None:
+                profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                elapsed = time.perf_counter() - start
+                peak_traced = None
+                if self._trace_memory:
+                    peak_traced = tracemalloc.get_traced_memory()[1] / 1e6
+                    tracemalloc.stop()
+                profile_path = None
+                if profiler is not None:
+                    self._profile_dir.mkdir(parents=True, exist_ok=True)
+                    profile_path = str(self._profile_dir / f"run_{len(self.runs)}.prof")
+                    profiler.dump_stats(profile_path)
+                last_index = backtester._current_index
+                if backtester._times is not None:
+                    # next() steps one past the last bar to detect the end
+                    last_index = min(last_index, len(backtester._times) - 1)
+                bars = last_index - first_index
+                self.runs.append(RunStats(
+                    method=name,
+                    bars=bars,
+                    seconds=elapsed,
+                    bars_per_second=bars / elapsed if elapsed > 0 else 0.0,
+                    peak_rss_mb=peak_rss_mb(),
+                    peak_traced_mb=peak_traced,
+                    profile_path=profile_path,
+                ))
+        return measured
+
+    def phases(self) -> pd.DataFrame:
+        """Seconds, calls, microseconds per call and share of the total per
+        phase, slowest first.
+        """
+        frame = pd.DataFrame({"seconds": pd.Series(self.seconds, dtype=float),
+                              "calls": pd.Series(self.calls, dtype=int)})
+        frame.index.name = "phase"
+        frame["us_per_call"] = frame["seconds"] / frame["calls"] * 1e6
+        total = frame["seconds"].sum()
+        frame["share"] = frame["seconds"] / total if total > 0 else 0.0
+        return frame.sort_values("seconds", ascending=False)
+
+    def report(self) -> str:
+        """Human readable summary of all runs and phases."""
+        lines = []
+        for i, run in enumerate(self.runs):
+            line = (f"Run {i} ({run.method}): {run.bars:,} bars in {run.seconds:.3f}s "
+                    f"-> {run.bars_per_second:,.0f} bars/s, peak RSS {run.peak_rss_mb:.1f} MB")
+            if run.peak_traced_mb is not None:
+                line += f", peak traced {run.peak_traced_mb:.1f} MB"
+            if run.profile_path is not None:
+                line += f", profile {run.profile_path}"
+            lines.append(line)
+        lines.append(self.phases().to_string(float_format=lambda x: f"{x:.4f}"))
+        return "\n".join(lines)
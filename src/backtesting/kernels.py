@@ -0,0 +1,167 @@
+from datetime import timedelta
+from typing import Callable
+import numpy as np
+from .ledger import LONG, SHORT, TradeLedger
+from .market_data import AlignedData
+from .portfolio import SHORT_MARGIN, Portfolio
+from .trade import Trade
+from .vectorized import timedelta_ns
+
+try:
+    import numba
+except ImportError:  # Numba is optional, the kernels then run as plain Python
+    numba = None
+
+NUMBA_AVAILABLE: bool = numba is not None
+
+# Layout of the int64 state array shared between kernel calls
+_OPEN_DIRECTION, _OPEN_BAR, _CLOSE_DUE = 0, 1, 2
+
+
+def jit(func: Callable) -> Callable:
+    """Compile ``func`` with ``numba.njit`` when Numba is installed,
+    otherwise return it unchanged.
+    """
+    if numba is None:
+        return func
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+@jit
+def momentum_kernel(timestamps, index_close, future_close, threshold, window, holding_ns, commission,
+                    short_margin, size, start, cash, state, out_direction, out_open_bar, out_close_bar,
+                    out_realized_pnl):
+    """Momentum signal, "one open trade, close after the holding period"
+    state machine and Portfolio cash arithmetic in one loop over the bars.
+
+    Runs from bar ``start`` until the end of the data or until the output
+    buffers are full, so the caller can empty them and call again.
+    ``cash`` (1 float64) and ``state`` (open direction, open bar and close
+    time, int64) carry the portfolio between calls.
+
+    The momentum sums add the prices left to right like
+    ``vectorized.rolling_sum``, and cash changes in the same order as
+    ``Portfolio.open_position``/``close_position``, so the results are
+    identical to the last bit to the vectorized engine and the batch
+    signals of the other engines. The running sums of the per-tick
+    ``RollingMomentum`` (``batch_signals=False``) agree with them to
+    floating point tolerance only, so trades can differ when a momentum
+    falls within rounding of the threshold.
+
+    :return: (next bar to process, number of trades written)
+    """
+    n = len(timestamps)
+    capacity = len(out_direction)
+    written = 0
+    i = start
+    while i < n:
+        direction = state[_OPEN_DIRECTION]
+        # Close an expired position first, like Backtester._on_bar
+        if direction != 0 and timestamps[i] >= state[_CLOSE_DUE]:
+            if written == capacity:
+                return i, written
+            open_bar = state[_OPEN_BAR]
+            open_price = index_close[open_bar]
+            price = index_close[i]
+            cash[0] -= commission
+            if direction == LONG:
+                pnl = (price - open_price) * size
+            else:
+                pnl = (open_price - price) * size
+                cash[0] += short_margin * open_price * size
+            cash[0] += pnl
+            out_direction[written] = direction
+            out_open_bar[written] = open_bar
+            out_close_bar[written] = i
+            out_realized_pnl[written] = pnl
+            written += 1
+            state[_OPEN_DIRECTION] = 0
+            direction = 0
+
+        if direction == 0 and i >= 2 * window - 1:
+            current = 0.0
+            previous = 0.0
+            for k in range(i - window + 1, i + 1):
+                current += future_close[k]
+            for k in range(i - 2 * window + 1, i - window + 1):
+                previous += future_close[k]
+            current = current / window
+            previous = previous / window
+            momentum = (current - previous) / current
+            signal = 0
+            if momentum > threshold:
+                signal = LONG
+            elif momentum < -threshold:
+                signal = SHORT
+            if signal != 0:
+                price = index_close[i]
+                cash[0] -= commission
+                if signal == SHORT:
+                    cash[0] -= short_margin * price * size
+                state[_OPEN_DIRECTION] = signal
+                state[_OPEN_BAR] = i
+                state[_CLOSE_DUE] = timestamps[i] + holding_ns
+        i += 1
+    return i, written
+
+
+def run_kernel_momentum(data: AlignedData, threshold: float = 0.0005, window: int = 5,
+                        holding_period: timedelta = timedelta(minutes=10),
+                        initial_cash: float = 100000.0, commission: float = 2.0,
+                        batch_trades: int = 65536) -> Portfolio:
+    """Backtest the momentum strategy with ``momentum_kernel``.
+
+    With Numba installed the whole backtest is one compiled loop; without
+    it the same code runs as plain Python over lists, which gives the same
+    trades but is slower than the "array" and "vectorized" engines.
+
+    :param batch_trades: size of the trade buffers filled per kernel call
+    :return: Portfolio with the completed trades, cash and any position
+        left open at the end, like ``run_vectorized_momentum``
+    """
+    timestamps = data.timestamps
+    index_close = data.index["Close"]
+    future_close = data.future["Close"]
+    dtypes = (np.int8, np.int64, np.int64, np.float64)
+    out = tuple(np.empty(batch_trades, dtype=dtype) for dtype in dtypes)
+    if not NUMBA_AVAILABLE:
+        # Plain Python indexes lists much faster than arrays
+        timestamps, index_close, future_close = timestamps.tolist(), index_close.tolist(), future_close.tolist()
+        out = tuple([0] * batch_trades for _ in out)
+    cash = np.array([initial_cash]) if NUMBA_AVAILABLE else [initial_cash]
+    state = np.zeros(3, dtype=np.int64) if NUMBA_AVAILABLE else [0, 0, 0]
+
+    blocks = []
+    bar = 0
+    while True:
+        bar, written = momentum_kernel(timestamps, index_close, future_close, threshold, window,
+                                       timedelta_ns(holding_period), commission, SHORT_MARGIN, 1.0, bar,
+                                       cash, state, *out)
+        blocks.append(tuple(np.array(column[:written], dtype=dtype) for column, dtype in zip(out, dtypes)))
+        if bar >= len(data):
+            break
+
+    direction, open_bar, close_bar, realized_pnl = (np.concatenate(parts) for parts in zip(*blocks))
+    prices = data.index["Close"]
+    portfolio = Portfolio(initial_cash=initial_cash)
+    portfolio.cash = float(cash[0])
+    portfolio.completed_trades = TradeLedger.from_arrays(
+        direction=direction,
+        open_time=data.timestamps[open_bar],
+        open_price=prices[open_bar],
+        close_time=data.timestamps[close_bar],
+        close_price=prices[close_bar],
+        size=np.ones(len(direction)),
+        realized_pnl=realized_pnl,
+        commissions=np.full(len(direction), 2.0 * commission),
+        tz=data.tz,
+    )
+    if state[_OPEN_DIRECTION] != 0:
+        k = int(state[_OPEN_BAR])
+        trade = Trade(direction="long" if state[_OPEN_DIRECTION] == LONG else "short",
+                      open_time=data.times()[k], open_price=prices[k])
+        trade.commissions = commission
+        portfolio.open_trade = trade
+        if trade.direction == "short":
+            portfolio.margin = SHORT_MARGIN * trade.open_price * trade.size
+    return portfolio
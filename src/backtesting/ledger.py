@@ -0,0 +1,224 @@
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+import numpy as np
+import pandas as pd
+from .trade import Trade
+
+# Direction codes stored in the ledger
+LONG: int = 1
+SHORT: int = -1
+_DIRECTIONS = {"long": LONG, "short": SHORT}
+_DIRECTION_NAMES = {LONG: "long", SHORT: "short"}
+# int64 value pandas uses for NaT, marks a missing time
+_NAT: int = np.iinfo(np.int64).min
+
+
+def _to_ns(time: Optional[datetime]) -> int:
+    if time is None:
+        return _NAT
+    return pd.Timestamp(time).as_unit("ns").value
+
+
+class TradeView:
+    """Read-only view of one trade in a TradeLedger, with the same
+    attributes as a closed Trade.
+    """
+    __slots__ = ("_ledger", "_i")
+
+    def __init__(self, ledger: "TradeLedger", i: int) -> None:
+        self._ledger = ledger
+        self._i = i
+
+    @property
+    def direction(self) -> str:
+        return _DIRECTION_NAMES[int(self._ledger._direction[self._i])]
+
+    @property
+    def open_time(self) -> Optional[pd.Timestamp]:
+        return self._ledger._timestamp(self._ledger._open_time[self._i])
+
+    @property
+    def close_time(self) -> Optional[pd.Timestamp]:
+        return self._ledger._timestamp(self._ledger._close_time[self._i])
+
+    @property
+    def open_price(self) -> float:
+        return float(self._ledger._open_price[self._i])
+
+    @property
+    def close_price(self) -> float:
+        return float(self._ledger._close_price[self._i])
+
+    @property
+    def size(self) -> float:
+        return float(self._ledger._size[self._i])
+
+    @property
+    def realized_pnl(self) -> float:
+        return float(self._ledger._realized_pnl[self._i])
+
+    @property
+    def commissions(self) -> float:
+        return float(self._ledger._commissions[self._i])
+
+    def __repr__(self) -> str:
+        return (f"TradeView({self.direction}, open={self.open_time} @ {self.open_price:.2f}, "
+                f"close={self.close_time} @ {self.close_price:.2f}, pnl={self.realized_pnl:.2f})")
+
+
+class TradeLedger:
+    """Completed trades stored column-wise in preallocated NumPy arrays.
+
+    Appending is amortized O(1): the arrays double in size when full.
+    Indexing and iteration return TradeView objects, so code written for
+    a list of Trade objects keeps working, while analytics can use the
+    column properties (e.g. ``ledger.realized_pnl``) without a Python loop.
+
+    :param capacity: number of trades to preallocate room for
+    """
+    def __init__(self, capacity: int = 1024) -> None:
+        self._n = 0
+        self._tz = None
+        self._allocate(max(int(capacity), 1))
+
+    def _allocate(self, capacity: int) -> None:
+        old = self._n
+        columns = (
+            ("_direction", np.int8), ("_open_time", np.int64), ("_close_time", np.int64),
+            ("_open_price", np.float64), ("_close_price", np.float64), ("_size", np.float64),
+            ("_realized_pnl", np.float64), ("_commissions", np.float64),
+        )
+        for name, dtype in columns:
+            new = np.empty(capacity, dtype=dtype)
+            if old:
+                new[:old] = getattr(self, name)[:old]
+            setattr(self, name, new)
+        self._capacity = capacity
+
+    def append_fields(self, direction: int, open_time: int, open_price: float, close_time: int,
+                      close_price: float, size: float, realized_pnl: float, commissions: float) -> None:
+        """Append a trade given as raw column values (times as int64 ns)."""
+        if self._n == self._capacity:
+            self._allocate(2 * self._capacity)
+        i = self._n
+        self._direction[i] = direction
+        self._open_time[i] = open_time
+        self._close_time[i] = close_time
+        self._open_price[i] = open_price
+        self._close_price[i] = close_price
+        self._size[i] = size
+        self._realized_pnl[i] = realized_pnl
+        self._commissions[i] = commissions
+        self._n = i + 1
+
+    def append(self, trade: Trade) -> None:
+        """Append a closed Trade."""
+        if self._tz is None and isinstance(trade.open_time, datetime):
+            self._tz = trade.open_time.tzinfo
+        self.append_fields(
+            _DIRECTIONS[trade.direction], _to_ns(trade.open_time), trade.open_price,
+            _to_ns(trade.close_time), trade.close_price, trade.size, trade.realized_pnl, trade.commissions,
+        )
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Trade]) -> "TradeLedger":
+        trades = list(trades)
+        ledger = cls(capacity=len(trades))
+        for trade in trades:
+            ledger.append(trade)
+        return ledger
+
+    @classmethod
+    def from_arrays(cls, direction: np.ndarray, open_time: np.ndarray, open_price: np.ndarray,
+                    close_time: np.ndarray, close_price: np.ndarray, size: np.ndarray,
+                    realized_pnl: np.ndarray, commissions: np.ndarray, tz=None) -> "TradeLedger":
+        """Build a ledger from whole columns (times as int64 ns), e.g. the
+        output of an array based engine.
+        """
+        n = len(direction)
+        ledger = cls(capacity=n)
+        for name, values in (("_direction", direction), ("_open_time", open_time), ("_close_time", close_time),
+                             ("_open_price", open_price), ("_close_price", close_price), ("_size", size),
+                             ("_realized_pnl", realized_pnl), ("_commissions", commissions)):
+            getattr(ledger, name)[:n] = values
+        ledger._n = n
+        ledger._tz = tz
+        return ledger
+
+    def _timestamp(self, value: np.int64) -> Optional[pd.Timestamp]:
+        if value == _NAT:
+            return None
+        if self._tz is None:
+            return pd.Timestamp(int(value))
+        return pd.Timestamp(int(value), tz="UTC").tz_convert(self._tz)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> TradeView:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("trade index out of range")
+        return TradeView(self, i)
+
+    def __iter__(self) -> Iterator[TradeView]:
+        for i in range(self._n):
+            yield TradeView(self, i)
+
+    # Column views of the filled part of the ledger
+    @property
+    def direction(self) -> np.ndarray:
+        return self._direction[:self._n]
+
+    @property
+    def open_time(self) -> np.ndarray:
+        return self._open_time[:self._n]
+
+    @property
+    def close_time(self) -> np.ndarray:
+        return self._close_time[:self._n]
+
+    @property
+    def open_price(self) -> np.ndarray:
+        return self._open_price[:self._n]
+
+    @property
+    def close_price(self) -> np.ndarray:
+        return self._close_price[:self._n]
+
+    @property
+    def size(self) -> np.ndarray:
+        return self._size[:self._n]
+
+    @property
+    def realized_pnl(self) -> np.ndarray:
+        return self._realized_pnl[:self._n]
+
+    @property
+    def commissions(self) -> np.ndarray:
+        return self._commissions[:self._n]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for the column arrays (including spare capacity)."""
+        return sum(getattr(self, name).nbytes for name in (
+            "_direction", "_open_time", "_close_time", "_open_price", "_close_price", "_size",
+            "_realized_pnl", "_commissions"))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the trades as a DataFrame, one row per trade."""
+        frame = pd.DataFrame({
+            "direction": np.where(self.direction == LONG, "long", "short"),
+            "open_time": pd.to_datetime(self.open_time, unit="ns", utc=self._tz is not None),
+            "open_price": self.open_price,
+            "close_time": pd.to_datetime(self.close_time, unit="ns", utc=self._tz is not None),
+            "close_price": self.close_price,
+            "size": self.size,
+            "realized_pnl": self.realized_pnl,
+            "commissions": self.commissions,
+        })
+        if self._tz is not None:
+            for column in ("open_time", "close_time"):
+                frame[column] = frame[column].dt.tz_convert(self._tz)
+        return frame
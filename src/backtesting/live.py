@@ -0,0 +1,207 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from .backtester import Backtester
+from .market_data import AlignedData
+
+# Queued by BarFeed.close after the last bar
+_END = None
+
+
+@dataclass(frozen=True)
+class LiveBar:
+    """One bar of a live feed and the time it arrived (``perf_counter_ns``)."""
+    time: pd.Timestamp
+    index_price: float
+    future_price: float
+    arrival_ns: int
+
+
+class BarFeed:
+    """Bounded in-process queue of bars between a producer (a market data
+    connection, or ``replay`` for testing and paper trading) and a
+    ``LiveTrader``.
+
+    ``put`` waits while the queue is full, so a producer that is faster
+    than the strategy is slowed down instead of queueing without limit
+    (backpressure). Bars are stamped when they are handed to ``put``, so
+    the latencies include any time spent waiting for room in the queue.
+
+    :param maxsize: bars queued at most
+    """
+    def __init__(self, maxsize: int = 10_000) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._ended = False
+        # Deepest the queue has been, to size maxsize and spot a lagging consumer
+        self.max_depth = 0
+
+    def _bar(self, time_: pd.Timestamp, index_price: float, future_price: float) -> LiveBar:
+        return LiveBar(time_, float(index_price), float(future_price), time.perf_counter_ns())
+
+    async def put(self, time_: pd.Timestamp, index_price: float, future_price: float) -> None:
+        """Queue a bar, waiting while the queue is full."""
+        await self._queue.put(self._bar(time_, index_price, future_price))
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def put_nowait(self, time_: pd.Timestamp, index_price: float, future_price: float) -> None:
+        """Queue a bar from synchronous code, e.g. a callback of a market
+        data client running in the event loop.
+
+        :raises asyncio.QueueFull: when the queue is full
+        """
+        self._queue.put_nowait(self._bar(time_, index_price, future_price))
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    async def close(self) -> None:
+        """Signal that no more bars will come."""
+        await self._queue.put(_END)
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    async def get_batch(self, max_bars: int) -> List[LiveBar]:
+        """Wait for the next bar, then also take the bars that have already
+        arrived behind it (at most ``max_bars`` in total), so a burst is
+        worked off without a trip through the event loop per bar.
+
+        :return: bars in arrival order, an empty list once the feed is closed
+        """
+        if self._ended:
+            return []
+        bar = await self._queue.get()
+        bars = []
+        while bar is not _END:
+            bars.append(bar)
+            if len(bars) == max_bars or self._queue.empty():
+                return bars
+            bar = self._queue.get_nowait()
+        self._ended = True
+        return bars
+
+
+async def replay(feed: BarFeed, data: AlignedData, interval: float = 0.0, burst: int = 1,
+                 close: bool = True) -> None:
+    """Push the bars of ``data`` into ``feed`` like a live source: ``burst``
+    bars back to back, then a pause of ``interval`` seconds, and so on.
+
+    :param close: close the feed after the last bar
+    """
+    if burst < 1:
+        raise ValueError("burst must be at least 1")
+    times = data.times()
+    index_prices = data.index["Close"].tolist()
+    future_prices = data.future["Close"].tolist()
+    for start in range(0, len(times), burst):
+        for i in range(start, min(start + burst, len(times))):
+            await feed.put(times[i], index_prices[i], future_prices[i])
+        # Also hands control to the consumer when interval is 0
+        await asyncio.sleep(interval)
+    if close:
+        await feed.close()
+
+
+class LatencyRecorder:
+    """Per-bar latencies of a live run: the time a bar waited in the feed
+    (``queue``) and the time from its arrival until the strategy's signal
+    was acted on (``latency``).
+    """
+    PERCENTILES: Sequence[float] = (50.0, 90.0, 99.0, 99.9)
+
+    def __init__(self) -> None:
+        self._times: List[int] = []
+        self._queue_ns: List[int] = []
+        self._latency_ns: List[int] = []
+
+    def record(self, time_ns: int, queue_ns: int, latency_ns: int) -> None:
+        self._times.append(time_ns)
+        self._queue_ns.append(queue_ns)
+        self._latency_ns.append(latency_ns)
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def to_frame(self, tz: Optional[str] = None) -> pd.DataFrame:
+        """Queue time and latency in microseconds per bar, indexed by the
+        bar's ``Datetime``.
+        """
+        times = pd.DatetimeIndex(np.array(self._times, dtype=np.int64).view("datetime64[ns]"), name="Datetime")
+        if tz is not None:
+            times = times.tz_localize("UTC").tz_convert(tz)
+        return pd.DataFrame({
+            "queue_us": np.array(self._queue_ns, dtype=np.int64) / 1e3,
+            "latency_us": np.array(self._latency_ns, dtype=np.int64) / 1e3,
+        }, index=times)
+
+    def percentiles(self, q: Sequence[float] = PERCENTILES) -> Dict[str, Dict[float, float]]:
+        """Percentiles of the queue time and latency in microseconds.
+
+        :return: {"queue_us": {percentile: value}, "latency_us": {...}}
+        """
+        result = {}
+        for name, values in (("queue_us", self._queue_ns), ("latency_us", self._latency_ns)):
+            if not values:
+                result[name] = {p: float("nan") for p in q}
+                continue
+            points = np.percentile(np.array(values, dtype=np.int64), q) / 1e3
+            result[name] = dict(zip(q, points.tolist()))
+        return result
+
+    def report(self) -> str:
+        lines = [f"Latency over {len(self):,} bars (microseconds):"]
+        for name, points in self.percentiles().items():
+            lines.append(f"  {name:>10}: " + ", ".join(f"p{p:g} {v:,.1f}" for p, v in points.items()))
+        return "\n".join(lines)
+
+
+class LiveTrader:
+    """Drives a Backtester's strategy and portfolio from a BarFeed, for
+    paper trading or live signals on bars as they arrive.
+
+    Every bar goes through the same per-bar logic as the "array" engine
+    (``Backtester.process_bar``): expiries, daily summaries, the
+    strategy's ``update_price``/``generate_signal`` and the orders. Bursts
+    are worked off from the queue without yielding per bar; between
+    batches control goes back to the event loop so producers keep running.
+    Pass the Backtester a ``BackgroundReporter`` so printing and file
+    writes do not add to the latency.
+
+    :param backtester: Backtester with the "event" or "array" engine; no
+        data has to be loaded
+    :param feed: source of the bars
+    :param max_batch: bars processed at most before yielding to the loop
+    """
+    def __init__(self, backtester: Backtester, feed: BarFeed, max_batch: int = 1024) -> None:
+        if backtester._engine in ("vectorized", "jit"):
+            raise ValueError(f"The {backtester._engine} engine cannot trade a live feed")
+        self._backtester = backtester
+        self._feed = feed
+        self._max_batch = max_batch
+        self.latency = LatencyRecorder()
+
+    async def run(self) -> None:
+        """Trade the bars until the feed is closed, then report the last day
+        and the performance like ``Backtester.run``.
+        """
+        backtester = self._backtester
+        clock = time.perf_counter_ns
+        record = self.latency.record
+        first_bar = backtester._current_index + 1
+        while True:
+            bars = await self._feed.get_batch(self._max_batch)
+            if not bars:
+                break
+            dequeued = clock()
+            for bar in bars:
+                backtester.process_bar(bar.time, bar.index_price, bar.future_price)
+                record(bar.time.value, dequeued - bar.arrival_ns, clock() - bar.arrival_ns)
+            backtester.record_equity(first_bar, np.array([bar.time.value for bar in bars], dtype=np.int64),
+                                     np.array([bar.index_price for bar in bars]))
+            first_bar += len(bars)
+            await asyncio.sleep(0)
+        # Flushing the reporter may wait for its output, keep the loop free
+        await asyncio.to_thread(backtester.finish)
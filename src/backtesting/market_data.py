@@ -0,0 +1,96 @@
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Price/volume columns extracted into arrays for the fast engines
+OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+NS_PER_MINUTE: int = 60 * 1_000_000_000
+NS_PER_DAY: int = 24 * 60 * NS_PER_MINUTE
+
+
+def to_int64_ns(times: pd.DatetimeIndex) -> np.ndarray:
+    """Convert a DatetimeIndex into int64 nanoseconds since the epoch,
+    independent of the resolution pandas picked when parsing.
+    """
+    return np.ascontiguousarray(times.as_unit("ns").asi8, dtype=np.int64)
+
+
+def load_aligned_frames(index_file: str, future_file: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Load the index and future data from CSV and align their time indexes."""
+    index_data = pd.read_csv(index_file, parse_dates=True, index_col="Datetime")
+    future_data = pd.read_csv(future_file, parse_dates=True, index_col="Datetime")
+    return align_frames(index_data, future_data)
+
+
+def align_frames(index_data: pd.DataFrame, future_data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Restrict two DataFrames indexed by ``Datetime`` to their common times."""
+    # Ensure both are sorted by datetime index just in case
+    index_data.sort_index(inplace=True)
+    future_data.sort_index(inplace=True)
+
+    # Find the intersection of the two time indexes
+    common_times = index_data.index.intersection(future_data.index)
+
+    # Filter both DataFrames to only the common times
+    return index_data.loc[common_times], future_data.loc[common_times]
+
+
+class AlignedData:
+    """Index and future bars on a common timeline, stored as contiguous
+    NumPy arrays so the engines can iterate over positions instead of
+    doing label based DataFrame lookups.
+
+    :param timestamps: int64 nanoseconds since the epoch (UTC when tz is set)
+    :param index: column name -> float64 array for the index
+    :param future: column name -> float64 array for the future
+    :param tz: timezone of the original DatetimeIndex, if any
+    """
+    def __init__(self, timestamps: np.ndarray, index: Dict[str, np.ndarray],
+                 future: Dict[str, np.ndarray], tz: Optional[str] = None) -> None:
+        self.timestamps: np.ndarray = timestamps
+        self.index: Dict[str, np.ndarray] = index
+        self.future: Dict[str, np.ndarray] = future
+        self.tz: Optional[str] = tz
+
+    @classmethod
+    def from_frames(cls, index_data: pd.DataFrame, future_data: pd.DataFrame) -> "AlignedData":
+        """Build the arrays from two DataFrames that already share the
+        same DatetimeIndex (see ``Backtester.load_data``).
+        """
+        times = pd.DatetimeIndex(index_data.index)
+        tz = str(times.tz) if times.tz is not None else None
+        index = {col: np.ascontiguousarray(index_data[col].to_numpy(dtype=np.float64))
+                 for col in OHLCV_COLUMNS if col in index_data.columns}
+        future = {col: np.ascontiguousarray(future_data[col].to_numpy(dtype=np.float64))
+                  for col in OHLCV_COLUMNS if col in future_data.columns}
+        return cls(timestamps=to_int64_ns(times), index=index, future=future, tz=tz)
+
+    @classmethod
+    def from_csv(cls, index_file: str, future_file: str) -> "AlignedData":
+        """Load and align both CSV files straight into arrays."""
+        return cls.from_frames(*load_aligned_frames(index_file, future_file))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def slice(self, start: int, stop: int) -> "AlignedData":
+        """Bars ``start`` to ``stop`` (exclusive) as views, without copying."""
+        return AlignedData(
+            timestamps=self.timestamps[start:stop],
+            index={k: v[start:stop] for k, v in self.index.items()},
+            future={k: v[start:stop] for k, v in self.future.items()},
+            tz=self.tz,
+        )
+
+    def times(self) -> pd.DatetimeIndex:
+        """Return the timeline as a DatetimeIndex (in the original timezone)."""
+        times = pd.DatetimeIndex(self.timestamps.view("datetime64[ns]"))
+        if self.tz is not None:
+            times = times.tz_localize("UTC").tz_convert(self.tz)
+        return times
+
+    def day_codes(self) -> np.ndarray:
+        """Return an int64 code per bar that changes whenever the
+        (local) calendar day changes.
+        """
+        return to_int64_ns(self.times().normalize()) // NS_PER_DAY
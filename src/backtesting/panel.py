@@ -0,0 +1,103 @@
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from .market_data import OHLCV_COLUMNS, AlignedData, to_int64_ns
+from .portfolio import Portfolio
+from .vectorized import (close_positions, momentum_series, momentum_signals,
+                         run_vectorized_signals, timedelta_ns)
+
+
+class DataPanel:
+    """Many instruments on one common timeline.
+
+    Every price/volume column is stored as a single 2-D float64 array of
+    shape (time, instrument) in Fortran order, so the series of one
+    instrument is a contiguous column that can be handed to a strategy or
+    engine as a view, without copying.
+
+    :param timestamps: int64 nanoseconds since the epoch
+    :param instruments: instrument names, in column order
+    :param columns: column name -> (time, instrument) array
+    :param tz: timezone of the original timeline, if any
+    """
+    def __init__(self, timestamps: np.ndarray, instruments: Sequence[str],
+                 columns: Dict[str, np.ndarray], tz: Optional[str] = None) -> None:
+        self.timestamps: np.ndarray = timestamps
+        self.instruments: List[str] = list(instruments)
+        self.columns: Dict[str, np.ndarray] = columns
+        self.tz: Optional[str] = tz
+        self._positions = {name: i for i, name in enumerate(self.instruments)}
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame]) -> "DataPanel":
+        """Align DataFrames indexed by ``Datetime`` with a single inner join
+        over all instruments.
+        """
+        names = list(frames)
+        merged = pd.concat([frames[name].sort_index() for name in names], axis=1, keys=names, join="inner")
+        times = pd.DatetimeIndex(merged.index)
+        columns = {}
+        for column in OHLCV_COLUMNS:
+            if all(column in frames[name].columns for name in names):
+                block = merged.xs(column, axis=1, level=1)[names]
+                columns[column] = np.asfortranarray(block.to_numpy(dtype=np.float64))
+        tz = str(times.tz) if times.tz is not None else None
+        return cls(timestamps=to_int64_ns(times), instruments=names, columns=columns, tz=tz)
+
+    @classmethod
+    def from_csv(cls, files: Mapping[str, Union[str, Path]]) -> "DataPanel":
+        """Load one CSV file per instrument (same schema as data/spx_*.csv)."""
+        frames = {name: pd.read_csv(path, parse_dates=True, index_col="Datetime") for name, path in files.items()}
+        return cls.from_frames(frames)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def position(self, instrument: str) -> int:
+        return self._positions[instrument]
+
+    def series(self, instrument: str, column: str = "Close") -> np.ndarray:
+        """Contiguous view of one instrument's column."""
+        return self.columns[column][:, self._positions[instrument]]
+
+    def aligned_data(self, index_instrument: str, future_instrument: str) -> AlignedData:
+        """AlignedData for an index/future pair made of views into the panel."""
+        return AlignedData(
+            timestamps=self.timestamps,
+            index={column: self.series(index_instrument, column) for column in self.columns},
+            future={column: self.series(future_instrument, column) for column in self.columns},
+            tz=self.tz,
+        )
+
+
+def run_panel_momentum(panel: DataPanel, pairs: Sequence[Tuple[str, str]], threshold: float = 0.0005,
+                       window: int = 5, holding_period: timedelta = timedelta(minutes=10),
+                       initial_cash: float = 100000.0) -> Dict[Tuple[str, str], Portfolio]:
+    """Backtest the momentum strategy on many (index, future) pairs.
+
+    The momentum and signals of all futures are computed in one pass over
+    the (time, instrument) Close array, so the cost grows with the number
+    of bars rather than with per-pair Python overhead. Each pair then only
+    walks its own trades.
+
+    :return: (index, future) -> Portfolio with the completed trades
+    """
+    futures = sorted({future for _, future in pairs}, key=panel.position)
+    block = panel.columns["Close"][:, [panel.position(future) for future in futures]]
+    signals = np.asfortranarray(momentum_signals(momentum_series(block, window=window), threshold))
+    signal_column = {future: i for i, future in enumerate(futures)}
+    # All pairs share the timeline, so the exit bars are computed once
+    close_at = close_positions(panel.timestamps, timedelta_ns(holding_period))
+
+    results = {}
+    for index, future in pairs:
+        results[(index, future)] = run_vectorized_signals(
+            panel.aligned_data(index, future),
+            signals[:, signal_column[future]],
+            holding_period=holding_period,
+            initial_cash=initial_cash,
+            close_at=close_at,
+        )
+    return results
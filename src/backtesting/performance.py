@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+from .ledger import TradeLedger
+from .market_data import NS_PER_DAY
+
+NS_PER_YEAR: float = 365.25 * NS_PER_DAY
+
+
+@dataclass(frozen=True)
+class PerformanceReport:
+    """Performance statistics of a backtest.
+
+    Trade based ratios use per-trade returns relative to the initial
+    capital, like the original ``print_performance``. Drawdowns are taken
+    from the equity curve when one is given, otherwise from the equity
+    after each closed trade.
+    """
+    num_trades: int
+    winners: int
+    losers: int
+    hit_rate: float
+    total_pnl: float
+    avg_pnl: float
+    geometric_mean: float
+    sharpe: float
+    sortino: float
+    profit_factor: float
+    max_drawdown: float
+    max_drawdown_duration: int
+    calmar: float
+    turnover: float
+    final_equity: float
+    daily: pd.DataFrame
+
+
+def trade_returns(pnls: np.ndarray, initial_capital: float) -> np.ndarray:
+    return np.asarray(pnls, dtype=np.float64) / initial_capital
+
+
+def sharpe_ratio(returns: np.ndarray) -> float:
+    """Mean over sample standard deviation, 0 when undefined."""
+    if len(returns) < 2:
+        return 0.0
+    std = returns.std(ddof=1)
+    return float(returns.mean() / std) if std > 0 else 0.0
+
+
+def sortino_ratio(returns: np.ndarray) -> float:
+    """Mean over downside deviation (root mean square of the negative
+    returns), 0 when undefined.
+    """
+    if len(returns) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    return float(returns.mean() / downside) if downside > 0 else 0.0
+
+
+def geometric_mean(returns: np.ndarray) -> float:
+    """(product of (1 + r))^(1/N) - 1, computed in log space so it does
+    not under/overflow for millions of trades.
+    """
+    if len(returns) == 0:
+        return 0.0
+    return float(np.expm1(np.mean(np.log1p(returns))))
+
+
+def profit_factor(pnls: np.ndarray) -> float:
+    """Gross profit over gross loss (inf without losing trades)."""
+    gross_profit = pnls[pnls > 0].sum()
+    gross_loss = -pnls[pnls < 0].sum()
+    if gross_loss == 0:
+        return float("inf") if gross_profit > 0 else 0.0
+    return float(gross_profit / gross_loss)
+
+
+def drawdown(equity: np.ndarray) -> Tuple[float, int]:
+    """Maximum drawdown (as a negative fraction of the running peak) and
+    the longest time spent below a previous peak, in samples.
+    """
+    if len(equity) == 0:
+        return 0.0, 0
+    peaks = np.maximum.accumulate(equity)
+    max_drawdown = float(np.min(equity / peaks - 1.0))
+    positions = np.arange(len(equity))
+    # Position of the latest peak at or before each sample
+    last_peak = np.maximum.accumulate(np.where(equity >= peaks, positions, 0))
+    return max_drawdown, int(np.max(positions - last_peak))
+
+
+def daily_statistics(ledger: TradeLedger) -> pd.DataFrame:
+    """Closed trades, wins, losses and PnL per calendar day of the close."""
+    close_times = pd.DatetimeIndex(ledger.close_time.view("datetime64[ns]"))
+    if ledger._tz is not None:
+        close_times = close_times.tz_localize("UTC").tz_convert(ledger._tz)
+    pnls = ledger.realized_pnl
+    days, codes = np.unique(close_times.normalize().as_unit("ns").asi8, return_inverse=True)
+    n_days = len(days)
+    daily = pd.DataFrame({
+        "num_trades": np.bincount(codes, minlength=n_days),
+        "winners": np.bincount(codes, weights=pnls > 0, minlength=n_days).astype(np.int64),
+        "losers": np.bincount(codes, weights=pnls < 0, minlength=n_days).astype(np.int64),
+        "pnl": np.bincount(codes, weights=pnls, minlength=n_days),
+        "commissions": np.bincount(codes, weights=ledger.commissions, minlength=n_days),
+    }, index=pd.DatetimeIndex(days.view("datetime64[ns]"), name="date"))
+    if ledger._tz is not None:
+        daily.index = daily.index.tz_localize("UTC").tz_convert(ledger._tz)
+    return daily
+
+
+def compute_performance(ledger: TradeLedger, initial_capital: float = 100000.0,
+                        equity: Optional[np.ndarray] = None,
+                        timestamps: Optional[np.ndarray] = None,
+                        final_equity: Optional[float] = None) -> PerformanceReport:
+    """Compute all statistics of a backtest with array operations.
+
+    :param ledger: the completed trades
+    :param initial_capital: capital the per-trade returns are relative to
+    :param equity: optional equity per bar; without it the equity after
+        every closed trade (net of commissions) is used
+    :param timestamps: int64 ns times of the ``equity`` samples, used to
+        annualize the return for the Calmar ratio
+    :param final_equity: overrides the last equity value (e.g. to include
+        an open position)
+    """
+    pnls = ledger.realized_pnl
+    n = len(pnls)
+    returns = trade_returns(pnls, initial_capital)
+    winners = int(np.count_nonzero(pnls > 0))
+    losers = int(np.count_nonzero(pnls < 0))
+
+    if equity is None:
+        equity = initial_capital + np.cumsum(pnls - ledger.commissions)
+        equity = np.concatenate(([initial_capital], equity))
+        timestamps = None
+        if n:
+            timestamps = np.concatenate((ledger.open_time[:1], ledger.close_time))
+    equity = np.asarray(equity, dtype=np.float64)
+    if final_equity is None:
+        final_equity = float(equity[-1]) if len(equity) else initial_capital
+    max_drawdown, max_drawdown_duration = drawdown(equity)
+
+    calmar = 0.0
+    if timestamps is not None and len(timestamps) > 1 and max_drawdown < 0:
+        years = (timestamps[-1] - timestamps[0]) / NS_PER_YEAR
+        if years > 0 and final_equity > 0:
+            annual_return = (final_equity / initial_capital) ** (1.0 / years) - 1.0
+            calmar = float(annual_return / -max_drawdown)
+
+    traded_notional = (ledger.open_price * ledger.size).sum() + (ledger.close_price * ledger.size).sum()
+
+    return PerformanceReport(
+        num_trades=n,
+        winners=winners,
+        losers=losers,
+        hit_rate=winners / n if n else 0.0,
+        total_pnl=float(pnls.sum()),
+        avg_pnl=float(pnls.mean()) if n else 0.0,
+        geometric_mean=geometric_mean(returns),
+        sharpe=sharpe_ratio(returns),
+        sortino=sortino_ratio(returns),
+        profit_factor=profit_factor(pnls),
+        max_drawdown=max_drawdown,
+        max_drawdown_duration=max_drawdown_duration,
+        calmar=calmar,
+        turnover=float(traded_notional / initial_capital),
+        final_equity=float(final_equity),
+        daily=daily_statistics(ledger),
+    )
@@ -1,24 +1,42 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, List, Optional
 from .trade import Trade
+from .ledger import TradeLedger
+
+# Fraction of a short position's notional held back from cash as margin
+SHORT_MARGIN: float = 0.5
+
 
 class Portfolio:
-    def __init__(self, initial_cash: float = 100000.0):
+    """:param short_margin: fraction of a short position's notional held
+        back from cash while it is open
+    """
+    def __init__(self, initial_cash: float = 100000.0, short_margin: float = SHORT_MARGIN):
         self.cash: float = initial_cash
         self.open_trade: Optional[Trade] = None
-        self.completed_trades: List[Trade] = []
+        self.completed_trades: TradeLedger = TradeLedger()
+        # Short margin currently held back from cash
+        self.margin: float = 0.0
+        self.short_margin: float = short_margin
         self._current_time: Optional[datetime] = None
 
     def set_current_time(self, current_time: datetime):
         self._current_time = current_time
 
-    def open_position(self, direction: str, price: float, commission: float = 2.0) -> bool:
+    def can_open(self) -> bool:
+        """True when a new position may be opened."""
+        return self.open_trade is None
+
+    def is_open(self, trade: Trade) -> bool:
+        return trade is not None and trade is self.open_trade
+
+    def open_position(self, direction: str, price: float, commission: float = 2.0, size: float = 1.0) -> bool:
         if self.open_trade is not None:
             # Already have an open trade
             return False
 
         # Create a new Trade instance
-        new_trade = Trade(direction=direction, open_time=self._current_time, open_price=price)
+        new_trade = Trade(direction=direction, open_time=self._current_time, open_price=price, size=size)
 
         # Deduct commission immediately from portfolio cash
         self.cash -= commission
@@ -26,15 +44,17 @@ class Portfolio:
         new_trade.commissions += commission
         # Margin if short
         if direction == "short":
-            margin_required = 0.5 * price * new_trade.size
+            margin_required = self.short_margin * price * new_trade.size
             self.cash -= margin_required
+            self.margin += margin_required
 
         self.open_trade = new_trade
         return True
 
 
-    def close_position(self, price: float, commission: float = 2.0) -> None:
-        if self.open_trade is None:
+    def close_position(self, price: float, commission: float = 2.0, trade: Optional[Trade] = None) -> None:
+        """:param trade: only close if this is the open trade"""
+        if self.open_trade is None or (trade is not None and trade is not self.open_trade):
             return
 
         # Deduct commission for closing
@@ -45,8 +65,9 @@ class Portfolio:
 
         # Return margin for short trades
         if self.open_trade.direction == "short":
-            margin_return = 0.5 * self.open_trade.open_price * self.open_trade.size
+            margin_return = self.short_margin * self.open_trade.open_price * self.open_trade.size
             self.cash += margin_return
+            self.margin -= margin_return
 
         # Add net realized PnL to cash (already includes commissions)
         self.cash += self.open_trade.realized_pnl
@@ -65,3 +86,207 @@ class Portfolio:
 
     def total_equity(self, current_price: float) -> float:
         return self.cash + self.get_unrealized_pnl(current_price=current_price)
+
+    def net_position(self) -> float:
+        """Signed size of the open position (negative when short)."""
+        trade = self.open_trade
+        if trade is None:
+            return 0.0
+        return trade.size if trade.direction == "long" else -trade.size
+
+    def position_cost(self) -> float:
+        """Signed size times open price of the open position."""
+        trade = self.open_trade
+        if trade is None:
+            return 0.0
+        cost = trade.size * trade.open_price
+        return cost if trade.direction == "long" else -cost
+
+    def net_liquidation_value(self, current_price: float) -> float:
+        """Cash plus the short margin held plus the unrealized PnL, i.e.
+        what the portfolio is worth if everything is closed at
+        ``current_price`` (before commissions).
+        """
+        return self.total_equity(current_price) + self.margin
+
+
+class NetPosition:
+    """Running aggregates of all open lots of one instrument.
+
+    ``quantity`` is the signed net size (long lots positive, short lots
+    negative) and ``cost`` the signed sum of size times open price, so the
+    unrealized PnL at any price is ``quantity * price - cost``.
+    """
+    __slots__ = ("quantity", "cost", "lots", "realized_pnl", "commissions", "last_price", "unrealized_pnl")
+
+    def __init__(self) -> None:
+        self.quantity: float = 0.0
+        self.cost: float = 0.0
+        self.lots: int = 0
+        self.realized_pnl: float = 0.0
+        self.commissions: float = 0.0
+        self.last_price: Optional[float] = None
+        self.unrealized_pnl: float = 0.0
+
+    @property
+    def average_cost(self) -> float:
+        """Average open price of the net position, NaN when flat."""
+        return self.cost / self.quantity if self.quantity else float("nan")
+
+    def unrealized_at(self, price: float) -> float:
+        return self.quantity * price - self.cost
+
+
+class NettingPortfolio:
+    """Portfolio holding many overlapping positions (lots) per instrument.
+
+    Every lot is a Trade that is opened and closed on its own, with the
+    same commission, short margin and cash arithmetic as ``Portfolio``,
+    and ends up in ``completed_trades``. On top of the lots the portfolio
+    keeps per-instrument NetPosition aggregates and the total unrealized
+    PnL at the last marked prices, updated incrementally on every open,
+    close and ``mark``, so the equity is O(1) whatever the number of
+    open lots.
+
+    :param max_positions: maximum number of open lots, None for no limit
+    :param instrument: instrument used when none is given
+    :param short_margin: see ``Portfolio``
+    """
+    def __init__(self, initial_cash: float = 100000.0, max_positions: Optional[int] = None,
+                 instrument: str = "default", short_margin: float = SHORT_MARGIN):
+        self.cash: float = initial_cash
+        self.completed_trades: TradeLedger = TradeLedger()
+        self.positions: Dict[str, NetPosition] = {}
+        # Short margin currently held back from cash
+        self.margin: float = 0.0
+        self.short_margin: float = short_margin
+        self._max_positions = max_positions
+        self._instrument = instrument
+        # Open lots in opening order -> instrument
+        self._lots: Dict[Trade, str] = {}
+        self._unrealized_pnl: float = 0.0
+        self._current_time: Optional[datetime] = None
+
+    def set_current_time(self, current_time: datetime):
+        self._current_time = current_time
+
+    @property
+    def open_trades(self) -> List[Trade]:
+        """Open lots, oldest first."""
+        return list(self._lots)
+
+    @property
+    def open_trade(self) -> Optional[Trade]:
+        """The most recently opened lot that is still open."""
+        return next(reversed(self._lots), None)
+
+    def can_open(self) -> bool:
+        return self._max_positions is None or len(self._lots) < self._max_positions
+
+    def is_open(self, trade: Trade) -> bool:
+        return trade in self._lots
+
+    def position(self, instrument: Optional[str] = None) -> NetPosition:
+        instrument = self._instrument if instrument is None else instrument
+        position = self.positions.get(instrument)
+        if position is None:
+            position = self.positions[instrument] = NetPosition()
+        return position
+
+    def _update_unrealized(self, position: NetPosition) -> None:
+        if position.last_price is None:
+            return
+        unrealized = position.unrealized_at(position.last_price)
+        self._unrealized_pnl += unrealized - position.unrealized_pnl
+        position.unrealized_pnl = unrealized
+
+    def mark(self, price: float, instrument: Optional[str] = None) -> None:
+        """Set the current price of an instrument for ``equity``."""
+        position = self.position(instrument)
+        position.last_price = price
+        self._update_unrealized(position)
+
+    def open_position(self, direction: str, price: float, commission: float = 2.0,
+                      instrument: Optional[str] = None, size: float = 1.0) -> bool:
+        if not self.can_open():
+            return False
+        instrument = self._instrument if instrument is None else instrument
+        new_trade = Trade(direction=direction, open_time=self._current_time, open_price=price, size=size)
+        self.cash -= commission
+        new_trade.commissions += commission
+        sign = 1.0
+        if direction == "short":
+            sign = -1.0
+            margin_required = self.short_margin * price * size
+            self.cash -= margin_required
+            self.margin += margin_required
+
+        position = self.position(instrument)
+        position.quantity += sign * size
+        position.cost += sign * size * price
+        position.lots += 1
+        position.commissions += commission
+        self._update_unrealized(position)
+        self._lots[new_trade] = instrument
+        return True
+
+    def close_position(self, price: float, commission: float = 2.0, trade: Optional[Trade] = None) -> None:
+        """Close ``trade``, or the oldest open lot when not given."""
+        if trade is None:
+            trade = next(iter(self._lots), None)
+        instrument = self._lots.pop(trade, None) if trade is not None else None
+        if instrument is None:
+            return
+
+        self.cash -= commission
+        trade.commissions += commission
+        trade.close_trade(close_time=self._current_time, close_price=price)
+        sign = 1.0
+        if trade.direction == "short":
+            sign = -1.0
+            margin_return = self.short_margin * trade.open_price * trade.size
+            self.cash += margin_return
+            self.margin -= margin_return
+            if not self._lots:
+                self.margin = 0.0
+        self.cash += trade.realized_pnl
+
+        position = self.positions[instrument]
+        position.lots -= 1
+        if position.lots == 0:
+            # Reset exactly so rounding errors cannot build up
+            position.quantity = 0.0
+            position.cost = 0.0
+        else:
+            position.quantity -= sign * trade.size
+            position.cost -= sign * trade.size * trade.open_price
+        position.realized_pnl += trade.realized_pnl
+        position.commissions += commission
+        self._update_unrealized(position)
+        self.completed_trades.append(trade)
+
+    def get_unrealized_pnl(self, current_price: float, instrument: Optional[str] = None) -> float:
+        """Unrealized PnL of all lots, with ``instrument`` at ``current_price``
+        and every other instrument at its last marked price.
+        """
+        position = self.position(instrument)
+        return self._unrealized_pnl - position.unrealized_pnl + position.unrealized_at(current_price)
+
+    def total_equity(self, current_price: float, instrument: Optional[str] = None) -> float:
+        return self.cash + self.get_unrealized_pnl(current_price, instrument=instrument)
+
+    def equity(self) -> float:
+        """Cash plus the unrealized PnL at the last marked prices."""
+        return self.cash + self._unrealized_pnl
+
+    def net_position(self, instrument: Optional[str] = None) -> float:
+        """Signed net size of an instrument's open lots."""
+        return self.position(instrument).quantity
+
+    def position_cost(self, instrument: Optional[str] = None) -> float:
+        """Signed size times open price summed over an instrument's lots."""
+        return self.position(instrument).cost
+
+    def net_liquidation_value(self, current_price: float, instrument: Optional[str] = None) -> float:
+        """Cash plus the short margin held plus the unrealized PnL."""
+        return self.total_equity(current_price, instrument=instrument) + self.margin
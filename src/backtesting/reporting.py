@@ -0,0 +1,171 @@
+import copy
+import csv
+import json
+import queue
+import threading
+from abc import ABC
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+from .trade import Trade
+
+# Fields written for every closed trade by the file reporters
+TRADE_FIELDS = ("direction", "open_time", "open_price", "close_time", "close_price",
+                "realized_pnl", "commissions")
+
+
+class Reporter(ABC):
+    """Receives trade and end of day events from the Backtester.
+
+    All hooks are no-ops by default so a reporter only implements the
+    events it cares about.
+    """
+    def on_open(self, trade: Trade, cash: float) -> None:
+        pass
+
+    def on_close(self, trade: Trade, cash: float) -> None:
+        pass
+
+    def on_day_end(self, day_str: str, trades: List[Trade], daily_pnl: float) -> None:
+        pass
+
+    def close(self) -> None:
+        """Flush buffered output, called once at the end of a run."""
+        pass
+
+
+class SilentReporter(Reporter):
+    """Discards all events, for sweeps and benchmarks."""
+
+
+class ConsoleReporter(Reporter):
+    """Prints every trade and a summary at the end of each day."""
+    def on_open(self, trade: Trade, cash: float) -> None:
+        print(f"[{trade.open_time}] OPEN {trade.direction.upper()} at {trade.open_price:.2f}, Commission: {trade.commissions:.2f}, Cash: {cash:.2f}")
+
+    def on_close(self, trade: Trade, cash: float) -> None:
+        print(f"[{trade.close_time}] CLOSE {trade.direction.upper()} at {trade.close_price:.2f}, PnL: {trade.realized_pnl:.2f}, Cash: {cash:.2f}")
+
+    def on_day_end(self, day_str: str, trades: List[Trade], daily_pnl: float) -> None:
+        print(f"=== End of day {day_str} Summary ===")
+        print(f"Trades closed this day: {len(trades)}")
+        print(f"Daily PnL: {daily_pnl:.2f}")
+        print("Details:")
+        for t in trades:
+            print(f" - {t.direction.upper()} from {t.open_time} at {t.open_price:.2f}, closed {t.close_time} at {t.close_price:.2f}, PnL: {t.realized_pnl:.2f}")
+
+
+class BufferedFileReporter(Reporter):
+    """Collects closed trades in memory and writes them in batches to a
+    CSV or JSON Lines file, so there is no I/O per trade.
+
+    :param path: output file, overwritten when the reporter is created
+    :param fmt: "csv" or "jsonl"
+    :param batch_size: number of trades buffered before writing
+    """
+    def __init__(self, path: Union[str, Path], fmt: str = "csv", batch_size: int = 10000) -> None:
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Unknown format '{fmt}', expected 'csv' or 'jsonl'")
+        self._fmt = fmt
+        self._batch_size = batch_size
+        self._buffer: List[tuple] = []
+        self._file = open(path, "w", newline="")
+        self._writer = None
+        if fmt == "csv":
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(TRADE_FIELDS)
+
+    def on_close(self, trade: Trade, cash: float) -> None:
+        self._buffer.append((trade.direction, trade.open_time, trade.open_price, trade.close_time,
+                             trade.close_price, trade.realized_pnl, trade.commissions))
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._fmt == "csv":
+            self._writer.writerows(self._buffer)
+        else:
+            self._file.write("".join(
+                json.dumps(dict(zip(TRADE_FIELDS, record)), default=str) + "\n" for record in self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
+class MultiReporter(Reporter):
+    """Forwards every event to several reporters, e.g. console and file."""
+    def __init__(self, reporters: Sequence[Reporter]) -> None:
+        self._reporters = list(reporters)
+
+    def on_open(self, trade: Trade, cash: float) -> None:
+        for reporter in self._reporters:
+            reporter.on_open(trade, cash)
+
+    def on_close(self, trade: Trade, cash: float) -> None:
+        for reporter in self._reporters:
+            reporter.on_close(trade, cash)
+
+    def on_day_end(self, day_str: str, trades: List[Trade], daily_pnl: float) -> None:
+        for reporter in self._reporters:
+            reporter.on_day_end(day_str, trades, daily_pnl)
+
+    def close(self) -> None:
+        for reporter in self._reporters:
+            reporter.close()
+
+
+class BackgroundReporter(Reporter):
+    """Forwards every event to another reporter from a background thread,
+    so printing and file writes never hold up the loop producing the
+    events (e.g. the asyncio loop of a live feed, see live.py).
+
+    Trades are copied when an event is queued, because an open trade is
+    still changed by the Backtester when it is closed.
+
+    :param reporter: the reporter doing the actual output
+    :param maxsize: events queued at most; when the output falls that far
+        behind, the hooks wait for it
+    """
+    def __init__(self, reporter: Reporter, maxsize: int = 100_000) -> None:
+        self._reporter = reporter
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._work, name="BackgroundReporter", daemon=True)
+        self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            hook, args = event
+            if self._error is None:
+                try:
+                    hook(*args)
+                except BaseException as error:  # Raised again from close()
+                    self._error = error
+
+    def on_open(self, trade: Trade, cash: float) -> None:
+        self._queue.put((self._reporter.on_open, (copy.copy(trade), cash)))
+
+    def on_close(self, trade: Trade, cash: float) -> None:
+        self._queue.put((self._reporter.on_close, (copy.copy(trade), cash)))
+
+    def on_day_end(self, day_str: str, trades: List[Trade], daily_pnl: float) -> None:
+        self._queue.put((self._reporter.on_day_end, (day_str, list(trades), daily_pnl)))
+
+    def close(self) -> None:
+        """Wait until all queued events are written, then close the reporter."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._reporter.close()
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,127 @@
+from typing import Dict, Iterable
+import numpy as np
+from .market_data import NS_PER_DAY, NS_PER_MINUTE, AlignedData, to_int64_ns
+
+
+def bucket_starts(data: AlignedData, minutes: int) -> np.ndarray:
+    """Positions of the first bar of every ``minutes`` long bucket.
+
+    Buckets are aligned to midnight of the local calendar day (like
+    ``DataFrame.resample``) and never span two days, so e.g. 60-minute
+    bars of a 09:30 - 16:00 session cover 09:30 - 09:59, 10:00 - 10:59, ...
+    The bars must be sorted by time.
+    """
+    if minutes < 1:
+        raise ValueError("minutes must be at least 1")
+    if len(data) == 0:
+        return np.empty(0, dtype=np.int64)
+    local = data.timestamps
+    if data.tz is not None:
+        # Wall clock time, so buckets follow the local day
+        local = to_int64_ns(data.times().tz_localize(None))
+    day, time_of_day = np.divmod(local, NS_PER_DAY)
+    key = day * (NS_PER_DAY // NS_PER_MINUTE) + time_of_day // (minutes * NS_PER_MINUTE)
+    return np.concatenate(([0], np.flatnonzero(key[1:] != key[:-1]) + 1)).astype(np.int64)
+
+
+def _aggregate(columns: Dict[str, np.ndarray], starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+    """OHLCV of every bucket with one ``reduceat`` (or gather) per column."""
+    out = {}
+    for name, values in columns.items():
+        if name == "Open":
+            out[name] = values[starts]
+        elif name == "High":
+            out[name] = np.maximum.reduceat(values, starts)
+        elif name == "Low":
+            out[name] = np.minimum.reduceat(values, starts)
+        elif name == "Volume":
+            out[name] = np.add.reduceat(values, starts)
+        else:
+            out[name] = values[ends]
+    return out
+
+
+def resample(data: AlignedData, minutes: int) -> AlignedData:
+    """Aggregate bars into ``minutes`` long bars (see ``bucket_starts``):
+    first Open, highest High, lowest Low, last Close and summed Volume.
+
+    A bar is stamped with the time of the last bar it contains, the time
+    its Close is known, so a backtest on the coarser bars never acts on a
+    price before it was available.
+    """
+    return _resample_at(data, bucket_starts(data, minutes))
+
+
+def _bucket_ends(data: AlignedData, starts: np.ndarray) -> np.ndarray:
+    return np.append(starts[1:], len(data)).astype(np.int64) - 1
+
+
+def _resample_at(data: AlignedData, starts: np.ndarray) -> AlignedData:
+    if len(data) == 0:
+        return data
+    ends = _bucket_ends(data, starts)
+    return AlignedData(
+        timestamps=data.timestamps[ends],
+        index=_aggregate(data.index, starts, ends),
+        future=_aggregate(data.future, starts, ends),
+        tz=data.tz,
+    )
+
+
+class Timeframes:
+    """Bars of several timeframes built from the same 1-minute bars, each
+    computed once and kept for every later use.
+
+    A timeframe is built from the coarsest cached timeframe that divides
+    it (15-minute bars from 5-minute bars rather than from the minutes),
+    which gives the same bars with less work.
+
+    :param data: aligned 1-minute bars
+    """
+    def __init__(self, data: AlignedData) -> None:
+        self._bars: Dict[int, AlignedData] = {1: data}
+        # Timeframe -> position in the minute bars of the last minute of every bar
+        self._ends: Dict[int, np.ndarray] = {1: np.arange(len(data), dtype=np.int64)}
+
+    @property
+    def minutes(self) -> list:
+        """The timeframes built so far."""
+        return sorted(self._bars)
+
+    def build(self, minutes: Iterable[int]) -> None:
+        """Build several timeframes, finest first so they can build on each other."""
+        for m in sorted(set(minutes)):
+            self.bars(m)
+
+    def bars(self, minutes: int) -> AlignedData:
+        """The ``minutes`` bars, built on first use."""
+        if minutes not in self._bars:
+            source = max(m for m in self._bars if minutes % m == 0)
+            starts = bucket_starts(self._bars[source], minutes)
+            self._bars[minutes] = _resample_at(self._bars[source], starts)
+            self._ends[minutes] = self._ends[source][_bucket_ends(self._bars[source], starts)]
+        return self._bars[minutes]
+
+    def last_minute(self, minutes: int) -> np.ndarray:
+        """Position in the 1-minute bars of the last minute of every
+        ``minutes`` bar.
+        """
+        self.bars(minutes)
+        return self._ends[minutes]
+
+    def as_of(self, minutes: int, onto: int) -> np.ndarray:
+        """For every ``onto`` bar, the position of the last ``minutes`` bar
+        completed by its time (-1 before the first one), to combine a
+        slower timeframe with a faster one without looking ahead.
+        """
+        return np.searchsorted(self.bars(minutes).timestamps, self.bars(onto).timestamps, side="right") - 1
+
+    def align(self, values: np.ndarray, minutes: int, onto: int) -> np.ndarray:
+        """Values computed per ``minutes`` bar (e.g. a momentum series)
+        repeated on the ``onto`` bars, NaN before the first ``minutes`` bar
+        is complete.
+        """
+        positions = self.as_of(minutes, onto)
+        out = np.asarray(values, dtype=np.float64)[np.maximum(positions, 0)]
+        out[positions < 0] = np.nan
+        return out
@@ -0,0 +1,43 @@
+import argparse
+import sys
+import os
+# Ensure the 'src' directory is included in the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.bootstrap import METHODS, bootstrap_returns, bootstrap_trades
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals of the momentum strategy")
+    parser.add_argument("--index-file", default=str(SPX_INDEX_DATA))
+    parser.add_argument("--future-file", default=str(SPX_FUTURE_DATA))
+    parser.add_argument("--threshold", type=float, default=0.0005)
+    parser.add_argument("--resamples", type=int, default=10_000)
+    parser.add_argument("--method", choices=METHODS, default="block")
+    parser.add_argument("--block-size", type=int, default=None, help="default: cube root of the series length")
+    parser.add_argument("--level", type=float, default=0.95, help="confidence level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    backtester = Backtester(strategy=MomentumStrategy(threshold=args.threshold), engine="array",
+                            reporter=SilentReporter())
+    backtester.load_data(index_file=args.index_file, future_file=args.future_file)
+    backtester.run()
+
+    options = dict(n_resamples=args.resamples, method=args.method, block_size=args.block_size, seed=args.seed,
+                   max_workers=args.workers)
+    trades = bootstrap_trades(backtester._portfolio.completed_trades, initial_capital=backtester._initial_cash,
+                              **options)
+    bars = bootstrap_returns(backtester.equity_curve()["equity"], **options)
+    print(f"Trades ({len(backtester._portfolio.completed_trades)}, {args.method} bootstrap, "
+          f"block size {trades.block_size}):")
+    print(trades.confidence_intervals(args.level).to_string())
+    print(f"\nPer-bar returns ({len(backtester.equity_curve()) - 1}, block size {bars.block_size}):")
+    print(bars.confidence_intervals(args.level).to_string())
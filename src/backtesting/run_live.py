@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import sys
+import os
+# Ensure the 'src' directory is included in the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.live import BarFeed, LiveTrader, replay
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import BackgroundReporter, ConsoleReporter, SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+async def paper_trade(args) -> LiveTrader:
+    data = AlignedData.from_csv(args.index_file, args.future_file)
+    reporter = SilentReporter() if args.quiet else BackgroundReporter(ConsoleReporter())
+    backtester = Backtester(strategy=MomentumStrategy(threshold=args.threshold), engine="array",
+                            reporter=reporter)
+    feed = BarFeed(maxsize=args.queue_size)
+    trader = LiveTrader(backtester, feed)
+    await asyncio.gather(replay(feed, data, interval=args.interval, burst=args.burst), trader.run())
+    print(f"Deepest queue: {feed.max_depth} bars")
+    return trader
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paper trade the momentum strategy on a replayed bar feed")
+    parser.add_argument("--index-file", default=str(SPX_INDEX_DATA))
+    parser.add_argument("--future-file", default=str(SPX_FUTURE_DATA))
+    parser.add_argument("--threshold", type=float, default=0.0005)
+    parser.add_argument("--interval", type=float, default=0.0, help="seconds between bursts of bars")
+    parser.add_argument("--burst", type=int, default=1, help="bars arriving back to back")
+    parser.add_argument("--queue-size", type=int, default=10_000, help="bars queued before the feed waits")
+    parser.add_argument("--quiet", action="store_true", help="do not print the trades")
+    parser.add_argument("--latency-output", default=None, help="write the per-bar latencies to this CSV file")
+    args = parser.parse_args()
+
+    trader = asyncio.run(paper_trade(args))
+    print(trader.latency.report())
+    if args.latency_output:
+        trader.latency.to_frame().to_csv(args.latency_output)
@@ -0,0 +1,68 @@
+import argparse
+import sys
+import os
+# Ensure the 'src' directory is included in the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.backtesting.data_cache import load_aligned_frames_cached
+from src.backtesting.execution import ExecutionModel, FixedSlippage, HighLowSpread, PercentageSlippage
+from src.backtesting.market_data import AlignedData
+from src.backtesting.sweep import run_sweep
+from src.definitions import DATA_CACHE_DIR, SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parameter sweep of the momentum strategy")
+    parser.add_argument("--index-file", default=str(SPX_INDEX_DATA))
+    parser.add_argument("--future-file", default=str(SPX_FUTURE_DATA))
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.0003, 0.0005, 0.001])
+    parser.add_argument("--windows", type=int, nargs="+", default=[5])
+    parser.add_argument("--holding", type=int, nargs="+", default=[10], help="holding periods in minutes")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default=None, help="write the results table to this CSV file")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse the CSV files")
+    parser.add_argument("--indicator-cache", action="store_true",
+                        help="keep the momentum series on disk for later sweeps")
+    parser.add_argument("--slippage", type=float, default=0.0, help="slippage per fill in price points")
+    parser.add_argument("--slippage-pct", type=float, default=0.0, help="slippage per fill as a fraction of the price")
+    parser.add_argument("--spread", type=float, default=0.0,
+                        help="pay half of this fraction of the bar's High-Low range per fill")
+    parser.add_argument("--delay", type=int, default=0, help="bars between an order and its fill")
+    parser.add_argument("--volume-cap", type=float, default=None, help="fill at most this fraction of the bar volume")
+    parser.add_argument("--commission", type=float, default=2.0, help="commission per fill")
+    parser.add_argument("--short-margin", type=float, default=0.5,
+                        help="fraction of a short position's notional held as margin")
+    args = parser.parse_args()
+
+    fills = []
+    if args.slippage:
+        fills.append(FixedSlippage(args.slippage))
+    if args.slippage_pct:
+        fills.append(PercentageSlippage(args.slippage_pct))
+    if args.spread:
+        fills.append(HighLowSpread(args.spread))
+    execution = ExecutionModel(fills=fills, delay=args.delay, volume_cap=args.volume_cap,
+                               commission=args.commission, short_margin=args.short_margin)
+
+    # Load and align the data once, the workers share it through memory-mapped files
+    if args.no_cache:
+        data = AlignedData.from_csv(args.index_file, args.future_file)
+    else:
+        data = AlignedData.from_frames(*load_aligned_frames_cached(
+            args.index_file, args.future_file, cache_dir=DATA_CACHE_DIR))
+
+    results = run_sweep(
+        data,
+        thresholds=args.thresholds,
+        windows=args.windows,
+        holding_minutes=args.holding,
+        max_workers=args.workers,
+        indicator_dir=str(DATA_CACHE_DIR / "indicators") if args.indicator_cache else None,
+        execution=execution,
+    )
+    results = results.sort_values("sharpe", ascending=False)
+    print(results.to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
@@ -0,0 +1,51 @@
+import argparse
+import sys
+import os
+# Ensure the 'src' directory is included in the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.backtesting.data_cache import load_aligned_frames_cached
+from src.backtesting.market_data import AlignedData
+from src.backtesting.walk_forward import walk_forward
+from src.definitions import DATA_CACHE_DIR, SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward optimization of the momentum strategy")
+    parser.add_argument("--index-file", default=str(SPX_INDEX_DATA))
+    parser.add_argument("--future-file", default=str(SPX_FUTURE_DATA))
+    parser.add_argument("--train-bars", type=int, default=1170, help="bars per train window (3 sessions)")
+    parser.add_argument("--test-bars", type=int, default=390, help="bars per test window (1 session)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.0003, 0.0005, 0.001])
+    parser.add_argument("--windows", type=int, nargs="+", default=[5])
+    parser.add_argument("--holding", type=int, nargs="+", default=[10], help="holding periods in minutes")
+    parser.add_argument("--metric", default="sharpe", help="column of the sweep results to maximize")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default=None, help="write the out-of-sample equity to this CSV file")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-parse the CSV files and do not memoize train results")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        data = AlignedData.from_csv(args.index_file, args.future_file)
+    else:
+        data = AlignedData.from_frames(*load_aligned_frames_cached(
+            args.index_file, args.future_file, cache_dir=DATA_CACHE_DIR))
+
+    result = walk_forward(
+        data,
+        train_bars=args.train_bars,
+        test_bars=args.test_bars,
+        thresholds=args.thresholds,
+        windows=args.windows,
+        holding_minutes=args.holding,
+        metric=args.metric,
+        max_workers=args.workers,
+        cache_dir=None if args.no_cache else DATA_CACHE_DIR / "walk_forward",
+    )
+    print(result.folds.to_string(index=False))
+    print(f"Out-of-sample final equity: {result.equity.iloc[-1]:.2f}")
+    if args.output:
+        result.equity.to_csv(args.output)
@@ -0,0 +1,42 @@
+import heapq
+from typing import Any, List, Optional, Tuple
+
+
+class ExpiryScheduler:
+    """Min-heap of timed events keyed on int64 nanosecond timestamps.
+
+    ``pop_due`` fires every event scheduled at or before the current bar,
+    so an event never gets lost when its exact timestamp is missing from
+    the data, and fired events are removed so memory only depends on the
+    number of pending events.
+    """
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, int, Any]] = []
+        # Tie breaker keeping events with the same time in FIFO order
+        self._sequence = 0
+
+    def schedule(self, time_ns: int, payload: Any = None) -> None:
+        heapq.heappush(self._heap, (int(time_ns), self._sequence, payload))
+        self._sequence += 1
+
+    def pop_due(self, now_ns: int) -> List[Any]:
+        """Remove and return the payloads of all events due at ``now_ns``,
+        earliest first.
+        """
+        heap = self._heap
+        if not heap or heap[0][0] > now_ns:
+            return []
+        due = []
+        while heap and heap[0][0] <= now_ns:
+            due.append(heapq.heappop(heap)[2])
+        return due
+
+    def next_time(self) -> Optional[int]:
+        """Time of the earliest pending event, None when there is none."""
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
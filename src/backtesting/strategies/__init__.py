@@ -1,2 +1,3 @@
-from .base_strategy import Strategy
+from .base_strategy import Strategy, supports_batch
 from .example_strategy import ExampleStrategy
+from .momentumstrategy import MomentumStrategy
@@ -13,4 +13,17 @@ class Strategy(ABC):
         """
         Return "buy", "sell", or "hold"
         """
-        pass
\ No newline at end of file
+        pass
+
+
+def supports_batch(strategy) -> bool:
+    """True when ``strategy`` implements the optional batch interface
+    ``generate_signals(prices)``: take a block of future prices in time
+    order and return one int8 signal per price (BUY = 1, SELL = -1,
+    HOLD = 0, see vectorized.py), exactly as if ``update_price`` and
+    ``generate_signal`` were called for every price. The state carries
+    over to the next block and to per-tick calls.
+
+    Strategies without it are called per tick.
+    """
+    return callable(getattr(strategy, "generate_signals", None))
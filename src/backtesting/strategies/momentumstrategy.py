@@ -1,27 +1,39 @@
-from collections import deque
+from typing import Optional
+import numpy as np
 from .base_strategy import Strategy
+from ..indicators import RollingMomentum
+from ..indicator_cache import IndicatorCache
+from ..vectorized import momentum_series, momentum_signals
 
 class MomentumStrategy(Strategy):
-    def __init__(self, threshold: float = 0.0005):
-        # Deque will hold the last 10 prices
-        self._prices = deque(maxlen=10)
+    def __init__(self, threshold: float = 0.0005, window: int = 5,
+                 indicators: Optional[IndicatorCache] = None):
+        # Incremental indicator over the last 2 * window prices (10 by default)
+        self._window = window
+        self._momentum = RollingMomentum(window=window)
+        # Shared cache for the batch momentum of whole price series
+        self._indicators = indicators
         self._threshold = threshold
         self._last_signal = "hold"
 
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @property
+    def window(self) -> int:
+        """Number of prices in each of the two averaged windows."""
+        return self._window
+
     def update_price(self, future_price: float) -> None:
-        self._prices.append(future_price)
+        self._momentum.push(future_price)
 
     def can_compute_momentum(self) -> bool:
-        return len(self._prices) == 10
+        return self._momentum.ready
 
     def compute_momentum(self) -> float:
-        prices_list = list(self._prices)
-        prev_window = prices_list[:5]
-        current_window = prices_list[5:]
-        X_n = sum(current_window) / 5.0
-        X_n_1 = sum(prev_window) / 5.0
-        momentum = (X_n - X_n_1) / X_n
-        return momentum
+        # Running sums make this O(1) per bar, whatever the window length
+        return self._momentum.value
 
     def generate_signal(self) -> str:
         """
@@ -42,3 +54,25 @@ class MomentumStrategy(Strategy):
         
         else:
             return "hold"
+
+    def batch_momentum(self, prices: np.ndarray) -> np.ndarray:
+        """Momentum of every price of a whole series, taken from the
+        strategy's IndicatorCache when it has one.
+        """
+        if self._indicators is not None:
+            return self._indicators.momentum(prices, window=self._window)
+        return momentum_series(np.asarray(prices, dtype=np.float64), window=self._window)
+
+    def generate_signals(self, prices: np.ndarray) -> np.ndarray:
+        """Signals for a block of future prices, computed with array
+        operations. The prices still buffered from earlier calls are
+        prepended, so blocks can be fed one after another.
+        """
+        history = self._momentum.prices()
+        if len(history):
+            prices = np.asarray(prices, dtype=np.float64)
+            momentum = momentum_series(np.concatenate((history, prices)), window=self._window)[len(history):]
+        else:
+            momentum = self.batch_momentum(prices)
+        self._momentum.extend(prices)
+        return momentum_signals(momentum, self._threshold)
@@ -0,0 +1,96 @@
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from .market_data import OHLCV_COLUMNS, AlignedData, to_int64_ns
+
+PathLike = Union[str, Path]
+
+
+def _read_chunks(path: PathLike, chunksize: int) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray], Optional[str]]]:
+    """Read a bar CSV in chunks of ``chunksize`` rows.
+
+    :return: iterator of (timestamps, column -> float64 array, tz)
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [column for column in OHLCV_COLUMNS if column in header]
+    last = None
+    for chunk in pd.read_csv(path, usecols=["Datetime", *columns], chunksize=chunksize):
+        times = pd.DatetimeIndex(pd.to_datetime(chunk["Datetime"]))
+        timestamps = to_int64_ns(times)
+        if len(timestamps) == 0:
+            continue
+        # The merge join needs both files in time order
+        if np.any(np.diff(timestamps) <= 0) or (last is not None and timestamps[0] <= last):
+            raise ValueError(f"{path} must be sorted by Datetime without duplicates to be streamed")
+        last = timestamps[-1]
+        tz = str(times.tz) if times.tz is not None else None
+        yield timestamps, {column: chunk[column].to_numpy(dtype=np.float64) for column in columns}, tz
+
+
+class _Side:
+    """Buffered rows of one file that have not been joined yet."""
+    def __init__(self, chunks: Iterator) -> None:
+        self._chunks = chunks
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.columns: Dict[str, np.ndarray] = {}
+        self.tz: Optional[str] = None
+        self.exhausted = False
+
+    def fill(self) -> None:
+        """Read the next chunk when the buffer is empty."""
+        while len(self.timestamps) == 0 and not self.exhausted:
+            try:
+                timestamps, columns, self.tz = next(self._chunks)
+            except StopIteration:
+                self.exhausted = True
+                return
+            self.timestamps, self.columns = timestamps, columns
+
+    def take_until(self, limit: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Remove and return the buffered rows with timestamp <= limit."""
+        end = np.searchsorted(self.timestamps, limit, side="right")
+        taken = self.timestamps[:end], {k: v[:end] for k, v in self.columns.items()}
+        self.timestamps = self.timestamps[end:]
+        self.columns = {k: v[end:] for k, v in self.columns.items()}
+        return taken
+
+
+def iter_aligned_chunks(index_file: PathLike, future_file: PathLike,
+                        chunksize: int = 100_000) -> Iterator[AlignedData]:
+    """Stream both CSV files in time order and merge-join them on Datetime.
+
+    Only one chunk per file is buffered at a time, so peak memory depends
+    on ``chunksize`` and not on the file sizes. Both files must be sorted
+    by Datetime (as written by the download scripts).
+
+    :return: iterator of AlignedData blocks on the common timeline
+    """
+    index_side = _Side(_read_chunks(index_file, chunksize))
+    future_side = _Side(_read_chunks(future_file, chunksize))
+    while True:
+        index_side.fill()
+        future_side.fill()
+        if len(index_side.timestamps) == 0 or len(future_side.timestamps) == 0:
+            # One file is exhausted, the other cannot have matches anymore
+            return
+        # Every row up to the smaller of the two last timestamps can be
+        # joined now; later rows may still match the next chunk
+        limit = min(index_side.timestamps[-1], future_side.timestamps[-1])
+        index_times, index_columns = index_side.take_until(limit)
+        future_times, future_columns = future_side.take_until(limit)
+        common, i, j = np.intersect1d(index_times, future_times, assume_unique=True, return_indices=True)
+        if len(common):
+            yield AlignedData(
+                timestamps=common,
+                index={k: v[i] for k, v in index_columns.items()},
+                future={k: v[j] for k, v in future_columns.items()},
+                tz=index_side.tz,
+            )
+
+
+def iter_aligned_bars(index_file: PathLike, future_file: PathLike,
+                      chunksize: int = 100_000) -> Iterator[Tuple[pd.Timestamp, float, float]]:
+    """Generator of (time, index Close, future Close) for every common bar."""
+    for chunk in iter_aligned_chunks(index_file, future_file, chunksize=chunksize):
+        yield from zip(chunk.times(), chunk.index["Close"].tolist(), chunk.future["Close"].tolist())
@@ -0,0 +1,160 @@
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .execution import ExecutionModel
+from .indicator_cache import IndicatorCache
+from .market_data import AlignedData
+from .performance import compute_performance
+from .vectorized import run_vectorized_momentum
+
+# Market data, indicator cache and execution model of the current worker process, set by _init_worker
+_worker_data: Optional[AlignedData] = None
+_worker_indicators: Optional[IndicatorCache] = None
+_worker_execution: Optional[ExecutionModel] = None
+
+
+def share_arrays(data: AlignedData, directory: Path, columns: Iterable[Tuple[str, str]] = ()) -> Dict[str, str]:
+    """Write the arrays needed by a sweep to ``.npy`` files so worker
+    processes can memory-map them instead of receiving pickled copies.
+
+    :param columns: more (instrument, column) pairs to share, e.g. the
+        ``columns`` an ExecutionModel reads
+    :return: array name -> file path
+    """
+    arrays = {
+        "timestamps": data.timestamps,
+        "index_close": data.index["Close"],
+        "future_close": data.future["Close"],
+    }
+    for instrument, column in columns:
+        arrays[f"{instrument}_{column.lower()}"] = getattr(data, instrument)[column]
+    paths = {}
+    for name, values in arrays.items():
+        path = Path(directory) / f"{name}.npy"
+        np.save(path, values)
+        paths[name] = str(path)
+    return paths
+
+
+def attach_arrays(paths: Dict[str, str], tz: Optional[str] = None) -> AlignedData:
+    """Memory-map arrays written by ``share_arrays`` (read-only, the pages
+    are shared between all processes through the OS page cache).
+    """
+    arrays = {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+    instruments: Dict[str, Dict[str, np.ndarray]] = {"index": {}, "future": {}}
+    for name, values in arrays.items():
+        if name != "timestamps":
+            instrument, column = name.split("_", 1)
+            instruments[instrument][column.capitalize()] = values
+    return AlignedData(
+        timestamps=arrays["timestamps"],
+        index=instruments["index"],
+        future=instruments["future"],
+        tz=tz,
+    )
+
+
+def _init_worker(paths: Dict[str, str], tz: Optional[str], indicator_dir: Optional[str] = None,
+                 execution: Optional[ExecutionModel] = None) -> None:
+    global _worker_data, _worker_indicators, _worker_execution
+    _worker_data = attach_arrays(paths, tz=tz)
+    _worker_indicators = IndicatorCache(directory=indicator_dir)
+    _worker_execution = execution
+
+
+def evaluate(data: AlignedData, threshold: float, window: int, holding_minutes: int,
+             initial_cash: float = 100000.0, indicators: Optional[IndicatorCache] = None,
+             execution: Optional[ExecutionModel] = None) -> Dict[str, float]:
+    """Backtest one parameter combination and summarize it.
+
+    The statistics come from ``compute_performance``, the same as
+    ``Backtester.print_performance``.
+
+    :param indicators: take the momentum from this cache, so combinations
+        that only differ in threshold or holding period share it
+    :param execution: fill the orders with this model
+    """
+    momentum = None
+    if indicators is not None:
+        momentum = indicators.momentum(data.future["Close"], window=window)
+    portfolio = run_vectorized_momentum(
+        data,
+        threshold=threshold,
+        window=window,
+        holding_period=timedelta(minutes=holding_minutes),
+        initial_cash=initial_cash,
+        momentum=momentum,
+        execution=execution,
+    )
+    report = compute_performance(
+        portfolio.completed_trades,
+        initial_capital=initial_cash,
+        final_equity=portfolio.total_equity(current_price=data.index["Close"][-1]),
+    )
+    return {
+        "threshold": threshold,
+        "window": window,
+        "holding_minutes": holding_minutes,
+        "num_trades": report.num_trades,
+        "winners": report.winners,
+        "losers": report.losers,
+        "total_pnl": report.total_pnl,
+        "sharpe": report.sharpe,
+        "sortino": report.sortino,
+        "profit_factor": report.profit_factor,
+        "max_drawdown": report.max_drawdown,
+        "final_equity": report.final_equity,
+    }
+
+
+def _evaluate_in_worker(params: Tuple[float, int, int, float]) -> Dict[str, float]:
+    threshold, window, holding_minutes, initial_cash = params
+    return evaluate(_worker_data, threshold, window, holding_minutes, initial_cash, indicators=_worker_indicators,
+                    execution=_worker_execution)
+
+
+def run_sweep(data: AlignedData, thresholds: Iterable[float], windows: Iterable[int] = (5,),
+              holding_minutes: Iterable[int] = (10,), initial_cash: float = 100000.0,
+              max_workers: Optional[int] = None, indicators: Optional[IndicatorCache] = None,
+              indicator_dir: Optional[str] = None,
+              execution: Optional[ExecutionModel] = None) -> pd.DataFrame:
+    """Backtest every combination of threshold, window and holding period
+    with the vectorized momentum engine.
+
+    The aligned arrays are written once to memory-mapped files that every
+    worker attaches to on start-up; tasks only carry the parameters. The
+    momentum of each window is computed once per process and shared by
+    all combinations using that window.
+
+    :param max_workers: number of worker processes, 1 runs in-process
+    :param indicators: cache used in-process (a new one by default)
+    :param indicator_dir: directory where every process also stores and
+        looks up the momentum series, shared across sweeps and runs
+    :param execution: fill the orders of every combination with this
+        model; its costs are array operations, so they add little to a sweep
+    :return: one row per combination with trade counts, PnL and Sharpe
+    """
+    grid = [(float(t), int(w), int(h), initial_cash)
+            for t, w, h in itertools.product(thresholds, windows, holding_minutes)]
+    if max_workers is None:
+        max_workers = min(len(grid), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        if indicators is None:
+            indicators = IndicatorCache(directory=indicator_dir)
+        rows = [evaluate(data, *params, indicators=indicators, execution=execution) for params in grid]
+    else:
+        with tempfile.TemporaryDirectory(prefix="sweep_") as tmp:
+            columns = execution.columns if execution is not None else ()
+            paths = share_arrays(data, Path(tmp), columns=columns)
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(paths, data.tz, indicator_dir, execution)) as executor:
+                chunksize = max(1, len(grid) // (max_workers * 4))
+                rows = list(executor.map(_evaluate_in_worker, grid, chunksize=chunksize))
+    return pd.DataFrame(rows)
@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+import numpy as np
+import pandas as pd
+
+# Regular US cash session: 09:30 - 16:00, one bar per minute
+SESSION_MINUTES: int = 390
+CSV_COLUMNS = ("Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits")
+
+
+def synthetic_timeline(n_bars: int, start: str = "2020-01-02", offset: int = 0) -> pd.DatetimeIndex:
+    """Return ``n_bars`` 1-minute timestamps covering consecutive business
+    day sessions starting at 09:30 on ``start``.
+
+    :param offset: number of bars to skip, to continue a timeline in chunks
+    """
+    first_day, first_minute = divmod(offset, SESSION_MINUTES)
+    n_days = -(-(first_minute + n_bars) // SESSION_MINUTES)
+    days = pd.bdate_range(start=start, periods=first_day + n_days)[first_day:].as_unit("ns").asi8
+    offsets = (570 + np.arange(SESSION_MINUTES, dtype=np.int64)) * 60 * 1_000_000_000
+    stamps = (days[:, None] + offsets[None, :]).ravel()[first_minute:first_minute + n_bars]
+    return pd.DatetimeIndex(stamps.view("datetime64[ns]"), name="Datetime")
+
+
+def _bars_from_close(close: np.ndarray, rng: np.random.Generator, volume_scale: float) -> pd.DataFrame:
+    """Derive plausible Open/High/Low/Volume columns around a Close path."""
+    n = len(close)
+    open_ = np.empty(n)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    wiggle = np.abs(rng.normal(0.0, 0.0002, size=n)) * close
+    high = np.maximum(open_, close) + wiggle
+    low = np.minimum(open_, close) - wiggle
+    volume = rng.poisson(volume_scale, size=n).astype(np.int64)
+    return pd.DataFrame({
+        "Open": open_,
+        "High": high,
+        "Low": low,
+        "Close": close,
+        "Volume": volume,
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    })
+
+
+def iter_market_data(n_bars: int, seed: int = 42, start: str = "2020-01-02",
+                     start_price: float = 4000.0, volatility: float = 0.0005,
+                     chunk_rows: int = 1_000_000) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Generate seeded index and future minute bars in the same schema as
+    ``data/spx_index.csv`` / ``data/spx_future.csv``, ``chunk_rows`` bars
+    at a time so arbitrarily long series fit in memory.
+
+    The index follows a geometric random walk and the future tracks it
+    with a small basis plus noise, so momentum on the future carries some
+    information about the index like in the real data.
+
+    :param n_bars: total number of 1-minute bars to generate
+    :param seed: seed for the random generator, same seed gives same data
+    :return: iterator of (index_data, future_data) indexed by ``Datetime``
+    """
+    rng = np.random.default_rng(seed)
+    level = np.log(start_price)
+    for offset in range(0, n_bars, chunk_rows):
+        rows = min(chunk_rows, n_bars - offset)
+        times = synthetic_timeline(rows, start=start, offset=offset)
+        log_prices = level + np.cumsum(rng.normal(0.0, volatility, size=rows))
+        level = log_prices[-1]
+        index_close = np.exp(log_prices)
+        future_close = index_close * (1.0 + 0.002) + rng.normal(0.0, 0.25, size=rows)
+        # E-mini trades in quarter points
+        future_close = np.round(future_close * 4.0) / 4.0
+
+        index_data = _bars_from_close(index_close, rng, volume_scale=1e7)
+        future_data = _bars_from_close(future_close, rng, volume_scale=500.0)
+        index_data.index = times
+        future_data.index = times
+        yield index_data, future_data
+
+
+def generate_market_data(n_bars: int, seed: int = 42, **kwargs) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Generate ``n_bars`` synthetic bars in memory (see iter_market_data).
+
+    :return: (index_data, future_data) indexed by ``Datetime``
+    """
+    return next(iter_market_data(n_bars, seed=seed, chunk_rows=max(n_bars, 1), **kwargs))
+
+
+def write_market_data(index_file: Union[str, Path], future_file: Union[str, Path],
+                      n_bars: int, seed: int = 42, chunk_rows: int = 1_000_000, **kwargs) -> None:
+    """Generate synthetic bars and write them as CSV files that
+    ``Backtester.load_data`` can read, one chunk at a time.
+    """
+    chunks = iter_market_data(n_bars, seed=seed, chunk_rows=chunk_rows, **kwargs)
+    for i, (index_data, future_data) in enumerate(chunks):
+        mode, header = ("w", True) if i == 0 else ("a", False)
+        index_data.to_csv(index_file, mode=mode, header=header)
+        future_data.to_csv(future_file, mode=mode, header=header)
+
+
+def write_tick_data(path: Union[str, Path], n_ticks: int, seed: int = 42, start: str = "2020-01-02 09:30",
+                    start_price: float = 4000.0, ticks_per_second: float = 20.0,
+                    chunk_rows: int = 1_000_000) -> None:
+    """Write seeded synthetic E-mini trades (Datetime, Price, Size) as CSV,
+    one chunk at a time. The compression follows the file suffix, e.g.
+    ``ticks.csv.gz``.
+
+    Ticks arrive with exponential gaps, prices move in quarter points and
+    sizes are 1 + Poisson(2) contracts.
+    """
+    rng = np.random.default_rng(seed)
+    time_ns = pd.Timestamp(start).value
+    price = start_price
+    for offset in range(0, n_ticks, chunk_rows):
+        rows = min(chunk_rows, n_ticks - offset)
+        gaps = rng.exponential(1e9 / ticks_per_second, size=rows).astype(np.int64)
+        times = time_ns + np.cumsum(gaps)
+        time_ns = int(times[-1])
+        prices = price + 0.25 * np.cumsum(rng.choice([-1, 0, 0, 1], size=rows))
+        price = float(prices[-1])
+        frame = pd.DataFrame({
+            "Datetime": pd.DatetimeIndex(times.view("datetime64[ns]")),
+            "Price": prices,
+            "Size": 1 + rng.poisson(2.0, size=rows),
+        })
+        frame.to_csv(path, mode="w" if offset == 0 else "a", header=offset == 0, index=False,
+                     compression="infer")
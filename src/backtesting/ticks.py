@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from .market_data import NS_PER_MINUTE, AlignedData, to_int64_ns
+
+PathLike = Union[str, Path]
+
+# Columns of the bars built from ticks, besides the timestamps
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume", "Ticks")
+
+
+def iter_ticks(path: PathLike, chunksize: int = 1_000_000, time_column: str = "Datetime",
+               price_column: str = "Price", size_column: str = "Size",
+               time_unit: str = "ns") -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[str]]]:
+    """Read a tick CSV file ``chunksize`` rows at a time. Compressed files
+    (.gz, .bz2, .xz, .zip, and .zst with zstandard installed) are
+    decompressed on the fly, so they are never unpacked on disk or loaded
+    whole.
+
+    :param time_column: date strings, or integers since the epoch in ``time_unit``
+    :return: iterator of (int64 ns timestamps, float64 prices, float64
+        sizes, tz) chunks; the ticks must be in time order
+    """
+    last = None
+    reader = pd.read_csv(path, usecols=[time_column, price_column, size_column], chunksize=chunksize,
+                         compression="infer")
+    for chunk in reader:
+        column = chunk[time_column]
+        if pd.api.types.is_integer_dtype(column):
+            times = pd.DatetimeIndex(pd.to_datetime(column, unit=time_unit))
+        else:
+            times = pd.DatetimeIndex(pd.to_datetime(column))
+        timestamps = to_int64_ns(times)
+        if len(timestamps) == 0:
+            continue
+        # Equal timestamps are normal for ticks, going back in time is not
+        if np.any(np.diff(timestamps) < 0) or (last is not None and timestamps[0] < last):
+            raise ValueError(f"{path} must be sorted by {time_column} to be streamed")
+        last = timestamps[-1]
+        tz = str(times.tz) if times.tz is not None else None
+        yield (timestamps, chunk[price_column].to_numpy(dtype=np.float64),
+               chunk[size_column].to_numpy(dtype=np.float64), tz)
+
+
+class BarBuilder(ABC):
+    """Builds bars from ticks one chunk at a time.
+
+    Each tick gets the key of the bar it belongs to (``_keys``) and every
+    run of equal keys in a chunk is aggregated at once with ``reduceat``.
+    The last bar of a chunk may continue in the next one, so it is held
+    back (one bar, whatever the chunk size) and merged with the next
+    chunk; ``flush`` returns it at the end of the data.
+
+    A bar is stamped with the time of its last tick.
+    """
+    def __init__(self) -> None:
+        # Open bar carried over to the next chunk: key, time and BAR_COLUMNS
+        self._pending: Optional[Tuple[int, int, Dict[str, float]]] = None
+
+    @abstractmethod
+    def _keys(self, timestamps: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """Bar key of every tick of a chunk, non-decreasing."""
+        pass
+
+    def update(self, timestamps: np.ndarray, prices: np.ndarray,
+               sizes: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Add a chunk of ticks.
+
+        :return: (timestamps, column -> array) of the bars completed by it
+        """
+        if len(timestamps) == 0:
+            return np.empty(0, dtype=np.int64), {name: np.empty(0) for name in BAR_COLUMNS}
+        keys = self._keys(timestamps, sizes)
+        starts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+        ends = np.append(starts[1:], len(keys)) - 1
+        times = timestamps[ends]
+        bars = {
+            "Open": prices[starts],
+            "High": np.maximum.reduceat(prices, starts),
+            "Low": np.minimum.reduceat(prices, starts),
+            "Close": prices[ends],
+            "Volume": np.add.reduceat(sizes, starts),
+            "Ticks": np.diff(np.append(starts, len(keys))).astype(np.float64),
+        }
+
+        if self._pending is not None:
+            key, time, bar = self._pending
+            if key == keys[0]:
+                # The first bar of the chunk continues the held back one
+                bars["Open"][0] = bar["Open"]
+                bars["High"][0] = max(bar["High"], bars["High"][0])
+                bars["Low"][0] = min(bar["Low"], bars["Low"][0])
+                bars["Volume"][0] += bar["Volume"]
+                bars["Ticks"][0] += bar["Ticks"]
+            else:
+                times = np.concatenate(([time], times))
+                bars = {name: np.concatenate(([bar[name]], bars[name])) for name in BAR_COLUMNS}
+
+        self._pending = (int(keys[-1]), int(times[-1]), {name: float(bars[name][-1]) for name in BAR_COLUMNS})
+        return times[:-1], {name: values[:-1] for name, values in bars.items()}
+
+    def flush(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Return the last, held back bar at the end of the data."""
+        if self._pending is None:
+            return np.empty(0, dtype=np.int64), {name: np.empty(0) for name in BAR_COLUMNS}
+        _, time, bar = self._pending
+        self._pending = None
+        return np.array([time], dtype=np.int64), {name: np.array([bar[name]]) for name in BAR_COLUMNS}
+
+
+class TimeBarBuilder(BarBuilder):
+    """Bars of a fixed duration, aligned to multiples of it since the
+    epoch (UTC). Periods without ticks produce no bar.
+
+    :param seconds: duration of a bar
+    """
+    def __init__(self, seconds: float = 60.0) -> None:
+        super().__init__()
+        self._bar_ns = int(round(seconds * 1e9))
+        if self._bar_ns <= 0:
+            raise ValueError("seconds must be positive")
+
+    @classmethod
+    def minutes(cls, minutes: int) -> "TimeBarBuilder":
+        return cls(seconds=minutes * NS_PER_MINUTE / 1e9)
+
+    def _keys(self, timestamps: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        return timestamps // self._bar_ns
+
+
+class VolumeBarBuilder(BarBuilder):
+    """Bars that each trade about ``volume`` contracts: a bar ends with the
+    tick that takes the cumulative volume to (or past) the next multiple of
+    ``volume``. A large tick is not split, so a bar can hold more.
+
+    :param volume: volume per bar
+    """
+    def __init__(self, volume: float) -> None:
+        super().__init__()
+        if volume <= 0:
+            raise ValueError("volume must be positive")
+        self._volume = float(volume)
+        # Volume of all ticks before the current chunk
+        self._traded = 0.0
+
+    def _keys(self, timestamps: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        traded = self._traded + np.cumsum(sizes)
+        self._traded = float(traded[-1])
+        # Bar of a tick = multiples of the bar volume completed before it
+        before = np.concatenate(([traded[0] - sizes[0]], traded[:-1]))
+        return np.floor(before / self._volume).astype(np.int64)
+
+
+def _as_aligned(timestamps: np.ndarray, bars: Dict[str, np.ndarray], tz: Optional[str]) -> AlignedData:
+    # The traded instrument is both the signal and the execution price
+    return AlignedData(timestamps=timestamps, index=bars, future=bars, tz=tz)
+
+
+def iter_tick_bars(path: PathLike, builder: BarBuilder, chunksize: int = 1_000_000,
+                   **columns) -> Iterator[AlignedData]:
+    """Stream a tick file into bars, one block of completed bars per chunk
+    of ticks, so memory is bounded by ``chunksize`` however many ticks the
+    file holds. The bars are used for both the index and the future of the
+    AlignedData blocks: the strategy trades the instrument it watches.
+
+    :param builder: e.g. ``TimeBarBuilder.minutes(1)`` or ``VolumeBarBuilder(500)``
+    :param columns: column names, see ``iter_ticks``
+    """
+    tz = None
+    for timestamps, prices, sizes, tz in iter_ticks(path, chunksize=chunksize, **columns):
+        times, bars = builder.update(timestamps, prices, sizes)
+        if len(times):
+            yield _as_aligned(times, bars, tz)
+    times, bars = builder.flush()
+    if len(times):
+        yield _as_aligned(times, bars, tz)
@@ -2,6 +2,9 @@ from datetime import datetime
 from typing import Optional
 
 class Trade:
+    __slots__ = ("direction", "open_time", "open_price", "size", "close_time", "close_price",
+                 "realized_pnl", "commissions")
+
     def __init__(self, direction: str, open_time: datetime, open_price: float, size: float = 1.0):
         self.direction = direction          # "long" or "short"
         self.open_time = open_time
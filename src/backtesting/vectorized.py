@@ -0,0 +1,190 @@
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .execution import ExecutionModel
+from .market_data import AlignedData
+from .performance import compute_performance
+from .portfolio import Portfolio
+
+# Signal codes used by the array based engines
+BUY: int = 1
+SELL: int = -1
+HOLD: int = 0
+
+
+def rolling_sum(prices: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the trailing ``window`` prices, NaN until the window is full.
+    A 2-D array (time x instrument) is summed per column in one pass.
+
+    The terms are added left to right, like Python's ``sum`` over a price
+    window. The running sums of ``RollingMomentum`` agree with this to
+    floating point tolerance.
+    """
+    n = len(prices)
+    out = np.full(prices.shape, np.nan)
+    if n < window:
+        return out
+    total = prices[:n - window + 1].copy()
+    for offset in range(1, window):
+        total += prices[offset:n - window + 1 + offset]
+    out[window - 1:] = total
+    return out
+
+
+def momentum_series(prices: np.ndarray, window: int = 5) -> np.ndarray:
+    """Momentum for every bar: (X_n - X_n-1) / X_n where X_n is the mean of
+    the last ``window`` prices and X_n-1 the mean of the ``window`` before.
+    NaN until ``2 * window`` prices are available.
+    """
+    current = rolling_sum(prices, window) / float(window)
+    previous = np.full(prices.shape, np.nan)
+    previous[window:] = current[:-window]
+    return (current - previous) / current
+
+
+def momentum_signals(momentum: np.ndarray, threshold: float) -> np.ndarray:
+    """Turn a momentum series into int8 signals (BUY, SELL or HOLD)."""
+    signals = np.zeros(momentum.shape, dtype=np.int8)
+    signals[momentum > threshold] = BUY
+    signals[momentum < -threshold] = SELL
+    return signals
+
+
+def close_positions(timestamps: np.ndarray, holding_ns: int) -> np.ndarray:
+    """For every bar, the bar position at which a position opened on it
+    would close: the first bar at or after open time plus the holding
+    period, or -1 when the data ends before that.
+    """
+    close_at = np.searchsorted(timestamps, timestamps + holding_ns, side="left")
+    close_at[close_at >= len(timestamps)] = -1
+    return close_at
+
+
+def simulate_fixed_holding(timestamps: np.ndarray, signals: np.ndarray, holding_ns: int,
+                           close_at: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate the "one open trade, close after a fixed holding period"
+    rule of the Backtester.
+
+    A position closes on the first bar at or after open time plus the
+    holding period, like the Backtester's expiry scheduler. A new
+    position can open on the same bar another one closes, since expired
+    positions are closed before the strategy is checked.
+
+    :param close_at: result of ``close_positions``, to reuse it for
+        several signal series on the same timeline
+    :return: (open_idx, close_idx) bar positions per trade, close_idx is -1
+        for a position that is still open at the end of the data
+    """
+    n = len(timestamps)
+    if close_at is None:
+        close_at = close_positions(timestamps, holding_ns)
+
+    # next_signal[k] = first bar >= k with a buy/sell signal (n if none)
+    positions = np.where(signals != HOLD, np.arange(n), n)
+    next_signal = np.minimum.accumulate(positions[::-1])[::-1]
+
+    open_idx = []
+    close_idx = []
+    k = next_signal[0] if n else n
+    # Walks trades, not bars: each step jumps to the next possible entry
+    while k < n:
+        open_idx.append(k)
+        c = close_at[k]
+        close_idx.append(c)
+        if c < 0:
+            break
+        k = next_signal[c]
+    return np.asarray(open_idx, dtype=np.int64), np.asarray(close_idx, dtype=np.int64)
+
+
+def run_vectorized_momentum(data: AlignedData, threshold: float = 0.0005, window: int = 5,
+                            holding_period: timedelta = timedelta(minutes=10),
+                            initial_cash: float = 100000.0,
+                            momentum: Optional[np.ndarray] = None,
+                            execution: Optional[ExecutionModel] = None) -> Portfolio:
+    """Backtest the momentum strategy over the whole timeline at once.
+
+    Signals are computed on the future Close, positions are opened and
+    closed at the index Close, exactly like ``Backtester.run``.
+
+    :param momentum: the ``momentum_series`` of the future Close if it is
+        already known, e.g. from an IndicatorCache
+    :param execution: fill the orders with this model instead
+    :return: Portfolio holding the completed trades, cash and any
+        position left open at the end
+    """
+    if momentum is None:
+        momentum = momentum_series(data.future["Close"], window=window)
+    signals = momentum_signals(momentum, threshold)
+    return run_vectorized_signals(data, signals, holding_period=holding_period, initial_cash=initial_cash,
+                                  execution=execution)
+
+
+def timedelta_ns(delta: timedelta) -> int:
+    return delta // timedelta(microseconds=1) * 1000
+
+
+def run_vectorized_signals(data: AlignedData, signals: np.ndarray,
+                           holding_period: timedelta = timedelta(minutes=10),
+                           initial_cash: float = 100000.0,
+                           close_at: Optional[np.ndarray] = None,
+                           execution: Optional[ExecutionModel] = None) -> Portfolio:
+    """Trade precomputed int8 signals with the fixed holding period rule,
+    opening and closing at the index Close.
+
+    :param execution: fill the orders with this model (slippage, spread,
+        delay, volume cap, commission and margin) instead
+    """
+    open_idx, close_idx = simulate_fixed_holding(data.timestamps, signals, timedelta_ns(holding_period),
+                                                 close_at=close_at)
+    if execution is not None:
+        fills = execution.execute(data, open_idx, close_idx, signals[open_idx])
+        return fills.to_portfolio(data, initial_cash=initial_cash, short_margin=execution.short_margin)
+
+    # Replay the (few) trades through the Portfolio so cash, margin and
+    # commissions follow exactly the same arithmetic as the event loop
+    portfolio = Portfolio(initial_cash=initial_cash)
+    times = data.times()
+    open_times = list(times[open_idx])
+    close_times = list(times[np.maximum(close_idx, 0)])
+    prices = data.index["Close"]
+    for i, (k, c) in enumerate(zip(open_idx.tolist(), close_idx.tolist())):
+        portfolio.set_current_time(open_times[i])
+        portfolio.open_position("long" if signals[k] == BUY else "short", prices[k])
+        if c >= 0:
+            portfolio.set_current_time(close_times[i])
+            portfolio.close_position(price=prices[c])
+    return portfolio
+
+
+def compare_executions(data: AlignedData, signals: np.ndarray, models: Dict[str, ExecutionModel],
+                       holding_period: timedelta = timedelta(minutes=10),
+                       initial_cash: float = 100000.0) -> pd.DataFrame:
+    """Backtest the same signals under several execution models side by
+    side. The trades are simulated once and every model only fills them.
+
+    :param models: name -> execution model, e.g. "ideal" -> ExecutionModel()
+    :return: one row per model (indexed by name) with the trade count,
+        PnL, commissions, execution costs, Sharpe, drawdown and final equity
+    """
+    open_idx, close_idx = simulate_fixed_holding(data.timestamps, signals, timedelta_ns(holding_period))
+    direction = signals[open_idx]
+    last_price = data.index["Close"][-1]
+    rows = {}
+    for name, model in models.items():
+        fills = model.execute(data, open_idx, close_idx, direction)
+        portfolio = fills.to_portfolio(data, initial_cash=initial_cash, short_margin=model.short_margin)
+        report = compute_performance(portfolio.completed_trades, initial_capital=initial_cash,
+                                     final_equity=portfolio.total_equity(current_price=last_price))
+        rows[name] = {
+            "num_trades": report.num_trades,
+            "filled_size": float(fills.size.sum()),
+            "total_pnl": report.total_pnl,
+            "commissions": float(fills.commissions.sum()),
+            "execution_costs": float(fills.costs.sum()),
+            "sharpe": report.sharpe,
+            "max_drawdown": report.max_drawdown,
+            "final_equity": report.final_equity,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
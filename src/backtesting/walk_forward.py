@@ -0,0 +1,241 @@
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from . import sweep
+from .equity import equity_from_trades
+from .indicator_cache import IndicatorCache
+from .market_data import AlignedData
+from .performance import compute_performance
+from .vectorized import momentum_series, momentum_signals, run_vectorized_signals
+
+PathLike = Union[str, Path]
+
+# Bump when evaluate() changes so cached results are recomputed
+CACHE_VERSION: int = 1
+
+# Metrics where a lower value is better
+_LOWER_IS_BETTER = {"max_drawdown_duration"}
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Bar positions of one train/test split, ``stop`` exclusive."""
+    number: int
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    """Per-fold metrics and the stitched out-of-sample equity curve."""
+    folds: pd.DataFrame
+    equity: pd.Series
+
+
+def make_folds(n_bars: int, train_bars: int, test_bars: int) -> List[Fold]:
+    """Rolling train/test windows: every fold trains on ``train_bars``
+    bars and tests on the ``test_bars`` bars right after them, and the next
+    fold moves forward by ``test_bars``, so the test windows are contiguous.
+    A last, shorter test window covers the remaining bars.
+    """
+    if train_bars < 1 or test_bars < 1:
+        raise ValueError("train_bars and test_bars must be at least 1")
+    folds = []
+    start = 0
+    while start + train_bars < n_bars:
+        test_start = start + train_bars
+        folds.append(Fold(len(folds), start, test_start, test_start, min(test_start + test_bars, n_bars)))
+        start += test_bars
+    return folds
+
+
+def window_fingerprint(data: AlignedData) -> str:
+    """Hash of the bars a backtest reads, so a cached result is reused for
+    the same window in any run or fold, and never for different data.
+    """
+    digest = hashlib.sha1()
+    for array in (data.timestamps, data.index["Close"], data.future["Close"]):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Summary rows of ``sweep.evaluate`` stored as small JSON files, keyed
+    on the window fingerprint and the parameters.
+    """
+    def __init__(self, directory: PathLike) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, fingerprint: str, params: Tuple) -> Path:
+        key = json.dumps([CACHE_VERSION, fingerprint, list(params)])
+        return self._directory / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def get(self, fingerprint: str, params: Tuple) -> Optional[Dict[str, float]]:
+        path = self._path(fingerprint, params)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def put(self, fingerprint: str, params: Tuple, row: Dict[str, float]) -> None:
+        path = self._path(fingerprint, params)
+        # Write to a temporary file first so a crash never leaves a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(row, f)
+        os.replace(tmp, path)
+
+
+def _evaluate_window_in_worker(task: Tuple[int, int, float, int, int, float]) -> Dict[str, float]:
+    start, stop, threshold, window, holding_minutes, initial_cash = task
+    return sweep.evaluate(sweep._worker_data.slice(start, stop), threshold, window, holding_minutes, initial_cash,
+                          indicators=sweep._worker_indicators)
+
+
+def _search(data: AlignedData, folds: List[Fold], grid: List[Tuple[float, int, int, float]],
+            max_workers: int, cache: Optional[ResultCache]) -> Dict[Tuple[int, Tuple], Dict[str, float]]:
+    """Evaluate every parameter combination on every train window, in one
+    process pool for all folds, skipping the cached ones.
+
+    :return: (fold number, params) -> summary row
+    """
+    results = {}
+    tasks = []
+    fingerprints = {}
+    for fold in folds:
+        if cache is not None:
+            fingerprints[fold.number] = window_fingerprint(data.slice(fold.train_start, fold.train_stop))
+        for params in grid:
+            row = cache.get(fingerprints[fold.number], params) if cache is not None else None
+            if row is None:
+                tasks.append((fold, params))
+            else:
+                results[(fold.number, params)] = row
+
+    work = [(fold.train_start, fold.train_stop, *params) for fold, params in tasks]
+    if max_workers <= 1 or len(work) <= 1:
+        indicators = IndicatorCache()
+        rows = [sweep.evaluate(data.slice(start, stop), *params, indicators=indicators)
+                for start, stop, *params in work]
+    else:
+        with tempfile.TemporaryDirectory(prefix="walk_forward_") as tmp:
+            paths = sweep.share_arrays(data, Path(tmp))
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=sweep._init_worker,
+                                     initargs=(paths, data.tz)) as executor:
+                chunksize = max(1, len(work) // (max_workers * 4))
+                rows = list(executor.map(_evaluate_window_in_worker, work, chunksize=chunksize))
+
+    for (fold, params), row in zip(tasks, rows):
+        results[(fold.number, params)] = row
+        if cache is not None:
+            cache.put(fingerprints[fold.number], params, row)
+    return results
+
+
+def _run_test_window(data: AlignedData, fold: Fold, threshold: float, window: int, holding_minutes: int,
+                     initial_cash: float) -> Tuple[np.ndarray, object]:
+    """Trade the best parameters on the test window. The momentum is
+    computed with the bars before the window as warm-up, so signals are
+    available from its first bar; positions still open at the end are
+    marked to market.
+
+    :return: (equity per test bar, PerformanceReport)
+    """
+    warm_up = min(fold.test_start, 2 * window - 1)
+    prices = data.future["Close"][fold.test_start - warm_up:fold.test_stop]
+    signals = momentum_signals(momentum_series(prices, window=window), threshold)[warm_up:]
+    test = data.slice(fold.test_start, fold.test_stop)
+    portfolio = run_vectorized_signals(test, signals, holding_period=timedelta(minutes=holding_minutes),
+                                       initial_cash=initial_cash)
+    open_trades = [portfolio.open_trade] if portfolio.open_trade is not None else []
+    equity = equity_from_trades(test.timestamps, test.index["Close"], portfolio.completed_trades,
+                                initial_cash, open_trades=open_trades)
+    report = compute_performance(portfolio.completed_trades, initial_capital=initial_cash, equity=equity,
+                                 timestamps=test.timestamps, final_equity=float(equity[-1]))
+    return equity, report
+
+
+def walk_forward(data: AlignedData, train_bars: int, test_bars: int, thresholds: Iterable[float],
+                 windows: Iterable[int] = (5,), holding_minutes: Iterable[int] = (10,),
+                 metric: str = "sharpe", initial_cash: float = 100000.0, max_workers: Optional[int] = None,
+                 cache_dir: Optional[PathLike] = None) -> WalkForwardResult:
+    """Walk-forward optimization of the momentum strategy.
+
+    For every fold (see ``make_folds``) all combinations of threshold,
+    window and holding period are backtested on the train window with the
+    vectorized engine, the combination with the best ``metric`` (a column
+    of ``sweep.evaluate``) is traded on the test window, and the test
+    window equity curves are chained into one out-of-sample curve.
+
+    :param max_workers: processes for the train searches, 1 runs in-process
+    :param cache_dir: memoize the train results there; a result is reused
+        whenever the same parameters meet an identical train window again,
+        e.g. on reruns or after bars are appended to the data. Overlapping
+        but different windows do not share results.
+    :return: per-fold metrics and the out-of-sample equity per test bar
+    """
+    folds = make_folds(len(data), train_bars, test_bars)
+    if not folds:
+        raise ValueError("Not enough bars for a single train and test window")
+    grid = [(float(t), int(w), int(h), initial_cash)
+            for t, w, h in itertools.product(thresholds, windows, holding_minutes)]
+    if max_workers is None:
+        max_workers = min(len(grid) * len(folds), os.cpu_count() or 1)
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    results = _search(data, folds, grid, max_workers, cache)
+
+    sign = -1.0 if metric in _LOWER_IS_BETTER else 1.0
+    rows = []
+    curves = []
+    equity_start = initial_cash
+    for fold in folds:
+        # First best combination in grid order wins ties
+        best = max(grid, key=lambda params: sign * results[(fold.number, params)][metric])
+        threshold, window, holding, _ = best
+        equity, report = _run_test_window(data, fold, threshold, window, holding, initial_cash)
+        # Each test window starts from the equity the previous one ended with
+        curves.append(equity + (equity_start - initial_cash))
+        equity_start = float(curves[-1][-1])
+        times = data.timestamps
+        rows.append({
+            "fold": fold.number,
+            "train_start": times[fold.train_start],
+            "train_end": times[fold.train_stop - 1],
+            "test_start": times[fold.test_start],
+            "test_end": times[fold.test_stop - 1],
+            "threshold": threshold,
+            "window": window,
+            "holding_minutes": holding,
+            f"train_{metric}": results[(fold.number, best)][metric],
+            "num_trades": report.num_trades,
+            "total_pnl": report.total_pnl,
+            "sharpe": report.sharpe,
+            "max_drawdown": report.max_drawdown,
+            "final_equity": equity_start,
+        })
+
+    folds_frame = pd.DataFrame(rows)
+    for column in ("train_start", "train_end", "test_start", "test_end"):
+        folds_frame[column] = _to_times(folds_frame[column].to_numpy(dtype=np.int64), data.tz)
+    test_times = _to_times(data.timestamps[folds[0].test_start:folds[-1].test_stop], data.tz)
+    equity = pd.Series(np.concatenate(curves), index=test_times, name="equity")
+    return WalkForwardResult(folds=folds_frame, equity=equity)
+
+
+def _to_times(timestamps: np.ndarray, tz: Optional[str]) -> pd.DatetimeIndex:
+    times = pd.DatetimeIndex(timestamps.view("datetime64[ns]"), name="Datetime")
+    if tz is not None:
+        times = times.tz_localize("UTC").tz_convert(tz)
+    return times
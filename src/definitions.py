@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 SRC_DIR: Path = Path(os.path.dirname(os.path.abspath(__file__)))
 ROOT_DIR: Path = SRC_DIR.parent
@@ -8,3 +9,14 @@ DATA_DIR: Path = ROOT_DIR / "data"
 # Files
 SPX_INDEX_DATA: Path = DATA_DIR / "spx_index.csv"
 SPX_FUTURE_DATA: Path = DATA_DIR / "spx_future.csv"
+
+# Instrument name -> CSV file, for loading several instruments into a DataPanel
+INSTRUMENT_FILES: Dict[str, Path] = {
+    "spx_index": SPX_INDEX_DATA,
+    "spx_future": SPX_FUTURE_DATA,
+}
+# (index, future) pairs traded by the momentum strategy
+INSTRUMENT_PAIRS: List[Tuple[str, str]] = [("spx_index", "spx_future")]
+
+# Binary cache of aligned market data (see backtesting.data_cache)
+DATA_CACHE_DIR: Path = DATA_DIR / ".cache"
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.bootstrap import bootstrap_returns, bootstrap_trades
+from src.backtesting.performance import compute_performance, drawdown, sharpe_ratio
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+@pytest.fixture(scope="module")
+def backtester():
+    backtester = Backtester(strategy=MomentumStrategy(threshold=0.0003), engine="array", reporter=SilentReporter())
+    backtester.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    backtester.run()
+    return backtester
+
+
+def test_observed_matches_performance(backtester):
+    ledger = backtester._portfolio.completed_trades
+    result = bootstrap_trades(ledger, n_resamples=10)
+    report = compute_performance(ledger)
+
+    assert result.observed["sharpe"] == report.sharpe
+    assert result.observed["max_drawdown"] == pytest.approx(report.max_drawdown)
+    assert result.observed["final_equity"] == pytest.approx(100000.0 + (ledger.realized_pnl - ledger.commissions).sum())
+
+
+def test_seeded_and_independent_of_workers(backtester):
+    ledger = backtester._portfolio.completed_trades
+    # Small batches, so the resamples are spread over several tasks
+    one = bootstrap_trades(ledger, n_resamples=250, seed=7, max_workers=1, batch_elements=20 * len(ledger))
+    two = bootstrap_trades(ledger, n_resamples=250, seed=7, max_workers=2, batch_elements=20 * len(ledger))
+    other = bootstrap_trades(ledger, n_resamples=250, seed=8, max_workers=1, batch_elements=20 * len(ledger))
+
+    assert one.n_resamples == 250
+    assert one.samples().equals(two.samples())
+    assert not one.samples().equals(other.samples())
+
+
+def test_statistics_of_one_resample_match_reference():
+    pnls = np.random.default_rng(3).normal(1.0, 10.0, size=200)
+    result = bootstrap_trades(pnls, commissions=np.full(200, 4.0), n_resamples=1, method="iid", seed=1)
+
+    # Recompute the resample from the same random positions
+    positions = np.random.default_rng(np.random.SeedSequence(1).spawn(1)[0]).integers(0, 200, size=(1, 200))[0]
+    sample = pnls[positions]
+    equity = np.concatenate(([100000.0], 100000.0 + np.cumsum(sample - 4.0)))
+    assert result.sharpe[0] == pytest.approx(sharpe_ratio(sample / 100000.0))
+    assert result.max_drawdown[0] == pytest.approx(drawdown(equity)[0])
+    assert result.final_equity[0] == pytest.approx(equity[-1])
+
+
+def test_shuffle_and_whole_series_blocks_keep_the_total():
+    pnls = np.random.default_rng(4).normal(0.0, 10.0, size=500)
+    shuffled = bootstrap_trades(pnls, n_resamples=200, method="shuffle")
+    # A single circular block of the whole series is a rotation of it
+    rotated = bootstrap_trades(pnls, n_resamples=200, method="block", block_size=500)
+
+    for result in (shuffled, rotated):
+        assert np.allclose(result.final_equity, result.observed["final_equity"])
+        assert (result.max_drawdown <= 0).all()
+    assert np.allclose(shuffled.sharpe, shuffled.observed["sharpe"])
+    assert shuffled.max_drawdown.std() > 0
+
+    intervals = bootstrap_trades(pnls, n_resamples=500, method="block", block_size=10).confidence_intervals(0.9)
+    assert list(intervals.index) == ["sharpe", "max_drawdown", "final_equity"]
+    assert (intervals["lower"] <= intervals["upper"]).all()
+    assert intervals.loc["final_equity", "lower"] < intervals.loc["final_equity", "observed"] < \
+        intervals.loc["final_equity", "upper"]
+
+
+def test_bootstrap_returns_of_equity_curve(backtester):
+    equity = backtester.equity_curve()["equity"]
+    result = bootstrap_returns(equity, n_resamples=100, method="iid")
+    returns = equity.to_numpy()[1:] / equity.to_numpy()[:-1] - 1.0
+
+    assert result.observed["final_equity"] == pytest.approx(equity.iloc[-1])
+    assert result.observed["sharpe"] == sharpe_ratio(returns)
+    assert result.observed["max_drawdown"] == pytest.approx(drawdown(equity.to_numpy())[0])
+    assert len(result.samples()) == 100
+
+    with pytest.raises(ValueError):
+        bootstrap_returns(equity, method="jackknife")
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.checkpoint import load_new_bars, mark_source
+from src.backtesting.indicator_cache import IndicatorCache
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def _lines(path):
+    return open(path).read().splitlines(keepends=True)
+
+
+def _split(rows):
+    """Header and the rows of both bundled files up to and after the time
+    of common bar ``rows``.
+    """
+    cut = pd.Timestamp(AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA).timestamps[rows - 1])
+    parts = []
+    for source in (SPX_INDEX_DATA, SPX_FUTURE_DATA):
+        lines = _lines(source)
+        k = 1 + sum(pd.Timestamp(line.split(",", 1)[0]) <= cut for line in lines[1:])
+        parts.append((lines[:k], lines[k:]))
+    return parts
+
+
+def _write_head(tmp_path, rows):
+    """Copies of the bundled files up to common bar ``rows``."""
+    paths = []
+    for source, (head, _) in zip((SPX_INDEX_DATA, SPX_FUTURE_DATA), _split(rows)):
+        path = tmp_path / source.name
+        path.write_text("".join(head))
+        paths.append(path)
+    return paths
+
+
+def _append_rest(paths, rows):
+    for path, (_, rest) in zip(paths, _split(rows)):
+        with open(path, "a") as f:
+            f.write("".join(rest))
+
+
+def _backtester(engine="array"):
+    return Backtester(strategy=MomentumStrategy(), engine=engine, reporter=SilentReporter())
+
+
+def _trades(backtester):
+    return [(t.direction, t.open_time, t.close_time, t.realized_pnl) for t in backtester._portfolio.completed_trades]
+
+
+@pytest.mark.parametrize("engine,rows", [("array", 1234), ("array", 2000), ("event", 1500)])
+def test_incremental_run_matches_full_run(tmp_path, engine, rows):
+    full = _backtester(engine)
+    full.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    full.run()
+
+    index_file, future_file = _write_head(tmp_path, rows)
+    checkpoint = tmp_path / "state.ckpt"
+    assert _backtester(engine).run_incremental(index_file, future_file, checkpoint) == rows
+    _append_rest((index_file, future_file), rows)
+    resumed = _backtester(engine)
+    assert resumed.run_incremental(index_file, future_file, checkpoint) == len(full._times) - rows
+
+    assert _trades(resumed) == _trades(full)
+    assert resumed._portfolio.cash == full._portfolio.cash
+    assert np.array_equal(resumed.equity_curve()["equity"].to_numpy(), full.equity_curve()["equity"].to_numpy())
+    assert {day: stats["daily_pnl"] for day, stats in resumed.daily_stats.items()} == \
+        {day: stats["daily_pnl"] for day, stats in full.daily_stats.items()}
+    assert resumed.performance().sharpe == full.performance().sharpe
+
+
+def test_no_new_bars(tmp_path):
+    index_file, future_file = _write_head(tmp_path, 500)
+    checkpoint = tmp_path / "state.ckpt"
+    _backtester().run_incremental(index_file, future_file, checkpoint)
+    assert _backtester().run_incremental(index_file, future_file, checkpoint) == 0
+
+
+def _marks(paths, after):
+    return tuple(mark_source(path, upto=after) for path in paths)
+
+
+def test_only_new_rows_are_parsed(tmp_path):
+    full = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    after = int(full.timestamps[999])
+    # Both files already hold rows after the checkpoint time when marked
+    index_file, future_file = _write_head(tmp_path, 1500)
+    marks = _marks((index_file, future_file), after)
+    _append_rest((index_file, future_file), 1500)
+    expected = full.slice(1000, None)
+
+    new = load_new_bars(index_file, future_file, after=after, marks=marks)
+    assert np.array_equal(new.timestamps, expected.timestamps)
+    assert np.array_equal(new.index["Close"], expected.index["Close"])
+
+    # Rows before the mark are never read again
+    for path in (index_file, future_file):
+        lines = _lines(path)
+        lines[5] = lines[5].replace(",", ",9", 1)
+        path.write_text("".join(lines))
+    assert np.array_equal(load_new_bars(index_file, future_file, after=after, marks=marks).timestamps,
+                          expected.timestamps)
+
+
+def test_rewritten_file_is_read_in_full(tmp_path):
+    full = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    after = int(full.timestamps[999])
+    index_file, future_file = _write_head(tmp_path, 1000)
+    marks = _marks((index_file, future_file), after)
+    _append_rest((index_file, future_file), 1000)
+    # A longer first row moves every later row: the marks are not valid anymore
+    lines = _lines(index_file)
+    lines[1] = lines[1].replace(",", ",0000", 1)
+    index_file.write_text("".join(lines))
+
+    new = load_new_bars(index_file, future_file, after=after, marks=marks)
+    assert np.array_equal(new.timestamps, full.timestamps[1000:])
+    assert np.array_equal(new.index["Close"], full.index["Close"][1000:])
+
+
+def test_mark_finds_last_row_before_time(tmp_path):
+    path = tmp_path / "bars.csv"
+    rows = [f"2024-12-03 09:{m:02d}:00,{m}.0\n" for m in range(30, 60)]
+    path.write_text("Datetime,Close\n" + "".join(rows) + "2024-12-03 10:00:00,1")
+    upto = pd.Timestamp("2024-12-03 09:44").value
+    for block_size in (7, 64, 1 << 16):
+        mark = mark_source(path, upto=upto, block_size=block_size)
+        assert path.read_bytes()[mark.offset:].startswith(b"2024-12-03 09:45:00")
+    assert mark_source(path, upto=0).offset == len("Datetime,Close\n")
+
+
+def test_vectorized_engine_has_no_checkpoints(tmp_path):
+    with pytest.raises(ValueError):
+        _backtester("vectorized").save_checkpoint(tmp_path / "state.ckpt")
+
+
+def test_checkpoint_with_indicator_cache(tmp_path):
+    index_file, future_file = _write_head(tmp_path, 1500)
+    checkpoint = tmp_path / "state.ckpt"
+    cache = IndicatorCache(directory=tmp_path / "indicators")
+    first = Backtester(strategy=MomentumStrategy(indicators=cache), engine="array", reporter=SilentReporter())
+    first.run_incremental(index_file, future_file, checkpoint)
+    assert cache.misses > 0
+
+    _append_rest((index_file, future_file), 1500)
+    resumed = _backtester()
+    resumed.run_incremental(index_file, future_file, checkpoint)
+    restored = resumed._strategy._indicators
+    assert len(restored) == 0 and restored.nbytes == 0
+    assert restored._directory == cache._directory
+
+    full = _backtester()
+    full.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    full.run()
+    assert _trades(resumed) == _trades(full)
@@ -0,0 +1,105 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting import data_cache
+from src.backtesting.backtester import Backtester
+from src.backtesting.data_cache import clear_cache, load_aligned_frames_cached
+from src.backtesting.market_data import load_aligned_frames
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def _copy_data(tmp_path):
+    index_file, future_file = tmp_path / "index.csv", tmp_path / "future.csv"
+    shutil.copy(SPX_INDEX_DATA, index_file)
+    shutil.copy(SPX_FUTURE_DATA, future_file)
+    return index_file, future_file
+
+
+def test_cached_frames_equal_csv_frames(tmp_path):
+    index_file, future_file = _copy_data(tmp_path)
+    cache_dir = tmp_path / "cache"
+    expected_index, expected_future = load_aligned_frames(index_file, future_file)
+
+    cold = load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+    warm = load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+
+    for index_data, future_data in (cold, warm):
+        pd.testing.assert_frame_equal(index_data, expected_index, check_index_type=False)
+        pd.testing.assert_frame_equal(future_data, expected_future, check_index_type=False)
+    assert isinstance(warm[0]["Close"].to_numpy(), np.ndarray)
+
+
+def test_cache_hit_maps_columns_without_copying(tmp_path, monkeypatch):
+    index_file, future_file = _copy_data(tmp_path)
+    cache_dir = tmp_path / "cache"
+    load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+
+    mapped = {}
+    load = np.load
+
+    def recording_load(file, *args, **kwargs):
+        array = load(file, *args, **kwargs)
+        mapped[os.path.basename(file)] = array
+        return array
+    monkeypatch.setattr(np, "load", recording_load)
+    index_data, future_data = load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+
+    assert isinstance(mapped["index_0.npy"], np.memmap)
+    for prefix, frame in (("index", index_data), ("future", future_data)):
+        for i, column in enumerate(frame.columns):
+            assert np.shares_memory(frame[column].to_numpy(), mapped[f"{prefix}_{i}.npy"])
+
+
+def test_cache_hit_skips_csv_parsing(tmp_path, monkeypatch):
+    index_file, future_file = _copy_data(tmp_path)
+    cache_dir = tmp_path / "cache"
+    load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV files should not be parsed on a cache hit")
+    monkeypatch.setattr(data_cache, "load_aligned_frames", fail)
+    load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+
+
+def test_cache_invalidated_when_source_changes(tmp_path):
+    index_file, future_file = _copy_data(tmp_path)
+    cache_dir = tmp_path / "cache"
+    index_data, _ = load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+
+    # Drop the last bar from the index file and bump its mtime
+    lines = index_file.read_text().splitlines(keepends=True)
+    index_file.write_text("".join(lines[:-1]))
+    stat = os.stat(index_file)
+    os.utime(index_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    shorter, _ = load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+    assert len(shorter) == len(index_data) - 1
+
+
+def test_clear_cache(tmp_path):
+    index_file, future_file = _copy_data(tmp_path)
+    cache_dir = tmp_path / "cache"
+    load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+    assert any(cache_dir.iterdir())
+
+    clear_cache(cache_dir, index_file, future_file)
+    assert not any(cache_dir.iterdir())
+    load_aligned_frames_cached(index_file, future_file, cache_dir=cache_dir)
+    clear_cache(cache_dir)
+    assert not cache_dir.exists()
+
+
+def test_backtester_with_cache_gives_same_trades(tmp_path, capsys):
+    index_file, future_file = _copy_data(tmp_path)
+    results = []
+    for cache_dir in (None, tmp_path / "cache", tmp_path / "cache"):
+        backtester = Backtester(strategy=MomentumStrategy(), engine="array")
+        backtester.load_data(index_file=index_file, future_file=future_file, cache_dir=cache_dir)
+        backtester.run()
+        results.append([(t.open_time, t.open_price, t.close_price) for t in backtester._portfolio.completed_trades])
+    capsys.readouterr()
+    assert results[0] == results[1] == results[2]
@@ -0,0 +1,83 @@
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import write_market_data
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def _run(engine: str, index_file, future_file) -> Backtester:
+    backtester = Backtester(strategy=MomentumStrategy(threshold=0.0005), engine=engine)
+    backtester.load_data(index_file=index_file, future_file=future_file)
+    backtester.run()
+    return backtester
+
+
+def _trade_tuples(backtester: Backtester):
+    return [(t.direction, t.open_time, t.open_price, t.close_time, t.close_price, t.realized_pnl, t.commissions)
+            for t in backtester._portfolio.completed_trades]
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        Backtester(strategy=MomentumStrategy(), engine="warp")
+
+
+def test_array_engine_matches_event_engine_on_bundled_data(capsys):
+    event = _run("event", SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    event_out = capsys.readouterr().out
+    array = _run("array", SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    array_out = capsys.readouterr().out
+
+    assert len(event._portfolio.completed_trades) > 0
+    assert _trade_tuples(array) == _trade_tuples(event), "Both engines should produce identical trades"
+    assert array._portfolio.cash == event._portfolio.cash
+    assert array.daily_stats.keys() == event.daily_stats.keys()
+    assert array_out == event_out, "Console output should be identical"
+
+
+def test_array_engine_matches_event_engine_on_synthetic_data(tmp_path, capsys):
+    index_file, future_file = tmp_path / "index.csv", tmp_path / "future.csv"
+    write_market_data(index_file, future_file, n_bars=2000, seed=7)
+
+    event = _run("event", index_file, future_file)
+    array = _run("array", index_file, future_file)
+    capsys.readouterr()
+
+    assert _trade_tuples(array) == _trade_tuples(event)
+    assert array.daily_stats.keys() == event.daily_stats.keys()
+
+
+def test_vectorized_engine_matches_event_engine_on_bundled_data(capsys):
+    event = _run("event", SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    vectorized = _run("vectorized", SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    capsys.readouterr()
+
+    assert _trade_tuples(vectorized) == _trade_tuples(event)
+    assert vectorized._portfolio.cash == event._portfolio.cash
+    assert (vectorized._portfolio.open_trade is None) == (event._portfolio.open_trade is None)
+
+
+def test_vectorized_engine_matches_event_engine_on_synthetic_data(tmp_path, capsys):
+    index_file, future_file = tmp_path / "index.csv", tmp_path / "future.csv"
+    write_market_data(index_file, future_file, n_bars=5000, seed=11)
+
+    event = _run("event", index_file, future_file)
+    vectorized = _run("vectorized", index_file, future_file)
+    capsys.readouterr()
+
+    assert _trade_tuples(vectorized) == _trade_tuples(event)
+    assert vectorized._portfolio.cash == event._portfolio.cash
+
+
+def test_vectorized_engine_requires_momentum_strategy():
+    class HoldStrategy:
+        def update_price(self, future_price: float) -> None:
+            pass
+        def generate_signal(self) -> str:
+            return "hold"
+
+    backtester = Backtester(strategy=HoldStrategy(), engine="vectorized")
+    backtester.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    with pytest.raises(TypeError):
+        backtester.run()
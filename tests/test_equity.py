@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.equity import EquityRecorder
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import generate_market_data, write_market_data
+
+
+class _RecordingBacktester(Backtester):
+    """Backtester that also stores the net liquidation value per bar the
+    slow way, to check the recorder against.
+    """
+    def check_strategy(self):
+        super().check_strategy()
+        self.expected.append((self._portfolio.cash,
+                              self._portfolio.net_liquidation_value(self._current_index_price)))
+
+
+def _data(n_bars: int = 3000, seed: int = 9) -> AlignedData:
+    return AlignedData.from_frames(*generate_market_data(n_bars, seed=seed))
+
+
+@pytest.mark.parametrize("max_positions", [1, 3])
+def test_equity_curve_matches_portfolio_at_every_bar(max_positions):
+    data = _data()
+    backtester = _RecordingBacktester(strategy=MomentumStrategy(threshold=0.0002), engine="array",
+                                      reporter=SilentReporter(), max_positions=max_positions,
+                                      batch_signals=False)
+    backtester.expected = []
+    backtester.load_aligned(data)
+    backtester.run()
+
+    curve = backtester.equity_curve()
+    expected = np.array(backtester.expected)
+    assert len(curve) == len(data)
+    assert (curve.index.as_unit("ns").asi8 == data.timestamps).all()
+    np.testing.assert_allclose(curve["cash"].to_numpy(), expected[:, 0])
+    np.testing.assert_allclose(curve["equity"].to_numpy(), expected[:, 1])
+    assert set(np.unique(curve["position"])) <= set(range(-max_positions, max_positions + 1))
+
+
+def test_down_sampling():
+    data = _data()
+    full = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array", reporter=SilentReporter())
+    sampled = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array", reporter=SilentReporter(),
+                         equity_every=60)
+    for backtester in (full, sampled):
+        backtester.load_aligned(data)
+        backtester.run()
+
+    assert len(sampled.equity_curve()) == -(-len(data) // 60)
+    assert sampled.equity_curve().equals(full.equity_curve().iloc[::60])
+
+
+def test_stream_records_same_curve_as_run(tmp_path, capsys):
+    index_file, future_file = tmp_path / "index.csv", tmp_path / "future.csv"
+    write_market_data(index_file, future_file, n_bars=2500, seed=4)
+
+    loaded = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array", equity_every=7)
+    loaded.load_data(index_file, future_file)
+    loaded.run()
+    streamed = Backtester(strategy=MomentumStrategy(threshold=0.0002), equity_every=7)
+    streamed.run_stream(index_file, future_file, chunksize=300)
+    capsys.readouterr()
+
+    assert streamed.equity_curve().equals(loaded.equity_curve())
+
+
+def test_recorder_grows_without_reserve():
+    recorder = EquityRecorder(initial_cash=100.0, capacity=1)
+    recorder.on_change(2, 90.0, 0.0, 1.0, 10.0)
+    recorder.extend(0, np.arange(5, dtype=np.int64), np.full(5, 12.0))
+
+    assert recorder.cash.tolist() == [100.0, 100.0, 90.0, 90.0, 90.0]
+    assert recorder.equity.tolist() == [100.0, 100.0, 92.0, 92.0, 92.0]
+
+
+def test_equity_curve_disabled():
+    backtester = Backtester(strategy=MomentumStrategy(), equity_every=None)
+    with pytest.raises(ValueError):
+        backtester.equity_curve()
+
+
+def test_stream_does_not_record_by_default(tmp_path, capsys):
+    index_file, future_file = tmp_path / "index.csv", tmp_path / "future.csv"
+    write_market_data(index_file, future_file, n_bars=1000, seed=4)
+
+    streamed = Backtester(strategy=MomentumStrategy(threshold=0.0002))
+    streamed.run_stream(index_file, future_file, chunksize=300)
+    loaded = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array")
+    loaded.load_data(index_file, future_file)
+    loaded.run()
+    capsys.readouterr()
+
+    with pytest.raises(ValueError):
+        streamed.equity_curve()
+    assert len(loaded.equity_curve()) == 1000
+
+
+def test_vectorized_engine_does_not_reserve_equity():
+    backtester = Backtester(strategy=MomentumStrategy(), engine="vectorized", reporter=SilentReporter())
+    backtester.load_aligned(_data())
+    assert backtester._equity._capacity < 3000
+
+
+def test_final_equity_includes_short_margin():
+    data = _data()
+    # Cut the data while a short position is open
+    for n_bars in range(500, len(data)):
+        backtester = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array",
+                                reporter=SilentReporter())
+        backtester.load_aligned(data.slice(0, n_bars))
+        backtester.run()
+        trade = backtester._portfolio.open_trade
+        if trade is not None and trade.direction == "short":
+            break
+    assert backtester._portfolio.margin > 0
+
+    report = backtester.performance()
+    assert report.final_equity == pytest.approx(backtester.equity_curve()["equity"].iloc[-1])
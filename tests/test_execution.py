@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.execution import ExecutionModel, FillModel, FixedSlippage, HighLowSpread, PercentageSlippage
+from src.backtesting.market_data import AlignedData
+from src.backtesting.portfolio import Portfolio
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.sweep import run_sweep
+from src.backtesting.vectorized import (BUY, SELL, compare_executions, momentum_series, momentum_signals,
+                                        run_vectorized_momentum)
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+@pytest.fixture(scope="module")
+def data():
+    return AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+
+
+def _bars(n=10):
+    close = 100.0 + np.arange(n, dtype=np.float64)
+    bars = {"Close": close, "High": close + 1.0, "Low": close - 1.0, "Volume": np.full(n, 5.0)}
+    return AlignedData(timestamps=np.arange(n, dtype=np.int64) * 60_000_000_000, index=bars, future=bars)
+
+
+def test_default_model_matches_replay(data):
+    replayed = run_vectorized_momentum(data)
+    filled = run_vectorized_momentum(data, execution=ExecutionModel())
+
+    assert [(t.direction, t.open_time, t.open_price, t.close_price, t.realized_pnl, t.commissions)
+            for t in filled.completed_trades] == \
+        [(t.direction, t.open_time, t.open_price, t.close_price, t.realized_pnl, t.commissions)
+         for t in replayed.completed_trades]
+    assert filled.cash == pytest.approx(replayed.cash, abs=1e-6)
+    assert filled.margin == pytest.approx(replayed.margin)
+
+
+def test_costs_are_paid_on_both_sides():
+    data = _bars()
+    model = ExecutionModel(fills=[FixedSlippage(0.5), PercentageSlippage(0.01), HighLowSpread(0.5)])
+    fills = model.execute(data, np.array([1, 5]), np.array([3, 7]), np.array([BUY, SELL]))
+
+    # Per unit: 0.5 points, 1% of the Close and half of half the 2.0 range
+    open_cost = 0.5 + 0.01 * np.array([101.0, 105.0]) + 0.5
+    close_cost = 0.5 + 0.01 * np.array([103.0, 107.0]) + 0.5
+    assert np.allclose(fills.open_price, [101.0 + open_cost[0], 105.0 - open_cost[1]])
+    assert np.allclose(fills.close_price, [103.0 - close_cost[0], 107.0 + close_cost[1]])
+    assert np.allclose(fills.costs, open_cost + close_cost)
+    assert np.allclose(fills.realized_pnl, [2.0, -2.0] - (open_cost + close_cost))
+
+
+def test_delay_and_volume_cap():
+    data = _bars()
+    data.future["Volume"] = np.array([5.0, 5.0, 0.0, 5.0, 5.0, 5.0, 5.0, 5.0, 5.0, 5.0])
+    model = ExecutionModel(delay=2, volume_cap=0.1)
+    fills = model.execute(data, np.array([0, 4, 8]), np.array([3, 7, -1]), np.array([BUY, BUY, SELL]))
+
+    # The first order fills on bar 2, which has no volume, the last one after the end of the data
+    assert fills.open_bar.tolist() == [6]
+    assert fills.close_bar.tolist() == [9]
+    assert fills.size.tolist() == [0.5]
+
+    fills = ExecutionModel(delay=2).execute(data, np.array([5]), np.array([8]), np.array([SELL]))
+    # Closing on bar 10 is past the end: the position stays open
+    assert fills.close_bar.tolist() == [-1]
+    portfolio = fills.to_portfolio(data, initial_cash=1000.0, short_margin=0.25)
+    assert len(portfolio.completed_trades) == 0
+    assert portfolio.open_trade.open_price == 107.0
+    assert portfolio.margin == 0.25 * 107.0
+    assert portfolio.cash == 1000.0 - 2.0 - portfolio.margin
+
+
+def test_configurable_short_margin():
+    portfolio = Portfolio(initial_cash=1000.0, short_margin=1.0)
+    portfolio.open_position("short", 100.0, size=2.0)
+    assert portfolio.margin == 200.0
+    portfolio.close_position(90.0)
+    assert portfolio.margin == 0.0
+    assert portfolio.cash == 1000.0 - 4.0 + 20.0
+
+
+def test_compare_executions(data):
+    signals = momentum_signals(momentum_series(data.future["Close"]), 0.0005)
+    models = {
+        "ideal": ExecutionModel(),
+        "slippage": ExecutionModel(fills=[FixedSlippage(0.25)]),
+        "spread+delay": ExecutionModel(fills=[HighLowSpread()], delay=1),
+    }
+    table = compare_executions(data, signals, models)
+
+    assert list(table.index) == list(models)
+    assert table.loc["ideal", "execution_costs"] == 0.0
+    assert table.loc["slippage", "execution_costs"] == pytest.approx(0.5 * table.loc["slippage", "filled_size"])
+    assert table.loc["slippage", "total_pnl"] == pytest.approx(
+        table.loc["ideal", "total_pnl"] - table.loc["slippage", "execution_costs"])
+    for name, model in models.items():
+        portfolio = run_vectorized_momentum(data, execution=model)
+        assert table.loc[name, "num_trades"] == len(portfolio.completed_trades)
+
+
+def test_backtester_and_sweep_use_the_model(data):
+    model = ExecutionModel(fills=[HighLowSpread()], delay=1, volume_cap=0.5)
+    backtester = Backtester(strategy=MomentumStrategy(), engine="vectorized", reporter=SilentReporter(),
+                            execution=model)
+    backtester.load_aligned(data)
+    backtester.run()
+    expected = run_vectorized_momentum(data, execution=model)
+    assert backtester._portfolio.cash == expected.cash
+
+    sequential = run_sweep(data, thresholds=[0.0005], holding_minutes=[5, 10], max_workers=1, execution=model)
+    parallel = run_sweep(data, thresholds=[0.0005], holding_minutes=[5, 10], max_workers=2, execution=model)
+    assert parallel.equals(sequential)
+    assert sequential.loc[1, "total_pnl"] == pytest.approx(sum(t.realized_pnl for t in expected.completed_trades))
+
+    with pytest.raises(ValueError):
+        Backtester(strategy=MomentumStrategy(), engine="array", execution=model)
+
+
+def test_fill_model_needs_costs():
+    class NoCosts(FillModel):
+        pass
+
+    with pytest.raises(TypeError):
+        NoCosts()
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.indicator_cache import IndicatorCache
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.sweep import run_sweep
+from src.backtesting.vectorized import momentum_series
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+@pytest.fixture(scope="module")
+def data():
+    return AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+
+
+def test_momentum_is_computed_once(data):
+    cache = IndicatorCache()
+    prices = data.future["Close"]
+    first = cache.momentum(prices, window=5)
+    again = cache.momentum(prices.copy(), window=5)
+
+    np.testing.assert_array_equal(first, momentum_series(prices, window=5))
+    assert again is first
+    # Momentum and the rolling mean it is built on
+    assert cache.misses == 2 and cache.hits == 1
+    assert not first.flags.writeable
+
+
+def test_different_data_or_window_is_not_shared(data):
+    cache = IndicatorCache()
+    prices = data.future["Close"]
+    cache.momentum(prices, window=5)
+    cache.momentum(prices, window=10)
+    cache.momentum(prices[:-1], window=5)
+    cache.momentum(prices, window=5, instrument="other")
+    assert cache.hits == 0 and len(cache) == 8
+
+
+def test_lru_eviction(data):
+    prices = data.future["Close"]
+    cache = IndicatorCache(max_bytes=2 * prices.nbytes)
+    cache.rolling_mean(prices, 3)
+    cache.rolling_mean(prices, 4)
+    cache.rolling_mean(prices, 3)  # Most recently used again
+    cache.rolling_mean(prices, 5)
+    assert cache.nbytes <= 2 * prices.nbytes
+    cache.rolling_mean(prices, 3)
+    assert cache.hits == 2
+    cache.rolling_mean(prices, 4)
+    assert cache.misses == 4
+
+
+def test_disk_cache_is_shared_between_caches(tmp_path, data):
+    prices = data.future["Close"]
+    expected = IndicatorCache(directory=tmp_path).momentum(prices, window=5)
+    other = IndicatorCache(directory=tmp_path)
+    np.testing.assert_array_equal(other.momentum(prices.copy(), window=5), expected)
+    assert other.disk_hits == 1 and other.misses == 0
+
+
+def test_strategies_and_backtests_share_the_cache(data):
+    cache = IndicatorCache()
+    results = []
+    for threshold in (0.0003, 0.0005):
+        backtester = Backtester(strategy=MomentumStrategy(threshold=threshold, indicators=cache),
+                                engine="vectorized", reporter=SilentReporter())
+        backtester.load_aligned(data)
+        backtester.run()
+        reference = Backtester(strategy=MomentumStrategy(threshold=threshold), engine="vectorized",
+                               reporter=SilentReporter())
+        reference.load_aligned(data)
+        reference.run()
+        assert backtester._portfolio.cash == reference._portfolio.cash
+        results.append(len(backtester._portfolio.completed_trades))
+    assert cache.misses == 2 and cache.hits == 1
+
+    # The batch signals of the array engine use it too
+    array = Backtester(strategy=MomentumStrategy(indicators=cache), engine="array", reporter=SilentReporter())
+    array.load_aligned(data)
+    array.run()
+    assert cache.hits == 2
+
+
+def test_sweep_with_indicator_cache(data, tmp_path):
+    plain = run_sweep(data, thresholds=[0.0003, 0.0005], windows=[3, 5], max_workers=1)
+    cache = IndicatorCache()
+    cached = run_sweep(data, thresholds=[0.0003, 0.0005], windows=[3, 5], max_workers=1, indicators=cache)
+    assert plain.equals(cached)
+    assert cache.hits == 2
+
+    parallel = run_sweep(data, thresholds=[0.0003, 0.0005], windows=[3, 5], max_workers=2,
+                         indicator_dir=str(tmp_path))
+    assert plain.equals(parallel)
+    assert len(list(tmp_path.glob("*.npy"))) == 4
@@ -0,0 +1,54 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.backtesting.indicators import RollingMomentum
+
+
+def _reference_momentum(prices, window):
+    """The original deque/list based MomentumStrategy.compute_momentum."""
+    window_prices = deque(maxlen=2 * window)
+    values = []
+    for price in prices:
+        window_prices.append(price)
+        if len(window_prices) < 2 * window:
+            values.append(None)
+            continue
+        prices_list = list(window_prices)
+        x_n = sum(prices_list[window:]) / float(window)
+        x_n_1 = sum(prices_list[:window]) / float(window)
+        values.append((x_n - x_n_1) / x_n)
+    return values
+
+
+@pytest.mark.parametrize("window", [1, 5, 17, 500])
+def test_matches_reference_implementation(window):
+    prices = 6000.0 + np.cumsum(np.random.default_rng(window).normal(0.0, 1.0, size=3000))
+    expected = _reference_momentum(prices.tolist(), window)
+    indicator = RollingMomentum(window=window)
+
+    for price, value in zip(prices.tolist(), expected):
+        indicator.push(price)
+        if value is None:
+            assert not indicator.ready
+        else:
+            assert indicator.ready
+            assert indicator.value == pytest.approx(value, rel=1e-9, abs=1e-12)
+
+
+def test_resync_keeps_sums_exact():
+    prices = 6000.0 + np.cumsum(np.random.default_rng(1).normal(0.0, 1.0, size=1000))
+    indicator = RollingMomentum(window=5, resync_every=9)
+    for price in prices.tolist():
+        indicator.push(price)
+
+    buffered = indicator.prices()
+    assert buffered.tolist() == prices[-10:].tolist()
+    assert indicator._previous_sum == buffered[:5].sum()
+    assert indicator._current_sum == buffered[5:].sum()
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        RollingMomentum(window=0)
@@ -0,0 +1,65 @@
+import pstats
+
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.instrumentation import Instrumentation
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import generate_market_data, write_market_data
+
+
+def _trades(backtester: Backtester):
+    return [(t.direction, t.open_time, t.close_time, t.realized_pnl) for t in backtester._portfolio.completed_trades]
+
+
+@pytest.mark.parametrize("batch_signals", [True, False])
+def test_phases_are_recorded_without_changing_results(batch_signals, capsys):
+    data = AlignedData.from_frames(*generate_market_data(3000, seed=6))
+    plain = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array", batch_signals=batch_signals)
+    instrumentation = Instrumentation()
+    measured = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array",
+                          batch_signals=batch_signals, instrumentation=instrumentation)
+    for backtester in (plain, measured):
+        backtester.load_aligned(data)
+        backtester.run()
+    plain_out, measured_out = capsys.readouterr().out.split("Data aligned")[1:]
+
+    assert _trades(measured) == _trades(plain)
+    assert measured_out == plain_out
+
+    run, = instrumentation.runs
+    assert run.method == "run"
+    assert run.bars == len(data)
+    assert run.bars_per_second > 0 and run.peak_rss_mb > 0
+    phases = instrumentation.phases()
+    assert {"load", "data", "strategy", "portfolio", "reporting", "performance", "loop"} <= set(phases.index)
+    assert phases.loc["data", "calls"] == len(data) + 1
+    assert phases.loc["portfolio", "calls"] == 2 * len(measured._portfolio.completed_trades) + \
+        (measured._portfolio.open_trade is not None)
+    # Exclusive times add up to the run time
+    assert phases.drop(index="load")["seconds"].sum() == pytest.approx(run.seconds, rel=0.05)
+    assert "bars/s" in instrumentation.report()
+
+
+def test_stream_run_with_memory_tracing_and_profile(tmp_path):
+    index_file, future_file = tmp_path / "index.csv", tmp_path / "future.csv"
+    write_market_data(index_file, future_file, n_bars=1500, seed=3)
+    instrumentation = Instrumentation(trace_memory=True, profile_dir=tmp_path / "profiles")
+    backtester = Backtester(strategy=MomentumStrategy(threshold=0.0002), reporter=SilentReporter(),
+                            instrumentation=instrumentation)
+    backtester.run_stream(index_file, future_file, chunksize=500)
+
+    run, = instrumentation.runs
+    assert run.method == "run_stream"
+    assert run.bars == 1500
+    assert run.peak_traced_mb > 0
+    stats = pstats.Stats(run.profile_path)
+    assert any(function == "_on_bar" for _, _, function in stats.stats)
+
+
+def test_disabled_instrumentation_leaves_methods_alone():
+    backtester = Backtester(strategy=MomentumStrategy())
+    assert "next" not in vars(backtester)
+    assert backtester.instrumentation is None
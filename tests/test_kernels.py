@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.kernels import run_kernel_momentum
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import generate_market_data
+from src.backtesting.vectorized import momentum_series, run_vectorized_momentum
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def _trade_tuples(portfolio):
+    return [(t.direction, t.open_time, t.open_price, t.close_time, t.close_price, t.realized_pnl, t.commissions)
+            for t in portfolio.completed_trades]
+
+
+def _run(engine: str, data: AlignedData, threshold: float = 0.0005) -> Backtester:
+    backtester = Backtester(strategy=MomentumStrategy(threshold=threshold), engine=engine,
+                            reporter=SilentReporter())
+    backtester.load_aligned(data)
+    backtester.run()
+    return backtester
+
+
+@pytest.mark.parametrize("source", ["bundled", "synthetic"])
+def test_jit_engine_matches_reference_engine(source, capsys):
+    if source == "bundled":
+        data = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    else:
+        data = AlignedData.from_frames(*generate_market_data(20_000, seed=21))
+    reference = _run("array", data, threshold=0.0002)
+    jit = _run("jit", data, threshold=0.0002)
+    capsys.readouterr()
+
+    assert len(reference._portfolio.completed_trades) > 0
+    assert _trade_tuples(jit._portfolio) == _trade_tuples(reference._portfolio)
+    assert jit._portfolio.cash == reference._portfolio.cash
+    assert jit.performance().final_equity == reference.performance().final_equity
+
+
+def test_kernel_resumes_when_trade_buffer_is_full():
+    data = AlignedData.from_frames(*generate_market_data(5000, seed=8))
+    small = run_kernel_momentum(data, threshold=0.0002, batch_trades=7)
+    vectorized = run_vectorized_momentum(data, threshold=0.0002)
+
+    assert len(small.completed_trades) > 7
+    assert _trade_tuples(small) == _trade_tuples(vectorized)
+    assert small.cash == vectorized.cash
+    assert (small.open_trade is None) == (vectorized.open_trade is None)
+    if small.open_trade is not None:
+        assert small.open_trade.open_time == vectorized.open_trade.open_time
+        assert small.margin == vectorized.margin
+
+
+def test_jit_engine_rejects_several_positions():
+    with pytest.raises(ValueError):
+        Backtester(strategy=MomentumStrategy(), engine="jit", max_positions=2)
+
+
+def test_per_tick_momentum_matches_batch_signals_to_tolerance():
+    data = AlignedData.from_frames(*generate_market_data(20_000, seed=21))
+    # The per-tick running sums only agree with the batch signals (and the
+    # kernel) to floating point tolerance
+    strategy = MomentumStrategy()
+    per_tick = []
+    for price in data.future["Close"]:
+        strategy.update_price(price)
+        per_tick.append(strategy.compute_momentum() if strategy.can_compute_momentum() else np.nan)
+    assert np.allclose(np.array(per_tick), momentum_series(data.future["Close"]), rtol=1e-9, atol=1e-15,
+                       equal_nan=True)
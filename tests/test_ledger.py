@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.ledger import LONG, SHORT, TradeLedger, TradeView
+from src.backtesting.trade import Trade
+
+
+def _closed_trade(direction: str, open_price: float, close_price: float, minute: int = 0) -> Trade:
+    trade = Trade(direction=direction, open_time=datetime(2024, 12, 3, 9, 30 + minute), open_price=open_price)
+    trade.commissions = 4.0
+    trade.close_trade(close_time=datetime(2024, 12, 3, 9, 40 + minute), close_price=close_price)
+    return trade
+
+
+def test_trade_has_no_instance_dict():
+    trade = Trade(direction="long", open_time=datetime(2024, 12, 3, 9, 30), open_price=5000.0)
+    assert not hasattr(trade, "__dict__"), "Trade should use __slots__"
+
+
+def test_append_and_view_round_trip():
+    ledger = TradeLedger()
+    trade = _closed_trade("short", 5000.0, 4900.0)
+    ledger.append(trade)
+
+    view = ledger[0]
+    assert isinstance(view, TradeView)
+    for field in ("direction", "open_time", "open_price", "close_time", "close_price", "size",
+                  "realized_pnl", "commissions"):
+        assert getattr(view, field) == getattr(trade, field), f"{field} should round trip"
+    assert ledger[-1].realized_pnl == 100.0
+    with pytest.raises(IndexError):
+        ledger[1]
+
+
+def test_ledger_grows_and_exposes_columns():
+    ledger = TradeLedger(capacity=2)
+    for i in range(5):
+        ledger.append(_closed_trade("long" if i % 2 == 0 else "short", 5000.0, 5000.0 + i, minute=i))
+
+    assert len(ledger) == 5
+    assert ledger.direction.dtype == np.int8
+    assert ledger.direction.tolist() == [LONG, SHORT, LONG, SHORT, LONG]
+    assert ledger.realized_pnl.tolist() == [0.0, -1.0, 2.0, -3.0, 4.0]
+    assert ledger.open_time.dtype == np.int64
+    assert [t.realized_pnl for t in ledger] == ledger.realized_pnl.tolist()
+
+
+def test_timezone_is_preserved():
+    ledger = TradeLedger()
+    trade = Trade(direction="long", open_time=pd.Timestamp("2024-12-03 09:30", tz="America/New_York"),
+                  open_price=5000.0)
+    trade.close_trade(close_time=pd.Timestamp("2024-12-03 09:40", tz="America/New_York"), close_price=5001.0)
+    ledger.append(trade)
+
+    assert ledger[0].open_time == trade.open_time
+    assert str(ledger[0].open_time.tz) == "America/New_York"
+    assert ledger.to_frame()["close_time"].iloc[0] == trade.close_time
+
+
+def test_to_frame():
+    ledger = TradeLedger.from_trades([_closed_trade("long", 5000.0, 5010.0), _closed_trade("short", 5000.0, 5010.0)])
+    frame = ledger.to_frame()
+    assert frame["direction"].tolist() == ["long", "short"]
+    assert frame["realized_pnl"].tolist() == [10.0, -10.0]
+    assert frame["open_time"].iloc[0] == pd.Timestamp("2024-12-03 09:30")
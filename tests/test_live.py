@@ -0,0 +1,97 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.live import BarFeed, LiveTrader, replay
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import BackgroundReporter, ConsoleReporter, SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def _trades(backtester):
+    return [(t.direction, t.open_time, t.close_time, t.realized_pnl) for t in backtester._portfolio.completed_trades]
+
+
+async def _paper_trade(backtester, data, maxsize=10_000, burst=1, max_batch=1024):
+    feed = BarFeed(maxsize=maxsize)
+    trader = LiveTrader(backtester, feed, max_batch=max_batch)
+    await asyncio.gather(replay(feed, data, burst=burst), trader.run())
+    return feed, trader
+
+
+@pytest.mark.parametrize("burst,maxsize", [(1, 10_000), (500, 64)])
+def test_live_trader_matches_run(burst, maxsize):
+    data = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    loaded = Backtester(strategy=MomentumStrategy(), engine="array", reporter=SilentReporter(), batch_signals=False)
+    loaded.load_aligned(data)
+    loaded.run()
+
+    live = Backtester(strategy=MomentumStrategy(), engine="array", reporter=SilentReporter())
+    feed, trader = asyncio.run(_paper_trade(live, data, maxsize=maxsize, burst=burst))
+
+    assert _trades(live) == _trades(loaded)
+    assert live._portfolio.cash == loaded._portfolio.cash
+    assert np.array_equal(live.equity_curve()["equity"].to_numpy(), loaded.equity_curve()["equity"].to_numpy())
+    assert len(trader.latency) == len(data)
+    # The producer waits for the consumer instead of overfilling the queue
+    assert feed.max_depth <= maxsize
+
+
+def test_bursts_are_processed_in_batches():
+    async def scenario():
+        feed = BarFeed()
+        times = pd.date_range("2024-12-03 09:30", periods=5, freq="min")
+        for t in times:
+            feed.put_nowait(t, 100.0, 101.0)
+        await feed.close()
+        return await feed.get_batch(3), await feed.get_batch(3), await feed.get_batch(3)
+
+    first, second, third = asyncio.run(scenario())
+    assert len(first) == 3 and len(second) == 2 and third == []
+    assert first[0].arrival_ns <= second[-1].arrival_ns
+
+
+def test_latency_percentiles():
+    data = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA).slice(0, 300)
+    live = Backtester(strategy=MomentumStrategy(), engine="array", reporter=SilentReporter())
+    _, trader = asyncio.run(_paper_trade(live, data))
+
+    frame = trader.latency.to_frame()
+    assert len(frame) == 300
+    assert frame.index[0] == pd.Timestamp(data.timestamps[0])
+    assert (frame["latency_us"] >= frame["queue_us"]).all()
+    points = trader.latency.percentiles()["latency_us"]
+    assert points[50.0] <= points[99.0] <= frame["latency_us"].max()
+    assert "p99.9" in trader.latency.report()
+
+
+def test_background_reporter_writes_same_output(capsys):
+    data = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    direct = Backtester(strategy=MomentumStrategy(), engine="array", reporter=ConsoleReporter())
+    asyncio.run(_paper_trade(direct, data))
+    direct_out = capsys.readouterr().out
+
+    background = Backtester(strategy=MomentumStrategy(), engine="array",
+                            reporter=BackgroundReporter(ConsoleReporter()))
+    asyncio.run(_paper_trade(background, data))
+    assert capsys.readouterr().out == direct_out
+
+
+def test_background_reporter_raises_on_close():
+    class Failing(SilentReporter):
+        def on_day_end(self, day_str, trades, daily_pnl):
+            raise RuntimeError("disk full")
+
+    reporter = BackgroundReporter(Failing())
+    reporter.on_day_end("2024-12-03", [], 0.0)
+    with pytest.raises(RuntimeError):
+        reporter.close()
+
+
+def test_vectorized_engine_is_rejected():
+    with pytest.raises(ValueError):
+        LiveTrader(Backtester(strategy=MomentumStrategy(), engine="vectorized"), BarFeed())
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.portfolio import NettingPortfolio, Portfolio
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import generate_market_data
+
+
+def _brute_unrealized(portfolio: NettingPortfolio, price: float) -> float:
+    total = 0.0
+    for trade in portfolio.open_trades:
+        sign = 1.0 if trade.direction == "long" else -1.0
+        total += sign * (price - trade.open_price) * trade.size
+    return total
+
+
+def test_net_position_and_average_cost():
+    portfolio = NettingPortfolio()
+    portfolio.set_current_time(datetime(2024, 12, 3, 9, 30))
+    portfolio.open_position("long", 100.0)
+    portfolio.open_position("long", 110.0, size=3.0)
+
+    position = portfolio.position()
+    assert position.quantity == 4.0
+    assert position.average_cost == pytest.approx(107.5)
+    assert portfolio.get_unrealized_pnl(120.0) == pytest.approx(50.0)
+
+    # Closing defaults to the oldest lot
+    portfolio.close_position(price=120.0)
+    assert position.quantity == 3.0
+    assert position.realized_pnl == pytest.approx(20.0)
+    assert position.average_cost == pytest.approx(110.0)
+
+    portfolio.close_position(price=100.0)
+    assert position.quantity == 0.0
+    assert np.isnan(position.average_cost)
+    assert len(portfolio.completed_trades) == 2
+
+
+def test_incremental_equity_matches_sum_over_lots():
+    rng = np.random.default_rng(1)
+    portfolio = NettingPortfolio(max_positions=50)
+    time = datetime(2024, 12, 3, 9, 30)
+    price = 5000.0
+    for _ in range(2000):
+        time += timedelta(minutes=1)
+        price += rng.normal()
+        portfolio.set_current_time(time)
+        portfolio.mark(price)
+        action = rng.integers(3)
+        if action == 0:
+            portfolio.open_position("long" if rng.random() < 0.5 else "short", price, size=float(rng.integers(1, 4)))
+        elif action == 1 and portfolio.open_trades:
+            lots = portfolio.open_trades
+            portfolio.close_position(price, trade=lots[rng.integers(len(lots))])
+        assert portfolio.equity() == pytest.approx(portfolio.cash + _brute_unrealized(portfolio, price))
+        assert portfolio.total_equity(price + 1.0) == pytest.approx(
+            portfolio.cash + _brute_unrealized(portfolio, price + 1.0))
+
+
+def test_one_lot_matches_portfolio():
+    """With a single lot the cash arithmetic is the same as Portfolio's."""
+    single, netting = Portfolio(), NettingPortfolio(max_positions=1)
+    for portfolio in (single, netting):
+        portfolio.set_current_time(datetime(2024, 12, 3, 9, 30))
+        portfolio.open_position("short", 5000.0)
+        assert not portfolio.can_open()
+    assert netting.total_equity(4990.0) == pytest.approx(single.total_equity(4990.0))
+    for portfolio in (single, netting):
+        portfolio.set_current_time(datetime(2024, 12, 3, 9, 40))
+        portfolio.close_position(price=4990.0)
+    assert netting.cash == pytest.approx(single.cash)
+    assert netting.completed_trades[0].realized_pnl == single.completed_trades[0].realized_pnl
+
+
+def test_instruments_are_tracked_separately():
+    portfolio = NettingPortfolio()
+    portfolio.open_position("long", 100.0, instrument="ES")
+    portfolio.open_position("short", 50.0, instrument="NQ")
+    portfolio.mark(105.0, instrument="ES")
+    portfolio.mark(45.0, instrument="NQ")
+
+    assert portfolio.position("ES").unrealized_pnl == pytest.approx(5.0)
+    assert portfolio.position("NQ").unrealized_pnl == pytest.approx(5.0)
+    assert portfolio.get_unrealized_pnl(110.0, instrument="ES") == pytest.approx(15.0)
+
+
+def test_backtester_scales_into_overlapping_positions():
+    index_data, future_data = generate_market_data(3000, seed=5)
+    backtester = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array",
+                            reporter=SilentReporter(), max_positions=3)
+    backtester.load_aligned(AlignedData.from_frames(index_data, future_data))
+    backtester.run()
+
+    trades = list(backtester._portfolio.completed_trades)
+    assert any(b.open_time < a.close_time for a, b in zip(trades, trades[1:]))
+    for trade in trades:
+        assert trade.close_time - trade.open_time >= timedelta(minutes=10)
+    assert len(backtester._portfolio.open_trades) <= 3
+
+
+def test_vectorized_engine_rejects_several_positions():
+    with pytest.raises(ValueError):
+        Backtester(strategy=MomentumStrategy(), engine="vectorized", max_positions=2)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from src.backtesting.market_data import AlignedData
+from src.backtesting.panel import DataPanel, run_panel_momentum
+from src.backtesting.synthetic import generate_market_data
+from src.backtesting.vectorized import run_vectorized_momentum
+from src.definitions import INSTRUMENT_FILES, INSTRUMENT_PAIRS, SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def _trades(portfolio):
+    return [(t.direction, t.open_time, t.open_price, t.close_time, t.close_price) for t in portfolio.completed_trades]
+
+
+def test_panel_from_csv_matches_pairwise_alignment():
+    panel = DataPanel.from_csv(INSTRUMENT_FILES)
+    data = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+
+    assert panel.instruments == ["spx_index", "spx_future"]
+    assert panel.columns["Close"].shape == (len(data), 2)
+    assert np.array_equal(panel.timestamps, data.timestamps)
+    assert np.array_equal(panel.series("spx_future"), data.future["Close"])
+
+
+def test_series_are_views_into_the_panel():
+    panel = DataPanel.from_csv(INSTRUMENT_FILES)
+    series = panel.series("spx_index", "High")
+    assert series.flags["C_CONTIGUOUS"]
+    assert np.shares_memory(series, panel.columns["High"])
+    pair = panel.aligned_data("spx_index", "spx_future")
+    assert np.shares_memory(pair.future["Close"], panel.columns["Close"])
+
+
+def test_panel_aligns_on_common_timeline():
+    index = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=pd.DatetimeIndex(["2024-01-01 09:30", "2024-01-01 09:31", "2024-01-01 09:32"], name="Datetime"))
+    future = pd.DataFrame({"Close": [5.0, 6.0]}, index=pd.DatetimeIndex(["2024-01-01 09:32", "2024-01-01 09:31"], name="Datetime"))
+    panel = DataPanel.from_frames({"a": index, "b": future})
+
+    assert len(panel) == 2
+    assert panel.series("a").tolist() == [2.0, 3.0]
+    assert panel.series("b").tolist() == [6.0, 5.0]
+
+
+def test_run_panel_momentum_matches_single_pair_runs():
+    frames = {}
+    pairs = []
+    for i in range(4):
+        index_data, future_data = generate_market_data(3000, seed=i)
+        frames[f"index_{i}"], frames[f"future_{i}"] = index_data, future_data
+        pairs.append((f"index_{i}", f"future_{i}"))
+    panel = DataPanel.from_frames(frames)
+
+    results = run_panel_momentum(panel, pairs)
+    for index, future in pairs:
+        single = run_vectorized_momentum(AlignedData.from_frames(frames[index], frames[future]))
+        assert _trades(results[(index, future)]) == _trades(single)
+
+
+def test_run_panel_momentum_on_bundled_pairs():
+    panel = DataPanel.from_csv(INSTRUMENT_FILES)
+    results = run_panel_momentum(panel, INSTRUMENT_PAIRS)
+    single = run_vectorized_momentum(AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA))
+    assert _trades(results[INSTRUMENT_PAIRS[0]]) == _trades(single)
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.backtesting.ledger import TradeLedger
+from src.backtesting.performance import (compute_performance, drawdown, geometric_mean, profit_factor,
+                                         sharpe_ratio, sortino_ratio)
+from src.backtesting.trade import Trade
+
+
+def _ledger(pnls, days=None) -> TradeLedger:
+    ledger = TradeLedger()
+    for i, pnl in enumerate(pnls):
+        day = 3 if days is None else days[i]
+        trade = Trade(direction="long", open_time=datetime(2024, 12, day, 9, 30 + i), open_price=6000.0)
+        trade.commissions = 4.0
+        trade.close_trade(close_time=datetime(2024, 12, day, 9, 40 + i), close_price=6000.0 + pnl)
+        ledger.append(trade)
+    return ledger
+
+
+def test_ratios_match_reference_loops():
+    pnls = np.array([10.0, 5.0, -2.0, -4.0, -9.0, 7.5])
+    returns = pnls / 100000.0
+    mean = sum(returns) / len(returns)
+    std = (sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)) ** 0.5
+    product = 1.0
+    for r in returns:
+        product *= 1 + r
+
+    assert sharpe_ratio(returns) == pytest.approx(mean / std)
+    assert geometric_mean(returns) == pytest.approx(product ** (1 / len(returns)) - 1)
+    downside = (sum(min(r, 0.0) ** 2 for r in returns) / len(returns)) ** 0.5
+    assert sortino_ratio(returns) == pytest.approx(mean / downside)
+    assert profit_factor(pnls) == pytest.approx(22.5 / 15.0)
+
+
+def test_drawdown_and_duration():
+    equity = np.array([100.0, 110.0, 99.0, 105.0, 88.0, 112.0, 111.0])
+    max_drawdown, duration = drawdown(equity)
+    assert max_drawdown == pytest.approx(88.0 / 110.0 - 1.0)
+    # Below the 110 peak from position 1 to 4
+    assert duration == 3
+
+
+def test_compute_performance_from_ledger():
+    ledger = _ledger([10.0, -20.0, 5.0, 30.0], days=[3, 3, 4, 5])
+    report = compute_performance(ledger, initial_capital=100000.0)
+
+    assert report.num_trades == 4
+    assert report.winners == 3 and report.losers == 1
+    assert report.hit_rate == 0.75
+    assert report.total_pnl == 25.0
+    # Equity net of 4.0 commission per trade: 100006, 99982, 99983, 100009
+    assert report.max_drawdown == pytest.approx(99982.0 / 100006.0 - 1.0)
+    assert report.final_equity == pytest.approx(100009.0)
+    assert report.turnover == pytest.approx((4 * 6000.0 + 4 * 6000.0 + 25.0) / 100000.0)
+    assert report.daily["num_trades"].tolist() == [2, 1, 1]
+    assert report.daily["pnl"].tolist() == [-10.0, 5.0, 30.0]
+
+
+def test_compute_performance_with_equity_curve():
+    ledger = _ledger([1.0])
+    minute = 60 * 1_000_000_000
+    timestamps = np.arange(4, dtype=np.int64) * 365 * 24 * 60 * minute
+    equity = np.array([100000.0, 90000.0, 120000.0, 121000.0])
+    report = compute_performance(ledger, initial_capital=100000.0, equity=equity, timestamps=timestamps)
+
+    assert report.max_drawdown == pytest.approx(-0.1)
+    assert report.max_drawdown_duration == 1
+    assert report.calmar > 0
+
+
+def test_empty_ledger():
+    report = compute_performance(TradeLedger(), initial_capital=100000.0)
+    assert report.num_trades == 0
+    assert report.sharpe == 0.0
+    assert report.final_equity == 100000.0
+    assert report.daily.empty
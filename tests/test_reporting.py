@@ -0,0 +1,75 @@
+import csv
+import json
+from datetime import datetime
+
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.reporting import BufferedFileReporter, MultiReporter, SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.trade import Trade
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def _closed_trade(pnl_points: float) -> Trade:
+    trade = Trade(direction="long", open_time=datetime(2024, 12, 3, 9, 30), open_price=6000.0)
+    trade.commissions = 4.0
+    trade.close_trade(close_time=datetime(2024, 12, 3, 9, 40), close_price=6000.0 + pnl_points)
+    return trade
+
+
+def _run(reporter) -> Backtester:
+    backtester = Backtester(strategy=MomentumStrategy(), engine="array", reporter=reporter)
+    backtester.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    backtester.run()
+    return backtester
+
+
+def test_silent_reporter_prints_no_trades(capsys):
+    backtester = _run(SilentReporter())
+    out = capsys.readouterr().out
+    assert len(backtester._portfolio.completed_trades) > 0
+    assert "OPEN" not in out and "CLOSE" not in out and "End of day" not in out
+    assert "=== Performance Summary ===" in out
+
+
+def test_buffered_csv_reporter_writes_all_trades(tmp_path, capsys):
+    path = tmp_path / "trades.csv"
+    backtester = _run(BufferedFileReporter(path, fmt="csv", batch_size=5))
+    capsys.readouterr()
+
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    trades = backtester._portfolio.completed_trades
+    assert len(rows) == len(trades)
+    assert [float(r["realized_pnl"]) for r in rows] == [t.realized_pnl for t in trades]
+
+
+def test_buffered_jsonl_reporter_batches_writes(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    reporter = BufferedFileReporter(path, fmt="jsonl", batch_size=2)
+    reporter.on_close(_closed_trade(1.0), cash=100000.0)
+    assert path.read_text() == "", "Nothing should be written before the batch is full"
+    reporter.on_close(_closed_trade(-2.0), cash=100000.0)
+    reporter.on_close(_closed_trade(3.0), cash=100000.0)
+    assert len(path.read_text().splitlines()) == 2
+    reporter.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["realized_pnl"] for r in records] == [1.0, -2.0, 3.0]
+    assert records[0]["open_time"] == "2024-12-03 09:30:00"
+
+
+def test_buffered_reporter_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        BufferedFileReporter(tmp_path / "trades.txt", fmt="xml")
+
+
+def test_multi_reporter_forwards_events(tmp_path, capsys):
+    path = tmp_path / "trades.csv"
+    backtester = Backtester(strategy=MomentumStrategy(), engine="array",
+                            reporter=MultiReporter([SilentReporter(), BufferedFileReporter(path)]))
+    backtester.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    backtester.run()
+    capsys.readouterr()
+    assert len(path.read_text().splitlines()) == len(backtester._portfolio.completed_trades) + 1
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.resample import Timeframes, bucket_starts, resample
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+@pytest.fixture(scope="module")
+def data():
+    return AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+
+
+@pytest.mark.parametrize("minutes", [5, 15, 60])
+def test_resample_matches_pandas(data, minutes):
+    frame = pd.DataFrame(data.future, index=data.times())
+    expected = frame.resample(f"{minutes}min").agg(
+        {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}).dropna()
+    bars = resample(data, minutes)
+
+    for column in ("Open", "High", "Low", "Close", "Volume"):
+        assert np.array_equal(bars.future[column], expected[column].to_numpy())
+    # Stamped with the last minute of each bar
+    last_minute = frame.index.to_series().resample(f"{minutes}min").max().dropna()
+    assert np.array_equal(bars.times(), pd.DatetimeIndex(last_minute.to_numpy()))
+
+
+def test_buckets_follow_local_day():
+    times = pd.DatetimeIndex(["2024-12-03 09:30", "2024-12-03 09:59", "2024-12-03 10:00",
+                              "2024-12-04 09:30"]).tz_localize("America/New_York")
+    data = AlignedData(timestamps=times.as_unit("ns").asi8, index={"Close": np.arange(4.0)},
+                       future={"Close": np.arange(4.0)}, tz="America/New_York")
+    assert bucket_starts(data, 60).tolist() == [0, 2, 3]
+    assert resample(data, 60).index["Close"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_timeframes_are_cached_and_nested(data):
+    timeframes = Timeframes(data)
+    timeframes.build([15, 5, 60])
+    assert timeframes.minutes == [1, 5, 15, 60]
+    assert timeframes.bars(15) is timeframes.bars(15)
+
+    direct = resample(data, 15)
+    for column in ("Open", "High", "Low", "Close", "Volume"):
+        assert np.array_equal(timeframes.bars(15).index[column], direct.index[column])
+    assert np.array_equal(timeframes.bars(15).timestamps, data.timestamps[timeframes.last_minute(15)])
+
+
+def test_align_does_not_look_ahead(data):
+    timeframes = Timeframes(data)
+    hourly_close = timeframes.bars(60).future["Close"]
+    aligned = timeframes.align(hourly_close, 60, onto=5)
+    positions = timeframes.as_of(60, onto=5)
+
+    five = timeframes.bars(5).timestamps
+    hourly = timeframes.bars(60).timestamps
+    assert np.isnan(aligned[positions < 0]).all()
+    valid = positions >= 0
+    assert (hourly[positions[valid]] <= five[valid]).all()
+    assert np.array_equal(aligned[valid], hourly_close[positions[valid]])
+
+
+@pytest.mark.parametrize("engine", ["event", "array", "vectorized"])
+def test_backtester_on_coarser_bars(data, engine):
+    backtester = Backtester(strategy=MomentumStrategy(), engine=engine, reporter=SilentReporter())
+    backtester.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA, timeframe=5)
+    backtester.run()
+
+    reference = Backtester(strategy=MomentumStrategy(), engine="array", reporter=SilentReporter())
+    reference.load_aligned(Timeframes(data).bars(5))
+    reference.run()
+
+    assert len(backtester._times) == len(resample(data, 5))
+    assert [(t.open_time, t.realized_pnl) for t in backtester._portfolio.completed_trades] == \
+        [(t.open_time, t.realized_pnl) for t in reference._portfolio.completed_trades]
+    assert len(reference._portfolio.completed_trades) > 0
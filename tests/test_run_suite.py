@@ -0,0 +1,38 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import run_suite  # noqa: E402
+
+
+def _main(tmp_path, output, *extra):
+    run_suite.main(["--sizes", "2000", "--cases", "signals_batch", "--repeat", "1",
+                    "--data-dir", str(tmp_path / "data"), "--output", str(output), *extra])
+
+
+def test_suite_writes_and_compares_results(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    _main(tmp_path, baseline)
+    _main(tmp_path, tmp_path / "new.json", "--compare", str(baseline))
+
+    results = json.loads((tmp_path / "new.json").read_text())["results"]
+    assert [(r["case"], r["rows"]) for r in results] == [("signals_batch", 2000)]
+    out = capsys.readouterr().out
+    assert f"Compared with {baseline}" in out
+    assert out.rstrip().endswith("x")
+
+
+def test_suite_reports_untimeable_cases(tmp_path, monkeypatch, capsys):
+    baseline = tmp_path / "baseline.json"
+    _main(tmp_path, baseline)
+    # A case too fast for the clock has no throughput and no speedup
+    monkeypatch.setattr(run_suite, "timed", lambda func, *args, **kwargs: (0.0, func(*args, **kwargs)))
+    _main(tmp_path, tmp_path / "new.json", "--compare", str(baseline))
+
+    results = json.loads((tmp_path / "new.json").read_text())["results"]
+    assert results[0]["rows_per_second"] is None
+    out = capsys.readouterr().out
+    assert "n/a rows/s" in out
+    assert out.rstrip().endswith("n/a")
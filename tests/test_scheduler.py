@@ -0,0 +1,56 @@
+import pandas as pd
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.scheduler import ExpiryScheduler
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import generate_market_data
+
+
+def test_pop_due_fires_everything_at_or_before_now_in_time_order():
+    scheduler = ExpiryScheduler()
+    scheduler.schedule(30, "c")
+    scheduler.schedule(10, "a")
+    scheduler.schedule(20, "b")
+    scheduler.schedule(10, "a2")
+
+    assert scheduler.pop_due(5) == []
+    assert scheduler.next_time() == 10
+    assert scheduler.pop_due(25) == ["a", "a2", "b"]
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(100) == ["c"]
+    assert not scheduler
+    assert scheduler.next_time() is None
+
+
+def test_fired_events_are_pruned():
+    scheduler = ExpiryScheduler()
+    for t in range(10_000):
+        scheduler.schedule(t + 3, t)
+        scheduler.pop_due(t)
+    # Only the events of the last three bars are still pending
+    assert len(scheduler) == 3
+
+
+def test_position_closes_on_first_bar_after_missing_close_bar():
+    index_data, future_data = generate_market_data(3000, seed=3)
+    # Drop every bar whose minute ends in 7 so many exact close times are missing
+    keep = index_data.index.minute % 10 != 7
+    data = AlignedData.from_frames(index_data[keep], future_data[keep])
+
+    backtester = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array",
+                            reporter=SilentReporter())
+    backtester.load_aligned(data)
+    backtester.run()
+
+    trades = list(backtester._portfolio.completed_trades)
+    assert trades
+    holding = pd.Timedelta(minutes=10)
+    for trade in trades:
+        close_time = trade.close_time
+        assert close_time >= trade.open_time + holding
+        # No bar of the data lies between the due time and the actual close
+        due = (trade.open_time + holding).value
+        assert not ((data.timestamps >= due) & (data.timestamps < close_time.value)).any()
+    assert len(backtester._expiries) <= 1
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.streaming import iter_aligned_bars, iter_aligned_chunks
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+@pytest.mark.parametrize("chunksize", [50, 500, 100_000])
+def test_chunks_match_full_alignment(chunksize):
+    expected = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    chunks = list(iter_aligned_chunks(SPX_INDEX_DATA, SPX_FUTURE_DATA, chunksize=chunksize))
+
+    assert np.array_equal(np.concatenate([c.timestamps for c in chunks]), expected.timestamps)
+    for column in ("Open", "Close", "Volume"):
+        assert np.array_equal(np.concatenate([c.index[column] for c in chunks]), expected.index[column])
+        assert np.array_equal(np.concatenate([c.future[column] for c in chunks]), expected.future[column])
+
+
+def test_iter_aligned_bars():
+    bars = list(iter_aligned_bars(SPX_INDEX_DATA, SPX_FUTURE_DATA, chunksize=1000))
+    expected = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    assert len(bars) == len(expected)
+    time, index_price, future_price = bars[0]
+    assert time == pd.Timestamp(expected.timestamps[0])
+    assert index_price == expected.index["Close"][0]
+    assert future_price == expected.future["Close"][0]
+
+
+def test_unsorted_file_is_rejected(tmp_path):
+    path = tmp_path / "unsorted.csv"
+    lines = open(SPX_INDEX_DATA).read().splitlines()
+    path.write_text("\n".join([lines[0], lines[2], lines[1]] + lines[3:]) + "\n")
+    with pytest.raises(ValueError):
+        list(iter_aligned_chunks(path, SPX_FUTURE_DATA, chunksize=100))
+
+
+def test_run_stream_matches_run(capsys):
+    loaded = Backtester(strategy=MomentumStrategy(), engine="array")
+    loaded.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    loaded.run()
+    loaded_out = capsys.readouterr().out
+
+    streamed = Backtester(strategy=MomentumStrategy())
+    streamed.run_stream(SPX_INDEX_DATA, SPX_FUTURE_DATA, chunksize=250)
+    streamed_out = capsys.readouterr().out
+
+    assert [(t.open_time, t.open_price, t.close_price) for t in streamed._portfolio.completed_trades] == \
+        [(t.open_time, t.open_price, t.close_price) for t in loaded._portfolio.completed_trades]
+    # Same output apart from the "Data aligned" line printed by load_data
+    assert streamed_out == loaded_out.split("\n", 1)[1]
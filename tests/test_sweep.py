@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+import numpy as np
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.sweep import attach_arrays, evaluate, run_sweep, share_arrays
+from src.definitions import SPX_INDEX_DATA, SPX_FUTURE_DATA
+
+
+def test_share_and_attach_arrays(tmp_path):
+    data = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    shared = attach_arrays(share_arrays(data, tmp_path))
+
+    assert isinstance(shared.timestamps, np.memmap)
+    assert np.array_equal(shared.timestamps, data.timestamps)
+    assert np.array_equal(shared.future["Close"], data.future["Close"])
+
+
+def test_evaluate_matches_event_loop(capsys):
+    backtester = Backtester(strategy=MomentumStrategy(threshold=0.0003, window=3),
+                            holding_period=timedelta(minutes=5))
+    backtester.load_data(index_file=SPX_INDEX_DATA, future_file=SPX_FUTURE_DATA)
+    backtester.run()
+    capsys.readouterr()
+
+    row = evaluate(backtester._data, threshold=0.0003, window=3, holding_minutes=5)
+    pnls = [t.realized_pnl for t in backtester._portfolio.completed_trades]
+    assert row["num_trades"] == len(pnls)
+    assert abs(row["total_pnl"] - sum(pnls)) < 1e-9
+    assert row["final_equity"] == backtester._portfolio.total_equity(backtester._current_index_price)
+
+
+def test_parallel_sweep_matches_sequential():
+    data = AlignedData.from_csv(SPX_INDEX_DATA, SPX_FUTURE_DATA)
+    grid = dict(thresholds=[0.0003, 0.0005], windows=[3, 5], holding_minutes=[5, 10])
+
+    sequential = run_sweep(data, max_workers=1, **grid)
+    parallel = run_sweep(data, max_workers=2, **grid)
+
+    assert len(parallel) == 8
+    assert list(parallel.columns) == ["threshold", "window", "holding_minutes", "num_trades", "winners",
+                                      "losers", "total_pnl", "sharpe", "sortino", "profit_factor",
+                                      "max_drawdown", "final_equity"]
+    assert parallel.equals(sequential)
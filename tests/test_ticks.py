@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.market_data import AlignedData
+from src.backtesting.reporting import SilentReporter
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.synthetic import write_tick_data
+from src.backtesting.ticks import BarBuilder, TimeBarBuilder, VolumeBarBuilder, iter_tick_bars
+
+
+@pytest.fixture(scope="module")
+def tick_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ticks") / "ticks.csv.gz"
+    write_tick_data(path, n_ticks=20_000, chunk_rows=7_000)
+    return path
+
+
+def _concat(blocks):
+    blocks = list(blocks)
+    return np.concatenate([b.timestamps for b in blocks]), \
+        {name: np.concatenate([b.future[name] for b in blocks]) for name in blocks[0].future}
+
+
+@pytest.mark.parametrize("make_builder", [lambda: TimeBarBuilder(seconds=30), lambda: VolumeBarBuilder(250)])
+def test_bars_do_not_depend_on_chunk_size(tick_file, make_builder):
+    small_times, small = _concat(iter_tick_bars(tick_file, make_builder(), chunksize=333))
+    whole_times, whole = _concat(iter_tick_bars(tick_file, make_builder(), chunksize=1_000_000))
+    assert np.array_equal(small_times, whole_times)
+    for name in whole:
+        assert np.array_equal(small[name], whole[name])
+    assert small["Ticks"].sum() == 20_000
+
+
+def test_time_bars_match_pandas(tick_file):
+    ticks = pd.read_csv(tick_file, parse_dates=["Datetime"], index_col="Datetime")
+    expected = ticks["Price"].resample("1min").ohlc().dropna()
+    times, bars = _concat(iter_tick_bars(tick_file, TimeBarBuilder.minutes(1), chunksize=1_000))
+
+    assert np.array_equal(bars["Open"], expected["open"].to_numpy())
+    assert np.array_equal(bars["High"], expected["high"].to_numpy())
+    assert np.array_equal(bars["Close"], expected["close"].to_numpy())
+    assert np.array_equal(bars["Volume"], ticks["Size"].resample("1min").sum()[expected.index].to_numpy())
+    # Stamped with the last tick of every bar
+    last_tick = ticks.index.to_series().resample("1min").max()[expected.index]
+    assert np.array_equal(times, last_tick.to_numpy().astype("datetime64[ns]").view(np.int64))
+
+
+def test_volume_bars_close_at_multiples(tick_file):
+    _, bars = _concat(iter_tick_bars(tick_file, VolumeBarBuilder(250), chunksize=1_000))
+    traded = np.cumsum(bars["Volume"])
+    # Every bar but the last takes the running volume past a new multiple
+    assert (np.diff(np.floor(traded[:-1] / 250)) >= 1).all()
+    assert traded[-1] == pd.read_csv(tick_file)["Size"].sum()
+
+
+def test_integer_timestamps(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text("ts,px,qty\n0,10.0,1\n30000000000,11.0,2\n60000000000,9.0,1\n61000000000,9.5,4\n")
+    times, bars = _concat(iter_tick_bars(path, TimeBarBuilder.minutes(1), time_column="ts", price_column="px",
+                                         size_column="qty"))
+    assert times.tolist() == [30_000_000_000, 61_000_000_000]
+    assert bars["Open"].tolist() == [10.0, 9.0]
+    assert bars["Volume"].tolist() == [3.0, 5.0]
+
+
+def test_unsorted_ticks_are_rejected(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text("Datetime,Price,Size\n2024-01-02 09:30:01,1,1\n2024-01-02 09:30:00,1,1\n")
+    with pytest.raises(ValueError):
+        list(iter_tick_bars(path, TimeBarBuilder()))
+
+
+def test_run_ticks_matches_loaded_bars(tick_file):
+    streamed = Backtester(strategy=MomentumStrategy(threshold=0.0002), reporter=SilentReporter())
+    streamed.run_ticks(tick_file, TimeBarBuilder(seconds=15), chunksize=2_000)
+
+    times, bars = _concat(iter_tick_bars(tick_file, TimeBarBuilder(seconds=15)))
+    loaded = Backtester(strategy=MomentumStrategy(threshold=0.0002), engine="array", reporter=SilentReporter())
+    loaded.load_aligned(AlignedData(timestamps=times, index=bars, future=bars))
+    loaded.run()
+
+    assert len(loaded._portfolio.completed_trades) > 0
+    assert [(t.open_time, t.realized_pnl) for t in streamed._portfolio.completed_trades] == \
+        [(t.open_time, t.realized_pnl) for t in loaded._portfolio.completed_trades]
+
+
+def test_bar_builder_needs_keys():
+    class NoKeys(BarBuilder):
+        pass
+
+    with pytest.raises(TypeError):
+        NoKeys()
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+
+from src.backtesting.strategies.momentumstrategy import MomentumStrategy
+from src.backtesting.vectorized import (BUY, HOLD, SELL, momentum_series, momentum_signals,
+                                        simulate_fixed_holding)
+
+MINUTE = 60 * 1_000_000_000
+
+
+def test_momentum_series_matches_strategy():
+    """Momentum per bar should equal what the streaming strategy computes."""
+    prices = 100.0 + np.cumsum(np.random.default_rng(0).normal(0.0, 0.1, size=200))
+    momentum = momentum_series(prices, window=5)
+
+    strategy = MomentumStrategy()
+    for i, price in enumerate(prices):
+        strategy.update_price(price)
+        if strategy.can_compute_momentum():
+            assert momentum[i] == pytest.approx(strategy.compute_momentum(), rel=1e-9, abs=1e-15)
+        else:
+            assert np.isnan(momentum[i])
+
+
+def test_momentum_signals():
+    momentum = np.array([np.nan, 0.001, -0.001, 0.0001, 0.0005])
+    signals = momentum_signals(momentum, threshold=0.0005)
+    assert signals.dtype == np.int8
+    assert signals.tolist() == [HOLD, BUY, SELL, HOLD, HOLD]
+
+
+def test_simulate_fixed_holding_one_trade_at_a_time():
+    timestamps = np.arange(30, dtype=np.int64) * MINUTE
+    signals = np.zeros(30, dtype=np.int8)
+    signals[[2, 5, 12, 13, 25]] = BUY
+
+    open_idx, close_idx = simulate_fixed_holding(timestamps, signals, holding_ns=10 * MINUTE)
+
+    # Signal at 5 is ignored while the first trade is open, the trade
+    # opened at 12 closes on bar 22, then 25 opens and never closes
+    assert open_idx.tolist() == [2, 12, 25]
+    assert close_idx.tolist() == [12, 22, -1]
+
+
+def test_simulate_fixed_holding_missing_close_bar():
+    """A position whose close bar is missing closes on the next bar."""
+    timestamps = np.array([0, 1, 2, 4, 5], dtype=np.int64) * MINUTE
+    signals = np.array([BUY, 0, 0, SELL, 0], dtype=np.int8)
+
+    open_idx, close_idx = simulate_fixed_holding(timestamps, signals, holding_ns=3 * MINUTE)
+
+    # The SELL reopens on the bar the first position closes on and its
+    # close time lies after the end of the data
+    assert open_idx.tolist() == [0, 3]
+    assert close_idx.tolist() == [3, -1]
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from src.backtesting.equity import equity_from_trades
+from src.backtesting.market_data import AlignedData
+from src.backtesting.sweep import evaluate
+from src.backtesting.synthetic import generate_market_data
+from src.backtesting.vectorized import run_vectorized_momentum
+from src.backtesting.walk_forward import ResultCache, make_folds, walk_forward
+
+GRID = dict(thresholds=[0.0002, 0.0005], windows=[3, 5], holding_minutes=[10])
+
+
+def _data(n_bars: int = 6000) -> AlignedData:
+    return AlignedData.from_frames(*generate_market_data(n_bars, seed=17))
+
+
+def test_make_folds():
+    folds = make_folds(100, train_bars=40, test_bars=25)
+
+    assert [(f.train_start, f.train_stop, f.test_start, f.test_stop) for f in folds] == [
+        (0, 40, 40, 65), (25, 65, 65, 90), (50, 90, 90, 100)]
+    assert make_folds(40, train_bars=40, test_bars=10) == []
+
+
+def test_walk_forward_picks_best_train_parameters():
+    data = _data()
+    result = walk_forward(data, train_bars=2000, test_bars=1000, max_workers=1, **GRID)
+
+    assert len(result.folds) == 4
+    first = result.folds.iloc[0]
+    train = data.slice(0, 2000)
+    scores = {(t, w): evaluate(train, t, w, 10)["sharpe"] for t in GRID["thresholds"] for w in GRID["windows"]}
+    assert (first["threshold"], first["window"]) == max(scores, key=scores.get)
+    assert first["train_sharpe"] == max(scores.values())
+
+    # The stitched curve covers every test bar and chains the folds
+    assert len(result.equity) == len(data) - 2000
+    assert result.equity.index.is_monotonic_increasing
+    assert result.folds["final_equity"].iloc[-1] == result.equity.iloc[-1]
+
+
+def test_parallel_and_cached_runs_match(tmp_path):
+    data = _data()
+    sequential = walk_forward(data, train_bars=2000, test_bars=1000, max_workers=1, **GRID)
+    parallel = walk_forward(data, train_bars=2000, test_bars=1000, max_workers=2, cache_dir=tmp_path, **GRID)
+    n_entries = len(list(tmp_path.glob("*.json")))
+    cached = walk_forward(data, train_bars=2000, test_bars=1000, max_workers=2, cache_dir=tmp_path, **GRID)
+
+    assert n_entries == 4 * 4
+    assert len(list(tmp_path.glob("*.json"))) == n_entries
+    assert parallel.folds.equals(sequential.folds)
+    assert cached.folds.equals(sequential.folds)
+    assert cached.equity.equals(sequential.equity)
+
+
+def test_cache_reuses_identical_windows(tmp_path, monkeypatch):
+    data = _data()
+    walk_forward(data.slice(0, 5000), train_bars=2000, test_bars=1000, max_workers=1, cache_dir=tmp_path, **GRID)
+    assert len(list(tmp_path.glob("*.json"))) == 3 * 4
+
+    hits = []
+    get = ResultCache.get
+
+    def counting_get(self, fingerprint, params):
+        row = get(self, fingerprint, params)
+        hits.append(row is not None)
+        return row
+
+    monkeypatch.setattr(ResultCache, "get", counting_get)
+    # With more bars appended, the first three train windows are the same bars
+    walk_forward(data, train_bars=2000, test_bars=1000, max_workers=1, cache_dir=tmp_path, **GRID)
+    assert sum(hits) == 3 * 4
+    assert len(list(tmp_path.glob("*.json"))) == 4 * 4
+
+
+def test_walk_forward_needs_enough_bars():
+    with pytest.raises(ValueError):
+        walk_forward(_data(500), train_bars=500, test_bars=100, max_workers=1, **GRID)
+
+
+def test_equity_from_trades_marks_open_position():
+    data = _data(800)
+    # Cut the data in the middle of a trade
+    for n_bars in range(600, 800):
+        portfolio = run_vectorized_momentum(data.slice(0, n_bars), threshold=0.0002)
+        if portfolio.open_trade is not None:
+            break
+    assert portfolio.open_trade is not None
+    prices = data.index["Close"][:n_bars]
+    equity = equity_from_trades(data.timestamps[:n_bars], prices, portfolio.completed_trades,
+                                100000.0, open_trades=[portfolio.open_trade])
+
+    assert equity[-1] == pytest.approx(portfolio.total_equity(prices[-1]) + portfolio.margin)
+    assert np.isfinite(equity).all()
+
+    # Open trades may be given as any iterable
+    from_generator = equity_from_trades(data.timestamps[:n_bars], prices, portfolio.completed_trades,
+                                        100000.0, open_trades=(t for t in [portfolio.open_trade]))
+    assert np.array_equal(from_generator, equity)